@@ -0,0 +1,306 @@
+"""
+벤치마크용 합성 데이터셋 생성기
+
+같은 인자와 시드로 만들면 항상 같은 내용(바이트 단위)의 데이터셋이 만들어집니다.
+
+    python -m benchmarks.generate /tmp/kwbench --labels 100000 --images 2000 --coco-annotations 500000
+"""
+
+import os
+import json
+import click
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+from PIL import Image
+from tqdm import tqdm
+
+# 데이터셋 디렉토리 구성
+#   images/        : 이미지 (img_0000000.jpg ...), 일부는 앞의 이미지와 내용이 같은 중복
+#   labels/        : YOLO 라벨 (img_0000000.txt ...), 이미지와 같은 이름
+#   classes.txt    : 클래스 이름
+#   coco.json      : COCO 어노테이션
+#   coco_map.json  : COCO 클래스 변경 매핑 (벤치마크용)
+#   dataset.json   : 생성 인자와 파일 수/용량
+DATASET_META = "dataset.json"
+
+def parse_resolutions(value: str) -> List[Tuple[int, int]]:
+    """"640x480,1920x1080" 형식을 [(너비, 높이)]로 변환"""
+    resolutions = []
+    for item in value.split(','):
+        width, height = item.lower().split('x')
+        resolutions.append((int(width), int(height)))
+    return resolutions
+
+def _class_weights(num_classes: int, skew: float) -> np.ndarray:
+    """Zipf 형태의 클래스 분포 (skew가 0이면 균등)"""
+    weights = 1.0 / np.arange(1, num_classes + 1) ** skew
+    return weights / weights.sum()
+
+def _sample_boxes(rng: np.random.Generator, count: int, box_size: float) -> np.ndarray:
+    """
+    (count, 4) 박스 [x, y, w, h] (정규화 좌표)
+
+    크기는 평균이 box_size인 로그 정규 분포, 중심은 박스가 이미지 안에 들어가도록 균등 분포
+    """
+    wh = np.clip(rng.lognormal(np.log(box_size), 0.5, size=(count, 2)), 0.005, 1.0)
+    xy = wh / 2 + rng.random((count, 2)) * (1 - wh)
+    return np.concatenate([xy, wh], axis=1)
+
+def generate_labels(
+    label_dir: Path,
+    num_files: int,
+    num_classes: int = 80,
+    boxes_per_file: float = 8.0,
+    box_size: float = 0.1,
+    class_skew: float = 1.0,
+    empty_fraction: float = 0.02,
+    conf_fraction: float = 0.0,
+    seed: int = 0
+) -> int:
+    """
+    YOLO 라벨 파일 생성
+
+    파일당 객체 수는 평균이 boxes_per_file인 포아송 분포이며, empty_fraction 비율은 빈 파일,
+    conf_fraction 비율의 파일은 confidence 값이 있는 6개 값 라인으로 만듭니다.
+
+    Returns:
+        int: 생성한 객체 수
+    """
+    label_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    weights = _class_weights(num_classes, class_skew)
+    counts = rng.poisson(boxes_per_file, size=num_files)
+    counts[rng.random(num_files) < empty_fraction] = 0
+    with_conf = rng.random(num_files) < conf_fraction
+
+    total = 0
+    for i in tqdm(range(num_files), desc="Generating labels"):
+        count = int(counts[i])
+        class_ids = rng.choice(num_classes, size=count, p=weights)
+        boxes = _sample_boxes(rng, count, box_size)
+        if with_conf[i]:
+            confs = rng.random(count)
+            lines = [f"{c} {x:.6f} {y:.6f} {w:.6f} {h:.6f} {p:.4f}\n"
+                     for c, (x, y, w, h), p in zip(class_ids, boxes, confs)]
+        else:
+            lines = [f"{c} {x:.6f} {y:.6f} {w:.6f} {h:.6f}\n" for c, (x, y, w, h) in zip(class_ids, boxes)]
+        with open(label_dir / f"img_{i:07d}.txt", 'w') as f:
+            f.writelines(lines)
+        total += count
+    return total
+
+def generate_images(
+    image_dir: Path,
+    num_images: int,
+    resolutions: Sequence[Tuple[int, int]] = ((640, 480),),
+    formats: Sequence[str] = ('jpg',),
+    duplicate_fraction: float = 0.0,
+    seed: int = 0
+) -> int:
+    """
+    이미지 생성
+
+    해상도와 형식은 이미지마다 순서대로 돌아가며 정하고, 내용은 그라디언트 위에 번호로 정한
+    사각형들을 그려 서로 다르게 만듭니다. duplicate_fraction 비율의 이미지는 앞의 이미지와
+    바이트 단위로 같은 중복 파일입니다 (같은 형식의 이미지를 복사).
+
+    Returns:
+        int: 중복 이미지 수
+    """
+    image_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    is_duplicate = rng.random(num_images) < duplicate_fraction
+    is_duplicate[0] = False
+
+    bases = {}
+    written = {fmt: [] for fmt in formats}
+    duplicates = 0
+    for i in tqdm(range(num_images), desc="Generating images"):
+        width, height = resolutions[i % len(resolutions)]
+        fmt = formats[i % len(formats)]
+        file = image_dir / f"img_{i:07d}.{fmt}"
+
+        if is_duplicate[i] and written[fmt]:
+            source = written[fmt][int(rng.integers(len(written[fmt])))]
+            with open(source, 'rb') as fsrc, open(file, 'wb') as fdst:
+                fdst.write(fsrc.read())
+            duplicates += 1
+            continue
+
+        if (width, height) not in bases:
+            gx = np.linspace(0, 255, width, dtype=np.float32)
+            gy = np.linspace(0, 255, height, dtype=np.float32)
+            base = np.empty((height, width, 3), dtype=np.uint8)
+            base[..., 0] = gx[None, :]
+            base[..., 1] = gy[:, None]
+            base[..., 2] = 128
+            bases[(width, height)] = base
+        pixels = bases[(width, height)].copy()
+        for _ in range(4):
+            x1, x2 = np.sort(rng.integers(0, width, size=2))
+            y1, y2 = np.sort(rng.integers(0, height, size=2))
+            pixels[y1:y2 + 1, x1:x2 + 1] = rng.integers(0, 256, size=3, dtype=np.uint8)
+
+        image = Image.fromarray(pixels)
+        if fmt in ('jpg', 'jpeg'):
+            image.save(file, format='JPEG', quality=90)
+        else:
+            image.save(file, format=fmt.upper())
+        written[fmt].append(file)
+    return duplicates
+
+def generate_coco(
+    output_file: Path,
+    num_images: int,
+    num_annotations: int,
+    resolutions: Sequence[Tuple[int, int]] = ((640, 480),),
+    num_classes: int = 80,
+    box_size: float = 0.1,
+    class_skew: float = 1.0,
+    seed: int = 0
+) -> None:
+    """COCO 어노테이션 파일 생성 (어노테이션은 이미지에 균등하게 분포)"""
+    rng = np.random.default_rng(seed)
+    weights = _class_weights(num_classes, class_skew)
+    num_images = max(1, num_images)
+
+    images = []
+    for i in range(num_images):
+        width, height = resolutions[i % len(resolutions)]
+        images.append({"id": i + 1, "file_name": f"img_{i:07d}.jpg", "width": width, "height": height})
+
+    image_idx = np.sort(rng.integers(0, num_images, size=num_annotations))
+    class_ids = rng.choice(num_classes, size=num_annotations, p=weights)
+    boxes = _sample_boxes(rng, num_annotations, box_size)
+
+    annotations = []
+    for ann_id in tqdm(range(num_annotations), desc="Generating COCO"):
+        image = images[image_idx[ann_id]]
+        x, y, w, h = boxes[ann_id]
+        bw, bh = w * image["width"], h * image["height"]
+        annotations.append({
+            "id": ann_id + 1,
+            "image_id": image["id"],
+            "category_id": int(class_ids[ann_id]) + 1,
+            "bbox": [round((x - w / 2) * image["width"], 2), round((y - h / 2) * image["height"], 2),
+                     round(bw, 2), round(bh, 2)],
+            "area": round(bw * bh, 2),
+            "iscrowd": 0,
+        })
+
+    coco = {
+        "images": images,
+        "annotations": annotations,
+        "categories": [{"id": i + 1, "name": f"class_{i}", "supercategory": "none"} for i in range(num_classes)],
+    }
+    with open(output_file, 'w') as f:
+        json.dump(coco, f)
+
+def _tree_size(directory: Path) -> Tuple[int, int]:
+    """(파일 수, 바이트 수)"""
+    files = 0
+    size = 0
+    for root, _, names in os.walk(directory):
+        for name in names:
+            files += 1
+            size += os.path.getsize(os.path.join(root, name))
+    return files, size
+
+def generate_dataset(
+    output_dir: str,
+    num_labels: int = 10000,
+    num_images: int = 1000,
+    resolutions: Sequence[Tuple[int, int]] = ((640, 480),),
+    formats: Sequence[str] = ('jpg',),
+    coco_annotations: int = 100000,
+    duplicate_fraction: float = 0.05,
+    num_classes: int = 80,
+    boxes_per_file: float = 8.0,
+    box_size: float = 0.1,
+    class_skew: float = 1.0,
+    empty_fraction: float = 0.02,
+    conf_fraction: float = 0.0,
+    seed: int = 0
+) -> Dict:
+    """
+    라벨, 이미지, COCO 어노테이션으로 이루어진 합성 데이터셋 생성
+
+    각 부분은 seed에서 파생된 별도의 난수 생성기를 사용하므로, 예를 들어 이미지 수를 바꿔도
+    라벨 내용은 그대로입니다.
+
+    Returns:
+        Dict: dataset.json에 저장한 메타 정보 (생성 인자, 파일 수/용량)
+    """
+    path = Path(output_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    label_seed, image_seed, coco_seed = np.random.SeedSequence(seed).generate_state(3)
+
+    num_objects = generate_labels(
+        path / "labels", num_labels, num_classes, boxes_per_file, box_size,
+        class_skew, empty_fraction, conf_fraction, int(label_seed)
+    )
+    duplicates = generate_images(path / "images", num_images, resolutions, formats, duplicate_fraction, int(image_seed))
+    generate_coco(path / "coco.json", num_images, coco_annotations, resolutions, num_classes, box_size, class_skew, int(coco_seed))
+
+    with open(path / "classes.txt", 'w') as f:
+        f.writelines(f"class_{i}\n" for i in range(num_classes))
+    # 절반의 카테고리 ID를 바꾸는 매핑
+    with open(path / "coco_map.json", 'w') as f:
+        json.dump({str(i): i + 1000 for i in range(1, num_classes + 1, 2)}, f)
+
+    label_files, label_bytes = _tree_size(path / "labels")
+    image_files, image_bytes = _tree_size(path / "images")
+    meta = {
+        "params": {
+            "num_labels": num_labels,
+            "num_images": num_images,
+            "resolutions": [f"{w}x{h}" for w, h in resolutions],
+            "formats": list(formats),
+            "coco_annotations": coco_annotations,
+            "duplicate_fraction": duplicate_fraction,
+            "num_classes": num_classes,
+            "boxes_per_file": boxes_per_file,
+            "box_size": box_size,
+            "class_skew": class_skew,
+            "empty_fraction": empty_fraction,
+            "conf_fraction": conf_fraction,
+            "seed": seed,
+        },
+        "labels": {"files": label_files, "bytes": label_bytes, "objects": num_objects},
+        "images": {"files": image_files, "bytes": image_bytes, "duplicates": duplicates},
+        "coco": {"files": 1, "bytes": os.path.getsize(path / "coco.json"), "annotations": coco_annotations},
+    }
+    with open(path / DATASET_META, 'w') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+@click.command()
+@click.argument('output_dir')
+@click.option('--labels', 'num_labels', default=10000, help='YOLO 라벨 파일 수')
+@click.option('--images', 'num_images', default=1000, help='이미지 수')
+@click.option('--resolutions', default='640x480', help='이미지 해상도 목록 (예: 640x480,1920x1080)')
+@click.option('--formats', default='jpg', help='이미지 형식 목록 (예: jpg,png)')
+@click.option('--coco-annotations', default=100000, help='COCO 어노테이션 수')
+@click.option('--duplicate-fraction', default=0.05, help='중복 이미지 비율')
+@click.option('--classes', 'num_classes', default=80, help='클래스 수')
+@click.option('--boxes-per-file', default=8.0, help='라벨 파일당 평균 객체 수')
+@click.option('--box-size', default=0.1, help='평균 박스 크기 (정규화 좌표)')
+@click.option('--class-skew', default=1.0, help='클래스 분포 치우침 (0이면 균등)')
+@click.option('--empty-fraction', default=0.02, help='빈 라벨 파일 비율')
+@click.option('--conf-fraction', default=0.0, help='confidence 값이 있는 라벨 파일 비율')
+@click.option('--seed', default=0, help='랜덤 시드')
+def main(output_dir, num_labels, num_images, resolutions, formats, coco_annotations, duplicate_fraction,
+         num_classes, boxes_per_file, box_size, class_skew, empty_fraction, conf_fraction, seed):
+    """벤치마크용 합성 데이터셋을 생성합니다."""
+    meta = generate_dataset(
+        output_dir, num_labels, num_images, parse_resolutions(resolutions),
+        [fmt.strip().lower() for fmt in formats.split(',')], coco_annotations, duplicate_fraction,
+        num_classes, boxes_per_file, box_size, class_skew, empty_fraction, conf_fraction, seed
+    )
+    for part in ("labels", "images", "coco"):
+        info = meta[part]
+        click.echo(f"{part}: {info['files']}개 파일, {info['bytes'] / (1024 * 1024):.1f}MB")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,241 @@
+"""
+CLI 명령 벤치마크
+
+generate로 만든 데이터셋에서 각 명령을 별도 프로세스로 실행하여 실행 시간, 초당 파일 수,
+초당 MB, 최대 메모리(RSS)를 측정하고 JSON으로 저장합니다. 저장한 결과를 --baseline으로
+넘기면 버전 사이의 차이를 비교합니다.
+
+    python -m benchmarks.run /tmp/kwbench --save results/v0.2.json
+    python -m benchmarks.run /tmp/kwbench --baseline results/v0.1.json --only label-analyze
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import subprocess
+import tempfile
+import click
+from pathlib import Path
+from typing import Dict, List, Optional
+from .generate import DATASET_META
+
+# 벤치마크 목록
+#   args  : kwtools 명령 인자 ({data}: 데이터셋, {work}: 작업 디렉토리, {jobs}: 병렬 수)
+#   input : 처리량 계산에 쓰는 입력 ("labels", "images", "coco")
+#   fresh : 명령이 입력을 수정하면 실행마다 작업 디렉토리에 새로 복사할 부분 (복사 시간은 제외)
+BENCHMARKS = {
+    "label-analyze": {
+        "args": ["label", "analyze", "{data}/labels", "-j", "{jobs}"],
+        "input": "labels",
+    },
+    "label-pack": {
+        "args": ["label", "pack", "{data}/labels", "{work}/store", "-j", "{jobs}"],
+        "input": "labels",
+    },
+    "label-transform": {
+        "args": ["label", "transform", "{work}/labels", "-s", "remap=0:1,2:3", "-s", "clamp", "-j", "{jobs}"],
+        "input": "labels",
+        "fresh": ["labels"],
+    },
+    "modify-yolo": {
+        "args": ["modify", "{work}/labels", "{data}/coco_map.json", "-f", "yolo", "-j", "{jobs}"],
+        "input": "labels",
+        "fresh": ["labels"],
+    },
+    "modify-coco-stream": {
+        "args": ["modify", "{data}/coco.json", "{data}/coco_map.json", "-f", "coco", "--stream", "-o", "{work}/coco.json"],
+        "input": "coco",
+    },
+    "clean": {
+        "args": ["clean", "{work}/labels", "--no-backup"],
+        "input": "labels",
+        "fresh": ["labels"],
+    },
+    "image-analyze": {
+        "args": ["image", "analyze", "{data}/images", "-j", "{jobs}"],
+        "input": "images",
+    },
+    "image-near-duplicates": {
+        "args": ["image", "near-duplicates", "{data}/images", "-j", "{jobs}"],
+        "input": "images",
+    },
+    "find-duplicates": {
+        "args": ["utils", "find-duplicates", "{data}/images", "--no-cache", "-j", "{jobs}"],
+        "input": "images",
+    },
+    "copy": {
+        "args": ["utils", "copy", "{data}/images", "{work}/copy", "*", "-j", "{jobs}"],
+        "input": "images",
+    },
+    "move": {
+        "args": ["file", "move", "{work}/images/*", "{work}/moved", "-j", "{jobs}", "--journal", "{work}/move.journal"],
+        "input": "images",
+        "fresh": ["images"],
+    },
+    "rename-prefix": {
+        "args": ["rename", "prefix", "{work}/labels", "x_", "-j", "{jobs}", "--journal", "{work}/rename.journal"],
+        "input": "labels",
+        "fresh": ["labels"],
+    },
+    "dataset-split": {
+        "args": ["dataset", "split", "{data}/images", "{work}/split", "-l", "{data}/labels", "-m", "copy", "-j", "{jobs}"],
+        "input": "images",
+    },
+    "dataset-yolo2coco": {
+        "args": ["dataset", "yolo2coco", "{data}/labels", "{data}/classes.txt", "{work}/yolo2coco.json",
+                 "--img-dir", "{data}/images", "-j", "{jobs}"],
+        "input": "labels",
+    },
+    "dataset-convert": {
+        "args": ["dataset", "convert", "{data}/coco.json", "{work}/yolo", "--from", "coco", "--to", "yolo", "-j", "{jobs}"],
+        "input": "coco",
+    },
+    "dataset-pack": {
+        "args": ["dataset", "pack", "{data}/images", "{work}/shards", "-l", "{data}/labels", "-j", "{jobs}"],
+        "input": "images",
+    },
+}
+
+def _git_revision() -> Optional[str]:
+    """현재 소스의 git 리비전 (git 저장소가 아니면 None)"""
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _run_command(args: List[str], log_file) -> Dict:
+    """
+    kwtools 명령을 별도 프로세스로 실행하여 실행 시간과 최대 RSS 측정
+
+    최대 RSS는 wait4가 돌려주는 값으로, 명령 프로세스와 그 프로세스가 기다린 하위 프로세스
+    (작업 프로세스) 중 가장 큰 값입니다.
+    """
+    command = [sys.executable, "-m", "kwtools.cli"] + args
+    start = time.perf_counter()
+    process = subprocess.Popen(command, stdout=log_file, stderr=subprocess.STDOUT)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss 단위: Linux는 KB, macOS는 바이트
+    peak_rss = usage.ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+    return {"elapsed": elapsed, "peak_rss": peak_rss, "returncode": process.returncode}
+
+def run_benchmark(name: str, data_dir: str, jobs: int = 8, repeat: int = 3, log_file=None) -> Dict:
+    """
+    벤치마크 하나를 repeat번 실행
+
+    실행 시간은 가장 빠른 값, 최대 RSS는 가장 큰 값을 사용합니다.
+
+    Returns:
+        Dict: {"elapsed", "times", "files", "bytes", "files_per_sec", "mb_per_sec", "peak_rss_mb"}
+    """
+    spec = BENCHMARKS[name]
+    data_path = Path(data_dir).resolve()
+    with open(data_path / DATASET_META, 'r') as f:
+        meta = json.load(f)
+    files = meta[spec["input"]]["files"]
+    size = meta[spec["input"]]["bytes"]
+
+    times = []
+    peak_rss = 0
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="kwbench-") as work:
+            for part in spec.get("fresh", []):
+                shutil.copytree(data_path / part, Path(work) / part)
+            args = [arg.format(data=data_path, work=work, jobs=jobs) for arg in spec["args"]]
+            result = _run_command(args, log_file if log_file is not None else subprocess.DEVNULL)
+        if result["returncode"] != 0:
+            raise RuntimeError(f"{name} 실패 (종료 코드 {result['returncode']}): kwtools {' '.join(args)}")
+        times.append(result["elapsed"])
+        peak_rss = max(peak_rss, result["peak_rss"])
+
+    elapsed = min(times)
+    return {
+        "elapsed": elapsed,
+        "times": times,
+        "files": files,
+        "bytes": size,
+        "files_per_sec": files / elapsed if elapsed > 0 else 0,
+        "mb_per_sec": size / (1024 * 1024) / elapsed if elapsed > 0 else 0,
+        "peak_rss_mb": peak_rss / (1024 * 1024),
+    }
+
+def compare_results(results: Dict, baseline: Dict) -> Dict[str, Dict]:
+    """
+    기준 결과와 비교
+
+    Returns:
+        Dict[str, Dict]: 벤치마크별 {"speedup": 기준 시간 / 현재 시간, "rss_ratio": 현재 RSS / 기준 RSS}
+    """
+    comparison = {}
+    for name, result in results["benchmarks"].items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if base is None:
+            continue
+        comparison[name] = {
+            "speedup": base["elapsed"] / result["elapsed"] if result["elapsed"] > 0 else 0,
+            "rss_ratio": result["peak_rss_mb"] / base["peak_rss_mb"] if base["peak_rss_mb"] > 0 else 0,
+        }
+    return comparison
+
+@click.command()
+@click.argument('data_dir')
+@click.option('--only', '-o', multiple=True, type=click.Choice(list(BENCHMARKS)), help='실행할 벤치마크 (여러 번 지정 가능)')
+@click.option('--jobs', '-j', default=8, help='명령에 넘길 병렬 수')
+@click.option('--repeat', '-n', default=3, help='반복 횟수 (가장 빠른 값 사용)')
+@click.option('--save', help='결과를 저장할 JSON 파일')
+@click.option('--baseline', help='비교할 기준 결과 JSON 파일')
+@click.option('--log', help='명령 출력을 저장할 파일 (기본: 버림)')
+def main(data_dir, only, jobs, repeat, save, baseline, log):
+    """합성 데이터셋에서 kwtools 명령들의 성능을 측정합니다."""
+    with open(Path(data_dir) / DATASET_META, 'r') as f:
+        dataset = json.load(f)
+
+    import kwtools
+    results = {
+        "kwtools_version": kwtools.__version__,
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "jobs": jobs,
+        "repeat": repeat,
+        "dataset": dataset["params"],
+        "benchmarks": {},
+    }
+
+    log_file = open(log, 'w') if log else None
+    try:
+        for name in only or BENCHMARKS:
+            result = run_benchmark(name, data_dir, jobs, repeat, log_file)
+            results["benchmarks"][name] = result
+            click.echo(
+                f"{name:24s} {result['elapsed']:8.2f}초 {result['files_per_sec']:10.0f} 파일/초 "
+                f"{result['mb_per_sec']:8.1f}MB/s  RSS {result['peak_rss_mb']:7.1f}MB"
+            )
+    finally:
+        if log_file is not None:
+            log_file.close()
+
+    if baseline:
+        with open(baseline, 'r') as f:
+            comparison = compare_results(results, json.load(f))
+        click.echo("\n=== 기준 결과와 비교 ===")
+        for name, diff in comparison.items():
+            click.echo(f"{name:24s} 속도 {diff['speedup']:5.2f}배  RSS {diff['rss_ratio']:5.2f}배")
+
+    if save:
+        Path(save).parent.mkdir(parents=True, exist_ok=True)
+        with open(save, 'w') as f:
+            json.dump(results, f, indent=2)
+        click.echo(f"\n결과 저장: {save}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
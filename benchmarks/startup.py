@@ -0,0 +1,98 @@
+"""
+kwtools 시작 시간 벤치마크
+
+각 명령을 별도 프로세스로 여러 번 실행하여 시작 시간(가장 빠른 값, 중앙값)과 무거운 의존성
+(NumPy, PIL)을 불러왔는지 측정합니다. --pythonpath로 다른 버전의 소스를 넘기면 비교할 수 있습니다.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --pythonpath /path/to/old/tools --save results/startup-old.json
+"""
+
+import os
+import sys
+import json
+import time
+import statistics
+import subprocess
+import click
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# 확인할 무거운 의존성
+HEAVY_MODULES = ("numpy", "PIL")
+
+# 측정할 명령 (python -c로 실행할 코드)
+STARTUP_CASES = {
+    "import": "import kwtools",
+    "help": "from kwtools.cli import main; main(['--help'])",
+    "rename-help": "from kwtools.cli import main; main(['rename', '--help'])",
+    "file-help": "from kwtools.cli import main; main(['file', '--help'])",
+    "dataset-help": "from kwtools.cli import main; main(['dataset', '--help'])",
+    "label-help": "from kwtools.cli import main; main(['label', '--help'])",
+}
+
+# 명령이 끝난 뒤 불러온 무거운 모듈을 표준 오류 마지막 줄에 출력
+_REPORT = (
+    "import atexit, sys\n"
+    "atexit.register(lambda: print('KWSTARTUP', ','.join(m for m in {modules!r} if m in sys.modules), file=sys.stderr))\n"
+    "{code}\n"
+)
+
+def measure_startup(code: str, repeat: int = 10, pythonpath: Optional[str] = None) -> Dict:
+    """
+    code를 별도 프로세스로 repeat번 실행하여 시작 시간 측정
+
+    Returns:
+        Dict: {"min_ms", "median_ms", "times_ms", "loaded"}
+    """
+    env = dict(os.environ)
+    if pythonpath:
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [pythonpath, env.get("PYTHONPATH")]))
+    command = [sys.executable, "-c", _REPORT.format(modules=HEAVY_MODULES, code=code)]
+
+    times = []
+    loaded: List[str] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.run(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        times.append((time.perf_counter() - start) * 1000)
+        if process.returncode != 0:
+            raise RuntimeError(f"실패 (종료 코드 {process.returncode}): {code}\n{process.stderr}")
+        report = [line for line in process.stderr.splitlines() if line.startswith("KWSTARTUP")]
+        loaded = report[-1].split(" ", 1)[1].split(",") if report and " " in report[-1] else []
+        loaded = [name for name in loaded if name]
+
+    return {
+        "min_ms": min(times),
+        "median_ms": statistics.median(times),
+        "times_ms": times,
+        "loaded": loaded,
+    }
+
+@click.command()
+@click.option('--only', '-o', multiple=True, type=click.Choice(list(STARTUP_CASES)), help='실행할 항목 (여러 번 지정 가능)')
+@click.option('--repeat', '-n', default=10, help='반복 횟수')
+@click.option('--pythonpath', help='kwtools를 불러올 소스 디렉토리 (다른 버전과 비교할 때)')
+@click.option('--save', help='결과를 저장할 JSON 파일')
+def main(only, repeat, pythonpath, save):
+    """kwtools 가져오기와 명령 시작 시간을 측정합니다."""
+    baseline = measure_startup("pass", repeat, pythonpath)
+    click.echo(f"{'python':14s} {baseline['min_ms']:7.1f}ms (중앙값 {baseline['median_ms']:7.1f}ms)")
+
+    results = {"python": baseline, "cases": {}}
+    for name in only or STARTUP_CASES:
+        result = measure_startup(STARTUP_CASES[name], repeat, pythonpath)
+        results["cases"][name] = result
+        click.echo(
+            f"{name:14s} {result['min_ms']:7.1f}ms (중앙값 {result['median_ms']:7.1f}ms)  "
+            f"불러온 모듈: {', '.join(result['loaded']) or '-'}"
+        )
+
+    if save:
+        Path(save).parent.mkdir(parents=True, exist_ok=True)
+        with open(save, 'w') as f:
+            json.dump(results, f, indent=2)
+        click.echo(f"\n결과 저장: {save}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
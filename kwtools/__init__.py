@@ -2,29 +2,29 @@
 KW's utility tools for file and data management
 """
 
-from . import file_management
-from . import data_management
-
-# File management utilities
-from .file_management import (
-    move_files,
-    batch_rename,
-    add_prefix,
-    add_suffix,
-    copy_files_by_pattern,
-    find_duplicate_files,
-)
-
-# Data management utilities
-from .data_management import (
-    analyze_txt_labels as analyze_labels,  # 이전 이름과의 호환성을 위해
-    split_dataset,
-    convert_yolo_to_coco,
-    analyze_images,
-)
+from ._lazy import lazy_exports
 
 __version__ = "0.1.0"
 
+# 공개 이름은 처음 사용할 때 해당 모듈을 불러옴 (kwtools/_lazy.py 참고)
+__getattr__, __dir__ = lazy_exports(__name__, {
+    # File management utilities
+    'move_files': ('.file_management.file_ops', 'move_files'),
+    'batch_rename': ('.file_management.rename_utils', 'batch_rename'),
+    'add_prefix': ('.file_management.rename_utils', 'add_prefix'),
+    'add_suffix': ('.file_management.rename_utils', 'add_suffix'),
+    'copy_files_by_pattern': ('.file_management.file_utils', 'copy_files_by_pattern'),
+    'find_duplicate_files': ('.file_management.file_utils', 'find_duplicate_files'),
+    # Data management utilities
+    'analyze_labels': ('.data_management.label_analyzer', 'analyze_txt_labels'),  # 이전 이름과의 호환성을 위해
+    'split_dataset': ('.data_management.dataset_utils', 'split_dataset'),
+    'convert_yolo_to_coco': ('.data_management.dataset_utils', 'convert_yolo_to_coco'),
+    'convert_dataset': ('.data_management.convert', 'convert_dataset'),
+    'pack_dataset': ('.data_management.shards', 'pack_dataset'),
+    'ShardReader': ('.data_management.shards', 'ShardReader'),
+    'analyze_images': ('.data_management.image_stats', 'analyze_images'),
+}, submodules=['file_management', 'data_management'])
+
 __all__ = [
     'move_files',
     'batch_rename',
@@ -35,5 +35,8 @@ __all__ = [
     'analyze_labels',
     'split_dataset',
     'convert_yolo_to_coco',
+    'convert_dataset',
+    'pack_dataset',
+    'ShardReader',
     'analyze_images',
 ]
\ No newline at end of file
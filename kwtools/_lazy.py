@@ -0,0 +1,43 @@
+"""
+패키지 공개 이름의 지연 import (PEP 562)
+
+패키지 __init__에서 공개 함수를 바로 import 하면 kwtools를 import 하거나 가벼운 명령만 실행해도
+NumPy, PIL 같은 무거운 의존성을 모두 불러오게 되므로, 처음 사용할 때 해당 모듈을 불러옵니다.
+"""
+
+import importlib
+from typing import Callable, Dict, Iterable, List, Tuple
+
+def lazy_exports(
+    package: str,
+    exports: Dict[str, Tuple[str, str]],
+    submodules: Iterable[str] = ()
+) -> Tuple[Callable, Callable]:
+    """
+    패키지의 __getattr__과 __dir__ 생성
+
+    Args:
+        package: 패키지 이름 (__name__)
+        exports: {공개 이름: (상대 모듈 이름, 속성 이름)}
+        submodules: 속성으로 접근할 수 있는 하위 모듈 이름
+
+    Returns:
+        Tuple[Callable, Callable]: (__getattr__, __dir__)
+    """
+    submodules = set(submodules)
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str):
+        if name in submodules:
+            return importlib.import_module(f'.{name}', package)
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module_name, attr = exports[name]
+        value = getattr(importlib.import_module(module_name, package), attr)
+        namespace[name] = value  # 다음부터는 모듈 속성으로 바로 찾음
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports) | submodules)
+
+    return __getattr__, __dir__
@@ -2,32 +2,88 @@
 Command Line Interface for KW tools
 """
 
+import sys
 import click
-from .file_management.file_ops import cli as file_ops_cli
-from .file_management.rename_utils import cli as rename_cli
-from .file_management.file_utils import cli as file_utils_cli
-from .data_management.label_analyzer import cli as label_cli
-from .data_management.dataset_utils import cli as dataset_cli
-from .data_management.image_stats import cli as image_cli
-from .data_management.label_modifier import cli as label_mod_cli
-from .data_management.label_cleaner import cli as label_clean_cli
-
-@click.group()
-def main():
+import importlib
+from . import metrics
+
+# 하위 명령 이름 -> "모듈:속성", 실행할 때 해당 모듈만 불러옴
+LAZY_COMMANDS = {
+    # File management commands
+    'file': 'kwtools.file_management.file_ops:cli',
+    'rename': 'kwtools.file_management.rename_utils:cli',
+    'utils': 'kwtools.file_management.file_utils:cli',
+    # Data management commands
+    'label': 'kwtools.data_management.label_analyzer:cli',
+    'dataset': 'kwtools.data_management.dataset_utils:cli',
+    'image': 'kwtools.data_management.image_stats:cli',
+    'modify': 'kwtools.data_management.label_modifier:cli',
+    'clean': 'kwtools.data_management.label_cleaner:cli',
+}
+
+class LazyGroup(click.Group):
+    """
+    하위 명령 모듈을 실행할 때 불러오는 그룹
+
+    kwtools rename처럼 가벼운 명령을 실행할 때 NumPy, PIL 등을 쓰는 다른 명령의 모듈을
+    불러오지 않습니다. (--help로 전체 목록을 볼 때는 설명을 위해 모두 불러옴)
+    """
+
+    def __init__(self, *args, lazy_commands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_commands and cmd_name not in self.commands:
+            module_name, attr = self.lazy_commands[cmd_name].split(':')
+            self.add_command(getattr(importlib.import_module(module_name), attr), name=cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+class MetricsGroup(LazyGroup):
+    """하위 명령 실행이 끝나면 (실패해도) 기록한 지표와 프로파일 결과를 저장하는 그룹"""
+
+    def invoke(self, ctx):
+        status = 1
+        try:
+            result = super().invoke(ctx)
+            status = 0
+            return result
+        except click.exceptions.Exit as e:
+            status = e.exit_code
+            raise
+        except click.ClickException as e:
+            status = e.exit_code
+            raise
+        finally:
+            _finish_profiling(ctx, status)
+
+def _finish_profiling(ctx, status: int) -> None:
+    profiler = ctx.meta.pop('kwtools.profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(ctx.params['pstats_out'])
+    recorded = metrics.stop_recording()
+    if recorded is not None:
+        metrics.write_metrics(recorded.to_dict(sys.argv[1:], status), ctx.params['metrics_out'])
+
+@click.group(cls=MetricsGroup, lazy_commands=LAZY_COMMANDS)
+@click.option('--profile', is_flag=True, help='단계별 시간, 카운터, 처리량, 최대 메모리를 JSON으로 기록 (--metrics-out이 없으면 표준 오류로 출력)')
+@click.option('--metrics-out', type=click.Path(dir_okay=False), help='지표를 저장할 JSON 파일 (--profile 포함)')
+@click.option('--pstats-out', type=click.Path(dir_okay=False), help='cProfile 결과를 저장할 파일 (python -m pstats로 확인)')
+@click.pass_context
+def main(ctx, profile, metrics_out, pstats_out):
     """KW's utility tools for file and data management"""
-    pass
-
-# File management commands
-main.add_command(file_ops_cli, name='file')
-main.add_command(rename_cli, name='rename')
-main.add_command(file_utils_cli, name='utils')
-
-# Data management commands
-main.add_command(label_cli, name='label')
-main.add_command(dataset_cli, name='dataset')
-main.add_command(image_cli, name='image')
-main.add_command(label_mod_cli, name='modify')
-main.add_command(label_clean_cli, name='clean')
+    if profile or metrics_out or pstats_out:
+        metrics.start_recording()
+    if pstats_out:
+        import cProfile
+        # 메인 스레드만 프로파일 (작업 스레드/프로세스 제외)
+        profiler = cProfile.Profile()
+        ctx.meta['kwtools.profiler'] = profiler
+        profiler.enable()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
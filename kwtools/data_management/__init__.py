@@ -2,16 +2,31 @@
 Data management and analysis utilities
 """
 
-from .label_analyzer import analyze_txt_labels
-from .dataset_utils import split_dataset, convert_yolo_to_coco
-from .image_stats import analyze_images
-from .label_modifier import modify_yolo_labels, modify_coco_labels
+from .._lazy import lazy_exports
+
+# 공개 이름은 처음 사용할 때 해당 모듈을 불러옴 (kwtools/_lazy.py 참고)
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'analyze_txt_labels': ('.label_analyzer', 'analyze_txt_labels'),
+    'split_dataset': ('.dataset_utils', 'split_dataset'),
+    'convert_yolo_to_coco': ('.dataset_utils', 'convert_yolo_to_coco'),
+    'convert_dataset': ('.convert', 'convert_dataset'),
+    'pack_dataset': ('.shards', 'pack_dataset'),
+    'ShardReader': ('.shards', 'ShardReader'),
+    'analyze_images': ('.image_stats', 'analyze_images'),
+    'modify_yolo_labels': ('.label_modifier', 'modify_yolo_labels'),
+    'modify_coco_labels': ('.label_modifier', 'modify_coco_labels'),
+    'transform_labels': ('.label_transform', 'transform_labels'),
+})
 
 __all__ = [
     'analyze_txt_labels',
     'split_dataset',
     'convert_yolo_to_coco',
+    'convert_dataset',
+    'pack_dataset',
+    'ShardReader',
     'analyze_images',
     'modify_yolo_labels',
     'modify_coco_labels',
+    'transform_labels',
 ]
\ No newline at end of file
@@ -0,0 +1,207 @@
+import csv
+import json
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+from .label_store import load_label_store
+
+# 기본 구간 수 (1차원 히스토그램의 구간 수, 중심 히트맵은 구간 수 x 구간 수)
+GEOMETRY_BINS = 32
+
+# 1차원 히스토그램: 이름 -> (척도, 최소, 최대), 범위를 벗어난 값은 양 끝 구간에 셈
+#   width, height: 정규화된 박스 크기, area: log10(w * h), aspect: log2(w / h)
+HISTOGRAMS = {
+    "width": ("linear", 0.0, 1.0),
+    "height": ("linear", 0.0, 1.0),
+    "area": ("log10", -6.0, 0.0),
+    "aspect": ("log2", -4.0, 4.0),
+}
+
+# 이 개수만큼 박스가 모이면 히스토그램에 반영
+_FLUSH_ROWS = 1 << 16
+
+def _quantize(values: np.ndarray, low: float, high: float, bins: int) -> np.ndarray:
+    """값을 [low, high]를 bins개로 나눈 구간 번호로 변환 (범위를 벗어나면 양 끝 구간)"""
+    index = np.floor((values - low) * (bins / (high - low)))
+    return np.clip(np.nan_to_num(index, nan=0.0), 0, bins - 1).astype(np.int64)
+
+class BoxGeometry:
+    """
+    클래스별 박스 기하 히스토그램 (너비, 높이, 넓이, 종횡비, 중심 히트맵)
+
+    구간이 고정되어 있으므로 메모리 사용량은 박스 수와 무관하게 (클래스 수 x 구간 수)입니다.
+    박스는 묶음 단위로 양자화한 뒤 bincount로 누적하며, 작업 프로세스별 결과는 merge로 합칩니다.
+    """
+
+    def __init__(self, bins: int = GEOMETRY_BINS):
+        self.bins = bins
+        self.classes: Dict[int, Dict[str, np.ndarray]] = {}  # class_id -> {이름: 히스토그램}
+        self._pending: List[Sequence[float]] = []
+
+    def _new_class(self) -> Dict[str, np.ndarray]:
+        histograms = {name: np.zeros(self.bins, dtype=np.int64) for name in HISTOGRAMS}
+        histograms["center"] = np.zeros((self.bins, self.bins), dtype=np.int64)  # [y, x]
+        return histograms
+
+    def add(self, class_ids: np.ndarray, boxes: np.ndarray) -> None:
+        """
+        박스 묶음을 누적
+
+        Args:
+            class_ids: (N,) 클래스 ID
+            boxes: (N, 4) 정규화된 YOLO 박스 [x, y, w, h]
+        """
+        if not len(class_ids):
+            return
+        bins = self.bins
+        classes, inverse = np.unique(np.asarray(class_ids, dtype=np.int64), return_inverse=True)
+        boxes = np.asarray(boxes, dtype=np.float64)
+        x, y, w, h = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = {
+                "width": w,
+                "height": h,
+                "area": np.log10(w * h),
+                "aspect": np.log2(w / h),
+            }
+
+        # 클래스 위치 * 구간 수 + 구간 번호로 모든 클래스를 한 번의 bincount로 셈
+        counts = {}
+        for name, (_, low, high) in HISTOGRAMS.items():
+            index = inverse * bins + _quantize(values[name], low, high, bins)
+            counts[name] = np.bincount(index, minlength=len(classes) * bins).reshape(len(classes), bins)
+        cell = _quantize(y, 0.0, 1.0, bins) * bins + _quantize(x, 0.0, 1.0, bins)
+        counts["center"] = np.bincount(
+            inverse * bins * bins + cell, minlength=len(classes) * bins * bins
+        ).reshape(len(classes), bins, bins)
+
+        for k, class_id in enumerate(classes.tolist()):
+            if class_id not in self.classes:
+                self.classes[class_id] = self._new_class()
+            for name, histogram in self.classes[class_id].items():
+                histogram += counts[name][k]
+
+    def add_rows(self, rows: Sequence[Sequence[float]]) -> None:
+        """[class_id, x, y, w, h] 행들을 모았다가 일정 개수가 되면 한 번에 누적 (파일 단위 호출용)"""
+        self._pending.extend(rows)
+        if len(self._pending) >= _FLUSH_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        """add_rows로 모아둔 행을 히스토그램에 반영"""
+        if self._pending:
+            rows = np.array(self._pending, dtype=np.float64).reshape(-1, 5)
+            self._pending = []
+            self.add(rows[:, 0].astype(np.int64), rows[:, 1:5])
+
+    def merge(self, other: "BoxGeometry") -> None:
+        """다른 결과(같은 구간 수)를 합침"""
+        if other.bins != self.bins:
+            raise ValueError(f"구간 수가 다른 결과는 합칠 수 없습니다: {self.bins} != {other.bins}")
+        self.flush()
+        other.flush()
+        for class_id, histograms in other.classes.items():
+            if class_id not in self.classes:
+                self.classes[class_id] = self._new_class()
+            for name, histogram in histograms.items():
+                self.classes[class_id][name] += histogram
+
+    def __getstate__(self) -> Dict:
+        # 작업 프로세스에서 돌려줄 때 모아둔 행도 반영
+        self.flush()
+        return self.__dict__
+
+    def total(self) -> Dict[str, np.ndarray]:
+        """모든 클래스를 합친 히스토그램"""
+        self.flush()
+        total = self._new_class()
+        for histograms in self.classes.values():
+            for name, histogram in histograms.items():
+                total[name] += histogram
+        return total
+
+    def edges(self) -> Dict[str, List[float]]:
+        """히스토그램별 구간 경계 (area, aspect는 로그 척도 값, center는 x, y 공통)"""
+        edges = {name: np.linspace(low, high, self.bins + 1).tolist() for name, (_, low, high) in HISTOGRAMS.items()}
+        edges["center"] = np.linspace(0.0, 1.0, self.bins + 1).tolist()
+        return edges
+
+    def median(self, histogram: np.ndarray, name: str) -> Optional[float]:
+        """1차원 히스토그램의 중앙값이 속한 구간의 중앙 (원래 척도로 변환, 비어 있으면 None)"""
+        total = int(histogram.sum())
+        if total == 0:
+            return None
+        scale, low, high = HISTOGRAMS[name]
+        k = int(np.searchsorted(np.cumsum(histogram), (total + 1) / 2))
+        value = low + (k + 0.5) * (high - low) / self.bins
+        if scale == "log10":
+            return 10 ** value
+        if scale == "log2":
+            return 2 ** value
+        return value
+
+    def to_dict(self, class_names: Optional[Dict[int, str]] = None) -> Dict:
+        """JSON으로 저장할 결과 ({"bins", "scales", "edges", "classes": {class_id: ...}, "all": ...})"""
+        class_names = class_names or {}
+        self.flush()
+
+        def entry(histograms: Dict[str, np.ndarray], name: Optional[str]) -> Dict:
+            result = {"name": name, "count": int(histograms["width"].sum())}
+            result.update({key: histogram.tolist() for key, histogram in histograms.items()})
+            return result
+
+        return {
+            "bins": self.bins,
+            "scales": {name: scale for name, (scale, _, _) in HISTOGRAMS.items()},
+            "edges": self.edges(),
+            "classes": {
+                str(class_id): entry(self.classes[class_id], class_names.get(class_id))
+                for class_id in sorted(self.classes)
+            },
+            "all": entry(self.total(), None),
+        }
+
+    def write(self, output_file: str, class_names: Optional[Dict[int, str]] = None) -> None:
+        """
+        결과를 파일로 저장 (확장자가 .csv이면 CSV, 그 외에는 JSON)
+
+        CSV는 한 줄에 구간 하나이며 (class_id, name, histogram, x_bin, y_bin, x_min, x_max, y_min, y_max, count)
+        열로 구성됩니다. 1차원 히스토그램은 y 관련 열이 비어 있고, 모든 클래스 합계는 class_id가 "all"입니다.
+        """
+        self.flush()
+        if not str(output_file).lower().endswith('.csv'):
+            with open(output_file, 'w') as f:
+                json.dump(self.to_dict(class_names), f, ensure_ascii=False)
+            return
+
+        class_names = class_names or {}
+        edges = self.edges()
+        rows = [(class_id, class_names.get(class_id, ""), self.classes[class_id]) for class_id in sorted(self.classes)]
+        rows.append(("all", "", self.total()))
+        with open(output_file, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["class_id", "name", "histogram", "x_bin", "y_bin", "x_min", "x_max", "y_min", "y_max", "count"])
+            for class_id, name, histograms in rows:
+                for key in HISTOGRAMS:
+                    for i, count in enumerate(histograms[key].tolist()):
+                        writer.writerow([class_id, name, key, i, "", edges[key][i], edges[key][i + 1], "", "", count])
+                center = edges["center"]
+                for (j, i), count in np.ndenumerate(histograms["center"]):
+                    writer.writerow([class_id, name, "center", i, j, center[i], center[i + 1], center[j], center[j + 1], int(count)])
+
+def label_store_geometry(store_dir: str, bins: int = GEOMETRY_BINS, chunk_rows: int = 1 << 20) -> BoxGeometry:
+    """
+    라벨 저장소의 박스 기하 히스토그램 (메모리 맵 열을 chunk_rows개씩 읽음)
+
+    analyze_label_store와 같이 confidence가 있는 6개 값 라인은 제외합니다.
+    """
+    store = load_label_store(store_dir)
+    geometry = BoxGeometry(bins)
+    for start in range(0, len(store["class_id"]), chunk_rows):
+        end = start + chunk_rows
+        class_ids = np.asarray(store["class_id"][start:end])
+        boxes = np.stack([np.asarray(store[name][start:end], dtype=np.float64) for name in ("x", "y", "w", "h")], axis=1)
+        if store["conf"] is not None:
+            valid = np.isnan(np.asarray(store["conf"][start:end]))
+            class_ids, boxes = class_ids[valid], boxes[valid]
+        geometry.add(class_ids, boxes)
+    return geometry
\ No newline at end of file
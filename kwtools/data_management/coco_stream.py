@@ -0,0 +1,184 @@
+import re
+import json
+from typing import BinaryIO, Dict, Tuple
+
+# 구조 토큰: 문자열(뒤에 ':'가 오면 키) 또는 괄호
+_TOKEN = re.compile(rb'("[^"\\]*(?:\\.[^"\\]*)*")(\s*:)?|[{}\[\]]', re.S)
+
+# 괄호 깊이가 3 이하인 객체/배열 전체를 한 번에 찾기 위한 패턴
+# (annotations, images의 원소를 토큰 단위로 훑지 않고 C 속도로 건너뜀).
+# 모든 반복을 "일반 문자* (하위 요소 일반 문자*)*" 형태로 써서 매칭 방법이 하나뿐이므로
+# chunk 끝에서 잘린 객체에 대해 매칭이 실패해도 역추적이 길이에 비례하는 만큼만 일어남
+_STR = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+_ATOMS = rb'[^\[\]{}"]*'
+_LEVEL0 = _ATOMS + rb'(?:' + _STR + _ATOMS + rb')*'
+_LEVEL1 = _ATOMS + rb'(?:(?:' + _STR + rb'|\[' + _LEVEL0 + rb'\]|\{' + _LEVEL0 + rb'\})' + _ATOMS + rb')*'
+_LEVEL2 = _ATOMS + rb'(?:(?:' + _STR + rb'|\[' + _LEVEL1 + rb'\]|\{' + _LEVEL1 + rb'\})' + _ATOMS + rb')*'
+_NESTED = re.compile(rb'\[' + _LEVEL2 + rb'\]|\{' + _LEVEL2 + rb'\}', re.S)
+# 객체의 최상위 category_id 정수 값 (중첩된 객체/배열은 통째로 건너뜀)
+_TOP_CATEGORY_ID = re.compile(
+    rb'\{(?:[^\[\]{}"]|' + _STR + rb'|\[' + _LEVEL1 + rb'\]|\{' + _LEVEL1 + rb'\})*?'
+    rb'"category_id"\s*:\s*(-?\d+)(?=[\s,}\]])',
+    re.S
+)
+# 키 뒤의 정수 값 (값 뒤에 구분자가 와야 완전한 숫자)
+_INT_VALUE = re.compile(rb'\s*:\s*(-?\d+)(?=[\s,}\]])')
+
+_OBJECT = ord('{')
+_ARRAY = ord('[')
+_CLOSE_OBJECT = ord('}')
+
+# 키 뒤의 ':'나 숫자 값이 잘려 있지 않도록 토큰 뒤에 최소한 확보할 바이트 수
+_LOOKAHEAD = 64
+
+def resolve_category_mapping(class_mapping: Dict) -> Tuple[Dict[int, int], Dict[int, str]]:
+    """
+    modify_coco_labels의 매핑을 (ID 매핑, 이름 매핑)으로 분리
+
+    값이 정수이면 ID만, 문자열이면 이름만, {"id", "name"} 딕셔너리이면 있는 항목을 변경합니다.
+    """
+    id_map = {}
+    name_map = {}
+    for old_id, new_value in class_mapping.items():
+        if isinstance(new_value, str):
+            name_map[old_id] = new_value
+        elif isinstance(new_value, dict):
+            if 'id' in new_value:
+                id_map[old_id] = int(new_value['id'])
+            if 'name' in new_value:
+                name_map[old_id] = new_value['name']
+        else:
+            id_map[old_id] = int(new_value)
+    return id_map, name_map
+
+def stream_remap_coco(
+    src: BinaryIO,
+    dst: BinaryIO,
+    id_map: Dict[int, int],
+    name_map: Dict[int, str],
+    chunk_size: int = 16 * 1024 * 1024
+) -> Dict[str, int]:
+    """
+    COCO JSON을 통째로 읽지 않고 카테고리 ID/이름만 바꿔서 복사
+
+    입력을 chunk 단위로 읽으며 문자열과 괄호만 토큰으로 추적합니다. 최상위
+    annotations[*].category_id 값과 categories[*] 객체만 다시 쓰고, 나머지 바이트는
+    그대로 출력합니다. 메모리 사용량은 chunk_size와 가장 큰 카테고리 객체 크기로 제한됩니다.
+
+    Args:
+        src: 입력 파일 (바이너리)
+        dst: 출력 파일 (바이너리)
+        id_map: {이전 ID: 새 ID}
+        name_map: {이전 ID: 새 이름}
+        chunk_size: 한 번에 읽을 바이트 수
+
+    Returns:
+        Dict[str, int]: {"categories": 수정된 카테고리 수, "annotations": 수정된 어노테이션 수}
+    """
+    buf = b''
+    out_pos = 0  # buf에서 아직 출력하지 않은 첫 위치
+    capture = None  # 수집 중인 카테고리 객체의 시작 위치
+    stack = []  # [괄호 종류, 객체의 현재 키]
+    counts = {"categories": 0, "annotations": 0}
+    restart = 0  # 다음 토큰 탐색 위치
+    eof = False
+
+    def remap_category_id(value: re.Match) -> None:
+        # annotations 원소의 category_id 값 교체
+        nonlocal out_pos
+        old_id = int(value.group(1))
+        if old_id in id_map:
+            dst.write(buf[out_pos:value.start(1)])
+            dst.write(str(id_map[old_id]).encode())
+            out_pos = value.end(1)
+            counts["annotations"] += 1
+
+    while True:
+        # restart 앞까지 출력하고 다음 chunk를 이어 붙임 (수집 중인 카테고리는 유지)
+        flush_to = restart if capture is None else capture
+        dst.write(buf[out_pos:flush_to])
+        data = src.read(chunk_size)
+        eof = not data
+        buf = buf[flush_to:] + data
+        restart -= flush_to
+        out_pos = 0
+        if capture is not None:
+            capture = 0
+        end_of_buf = len(buf)
+
+        pos = restart
+        while True:
+            match = _TOKEN.search(buf, pos)
+            if match is None:
+                # 마지막 토큰 뒤에 닫히지 않은 문자열이 있으면 거기서 다시 읽음
+                quote = buf.find(b'"', pos)
+                restart = quote if quote != -1 else end_of_buf
+                break
+            start = match.start()
+            # 이전 토큰과의 사이에 따옴표가 있으면 닫히지 않은 문자열 (chunk 경계)
+            quote = buf.find(b'"', pos, start)
+            if quote != -1:
+                restart = quote
+                break
+            # 키 뒤의 ':'나 category_id 값이 다음 chunk에 있을 수 있으므로 끝에 가까운 토큰은 다시 읽음
+            if not eof and end_of_buf - match.end() < _LOOKAHEAD:
+                restart = start
+                break
+            pos = match.end()
+
+            key = match.group(1)
+            if key is None:
+                char = buf[start]
+                if char == _OBJECT or char == _ARRAY:
+                    depth = len(stack)
+                    if depth >= 2 and capture is None:
+                        if not (depth == 2 and char == _OBJECT and stack[0][1] == b'"categories"'):
+                            # 다시 쓸 내용이 없는 하위 구조는 통째로 건너뜀
+                            nested = _NESTED.match(buf, start)
+                            if nested is not None:
+                                if depth == 2 and char == _OBJECT and stack[0][1] == b'"annotations"':
+                                    value = _TOP_CATEGORY_ID.match(buf, start, nested.end())
+                                    if value is not None:
+                                        remap_category_id(value)
+                                pos = nested.end()
+                                continue
+                    # 최상위 categories 배열의 원소 객체는 통째로 수집하여 다시 씀
+                    if (char == _OBJECT and capture is None and depth == 2
+                            and stack[0][1] == b'"categories"' and stack[1][0] == _ARRAY):
+                        capture = start
+                    stack.append([char, None])
+                    continue
+
+                stack.pop()
+                if char == _CLOSE_OBJECT and capture is not None and len(stack) == 2:
+                    category = json.loads(buf[capture:pos])
+                    old_id = category.get('id')
+                    if old_id in name_map or old_id in id_map:
+                        if old_id in name_map:
+                            category['name'] = name_map[old_id]
+                        if old_id in id_map:
+                            category['id'] = id_map[old_id]
+                        dst.write(buf[out_pos:capture])
+                        dst.write(json.dumps(category, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+                        out_pos = pos
+                        counts["categories"] += 1
+                    capture = None
+                continue
+
+            if match.group(2) is None:
+                continue  # 문자열 값
+            stack[-1][1] = key
+
+            # 최상위 annotations 배열 안 객체의 category_id
+            if (key == b'"category_id"' and len(stack) == 3
+                    and stack[0][1] == b'"annotations"' and stack[1][0] == _ARRAY):
+                value = _INT_VALUE.match(buf, match.end(1))
+                if value is not None:
+                    remap_category_id(value)
+                    pos = value.end()
+
+        if eof:
+            break
+
+    dst.write(buf[out_pos:])
+    return counts
\ No newline at end of file
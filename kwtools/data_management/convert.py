@@ -0,0 +1,584 @@
+import json
+import shutil
+import tempfile
+import numpy as np
+import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape
+from tqdm import tqdm
+from .. import metrics
+from .label_store import is_label_store, load_label_store, store_file_index, store_file_rows
+from ..file_management.scanner import scan_files
+
+# 지원하는 형식
+CONVERT_FORMATS = ('coco', 'yolo', 'voc')
+
+# YOLO 입력에서 찾을 이미지 파일 패턴
+IMAGE_PATTERNS = ["*.jpg", "*.jpeg", "*.png", "*.bmp"]
+
+# 형식 사이에서 주고받는 이미지 묶음 (boxes는 절대 좌표 [x_min, y_min, x_max, y_max])
+#   {"file_names": [n], "sizes": (n, 2) [width, height], "counts": (n,) 이미지별 객체 수,
+#    "classes": (m,) categories 목록의 위치, "boxes": (m, 4)}
+Batch = Dict
+
+# --- 좌표 변환 (묶음 전체에 대한 배열 연산) ---
+
+def yolo_to_xyxy(boxes: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+    """정규화된 YOLO 박스 (중심 x, 중심 y, w, h)를 절대 좌표 [x_min, y_min, x_max, y_max]로 변환 (sizes: 박스별 [width, height])"""
+    scale = np.tile(sizes, 2).astype(np.float64)
+    center = boxes[:, :2] * scale[:, :2]
+    half = boxes[:, 2:4] * scale[:, 2:] / 2
+    return np.concatenate([center - half, center + half], axis=1)
+
+def xyxy_to_yolo(boxes: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+    """절대 좌표 [x_min, y_min, x_max, y_max]를 정규화된 YOLO 박스 (중심 x, 중심 y, w, h)로 변환"""
+    scale = np.tile(sizes, 2).astype(np.float64)
+    center = (boxes[:, :2] + boxes[:, 2:]) / 2
+    size = boxes[:, 2:] - boxes[:, :2]
+    return np.concatenate([center, size], axis=1) / scale
+
+def coco_to_xyxy(boxes: np.ndarray) -> np.ndarray:
+    """COCO 박스 [x_min, y_min, w, h]를 [x_min, y_min, x_max, y_max]로 변환"""
+    return np.concatenate([boxes[:, :2], boxes[:, :2] + boxes[:, 2:4]], axis=1)
+
+def xyxy_to_coco(boxes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """[x_min, y_min, x_max, y_max]를 (COCO 박스 [x_min, y_min, w, h], 넓이)로 변환"""
+    size = boxes[:, 2:] - boxes[:, :2]
+    return np.concatenate([boxes[:, :2], size], axis=1), size[:, 0] * size[:, 1]
+
+def yolo_to_coco_boxes(rows: np.ndarray, width: int, height: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    정규화된 YOLO 박스 (중심 x, 중심 y, w, h)를 COCO 절대 좌표 박스로 변환
+
+    Args:
+        rows: (N, 5) 배열 [class_id, x, y, w, h]
+        width: 이미지 너비
+        height: 이미지 높이
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: ((N, 4) 배열 [x_min, y_min, w, h], (N,) 넓이)
+    """
+    sizes = np.broadcast_to(np.array([width, height]), (len(rows), 2))
+    return xyxy_to_coco(yolo_to_xyxy(rows[:, 1:5], sizes))
+
+def _make_batch(file_names: List[str], sizes, counts, classes, boxes) -> Batch:
+    return {
+        "file_names": file_names,
+        "sizes": np.asarray(sizes, dtype=np.int64).reshape(-1, 2),
+        "counts": np.asarray(counts, dtype=np.int64),
+        "classes": np.asarray(classes, dtype=np.int64),
+        "boxes": np.asarray(boxes, dtype=np.float64).reshape(-1, 4),
+    }
+
+def _filter_rows(batch: Batch, keep: np.ndarray) -> Batch:
+    """keep이 False인 객체를 묶음에서 제외"""
+    if keep.all():
+        return batch
+    owner = np.repeat(np.arange(len(batch["counts"])), batch["counts"])
+    batch["counts"] = np.bincount(owner[keep], minlength=len(batch["counts"]))
+    batch["classes"] = batch["classes"][keep]
+    batch["boxes"] = batch["boxes"][keep]
+    return batch
+
+def read_class_names(class_file: str) -> List[str]:
+    """
+    클래스 이름 파일을 줄 번호 = 클래스 ID 목록으로 읽음
+
+    중간의 빈 줄도 ID를 차지하므로 (label_analyzer와 동일) 이름을 class_{ID}로 채우고,
+    파일 끝의 빈 줄만 버립니다.
+    """
+    with open(class_file, 'r') as f:
+        names = [line.strip() for line in f]
+    while names and not names[-1]:
+        names.pop()
+    return [name or f"class_{idx}" for idx, name in enumerate(names)]
+
+# --- 입력 형식 ---
+
+def _read_coco(
+    source: str,
+    categories: List[Dict],
+    stats: Dict,
+    batch_size: int,
+    jobs: int,
+    classes_file: Optional[str] = None,
+    img_dir: Optional[str] = None,
+    recursive: bool = False
+) -> Iterator[Batch]:
+    """
+    COCO JSON을 읽어 이미지 묶음으로 반환
+
+    어노테이션을 한 번만 훑어 배열로 모은 뒤 image_id로 정렬하여 이미지별로 나눕니다.
+    이미지나 카테고리를 찾을 수 없는 어노테이션은 건너뜁니다.
+    """
+    with metrics.stage('read'):
+        with open(source, 'rb') as f:
+            data = json.load(f)
+
+    with metrics.stage('parse'):
+        categories.extend(dict(category) for category in data.get("categories", []))
+        images = data.get("images", [])
+        file_names = [image["file_name"] for image in images]
+        image_ids = np.array([image["id"] for image in images], dtype=np.int64)
+        sizes = np.array([(image.get("width", 0), image.get("height", 0)) for image in images], dtype=np.int64).reshape(-1, 2)
+
+        annotations = data.get("annotations", [])
+        if annotations:
+            ann_images, ann_categories, ann_boxes = zip(*map(itemgetter("image_id", "category_id", "bbox"), annotations))
+            ann_images = np.array(ann_images, dtype=np.int64)
+            ann_categories = np.array(ann_categories, dtype=np.int64)
+            ann_boxes = np.array(ann_boxes, dtype=np.float64).reshape(-1, 4)
+        else:
+            ann_images = ann_categories = np.zeros(0, dtype=np.int64)
+            ann_boxes = np.zeros((0, 4))
+        del data, images, annotations
+
+    with metrics.stage('compute'):
+        # image_id, category_id -> 위치 (정렬한 ID 배열에서 이진 탐색)
+        def locate(ids: np.ndarray, refs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            order = np.argsort(ids, kind='stable')
+            pos = np.minimum(np.searchsorted(ids[order], refs), max(len(ids) - 1, 0))
+            if not len(ids):
+                return pos, np.zeros(len(refs), dtype=bool)
+            return order[pos], ids[order][pos] == refs
+
+        img_idx, found_image = locate(image_ids, ann_images)
+        cls_idx, found_class = locate(np.array([c["id"] for c in categories], dtype=np.int64), ann_categories)
+        keep = found_image & found_class
+        stats["skipped"] += int(len(keep) - keep.sum())
+
+        # 이미지 순서대로 정렬하여 이미지별 구간 계산
+        img_idx = img_idx[keep]
+        order = np.argsort(img_idx, kind='stable')
+        classes = cls_idx[keep][order]
+        boxes = coco_to_xyxy(ann_boxes[keep][order])
+        counts = np.bincount(img_idx, minlength=len(file_names))
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    for start in range(0, len(file_names), batch_size):
+        end = min(start + batch_size, len(file_names))
+        lo, hi = offsets[start], offsets[end]
+        yield _make_batch(file_names[start:end], sizes[start:end], counts[start:end], classes[lo:hi], boxes[lo:hi])
+
+def _read_yolo_rows(label_file: Path) -> np.ndarray:
+    """YOLO 라벨 파일을 (N, 5) 배열 [class_id, x, y, w, h]로 읽음 (confidence 등 추가 값은 무시)"""
+    rows = []
+    with open(label_file, 'r') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 5:
+                rows.append([float(v) for v in parts[:5]])
+    return np.array(rows, dtype=np.float64).reshape(-1, 5)
+
+def _read_image_size(img_file: Path) -> Optional[Tuple[int, int]]:
+    """이미지 헤더만 읽어 (width, height) 반환 (읽을 수 없으면 None)"""
+    from PIL import Image  # 이미지 크기가 필요한 YOLO 입력에서만 불러옴
+    try:
+        with Image.open(img_file) as img:
+            return img.size
+    except Exception as e:
+        print(f"Error processing {img_file}: {e}")
+        return None
+
+def _read_yolo(
+    source: str,
+    categories: List[Dict],
+    stats: Dict,
+    batch_size: int,
+    jobs: int,
+    classes_file: Optional[str] = None,
+    img_dir: Optional[str] = None,
+    recursive: bool = False
+) -> Iterator[Batch]:
+    """
+    YOLO 라벨 디렉토리(또는 라벨 저장소)를 이미지 묶음으로 반환
+
+    이미지 디렉토리의 이미지마다 헤더에서 크기를 읽고 같은 이름의 라벨을 찾습니다.
+    recursive이면 하위 디렉토리까지 찾고, 라벨은 이미지와 같은 상대 경로에서 찾으며
+    file_name에 상대 경로를 기록합니다 (check_pairs와 같은 기준).
+    클래스 파일에 없는 클래스 ID의 객체는 건너뜁니다. 크기를 읽을 수 없는 이미지와
+    숫자가 아닌 값이 있는 라벨의 이미지는 제외하고 error_files에 기록합니다 (이미지 경로).
+    """
+    if classes_file is None:
+        raise ValueError("YOLO 입력에는 클래스 파일(--classes)이 필요합니다.")
+    categories.extend(
+        {"id": idx, "name": name, "supercategory": "none"}
+        for idx, name in enumerate(read_class_names(classes_file))
+    )
+
+    store = None
+    if is_label_store(source):
+        store = load_label_store(source)
+        store_index = store_file_index(store)
+        if img_dir is None:
+            img_dir = store["meta"]["source_dir"]
+    if img_dir is None:
+        img_dir = source
+    label_path = Path(source)
+    img_root = Path(img_dir)
+
+    def relative_stem(img_file: Path) -> str:
+        return img_file.relative_to(img_root).with_suffix('').as_posix()
+
+    def load(img_file: Path) -> Optional[Tuple[int, int, np.ndarray]]:
+        # 이미지 크기와 라벨 읽기 (크기나 라벨을 읽을 수 없으면 None)
+        size = _read_image_size(img_file)
+        if size is None:
+            return None
+        width, height = size
+        if store is not None:
+            idx = store_index.get(relative_stem(img_file))
+            rows = store_file_rows(store, idx) if idx is not None else np.zeros((0, 5))
+        else:
+            label_file = label_path / f"{relative_stem(img_file)}.txt"
+            try:
+                rows = _read_yolo_rows(label_file) if label_file.exists() else np.zeros((0, 5))
+            except (OSError, ValueError) as e:
+                print(f"Error processing {label_file}: {e}")
+                return None
+        return width, height, rows
+
+    img_files = scan_files(img_root, IMAGE_PATTERNS, recursive)
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        while True:
+            batch = list(islice(img_files, batch_size))
+            if not batch:
+                break
+            with metrics.stage('read'):
+                loaded = list(executor.map(load, batch))
+            failed = [str(img_file) for img_file, result in zip(batch, loaded) if result is None]
+            if failed:
+                stats["error_files"].extend(failed)
+                batch = [img_file for img_file, result in zip(batch, loaded) if result is not None]
+                loaded = [result for result in loaded if result is not None]
+            with metrics.stage('compute'):
+                sizes = np.array([(width, height) for width, height, _ in loaded], dtype=np.int64).reshape(-1, 2)
+                counts = np.array([len(rows) for _, _, rows in loaded], dtype=np.int64)
+                rows = np.concatenate([rows for _, _, rows in loaded] + [np.zeros((0, 5))])
+                result = _make_batch(
+                    [img_file.relative_to(img_root).as_posix() for img_file in batch], sizes, counts, rows[:, 0].astype(np.int64),
+                    yolo_to_xyxy(rows[:, 1:5], np.repeat(sizes, counts, axis=0))
+                )
+                keep = (result["classes"] >= 0) & (result["classes"] < len(categories))
+                stats["skipped"] += int(len(keep) - keep.sum())
+                result = _filter_rows(result, keep)
+            yield result
+
+def _parse_voc(xml_file: Path) -> Optional[Tuple[str, int, int, List[Tuple[str, List[float]]]]]:
+    """VOC XML 하나를 (파일 이름, width, height, [(클래스 이름, [xmin, ymin, xmax, ymax])])로 읽음"""
+    try:
+        root = ET.parse(xml_file).getroot()
+        size = root.find('size')
+        width = int(float(size.findtext('width'))) if size is not None else 0
+        height = int(float(size.findtext('height'))) if size is not None else 0
+        objects = []
+        for obj in root.iter('object'):
+            box = obj.find('bndbox')
+            objects.append((obj.findtext('name').strip(), [float(box.findtext(key)) for key in ('xmin', 'ymin', 'xmax', 'ymax')]))
+        return root.findtext('filename') or f"{xml_file.stem}.jpg", width, height, objects
+    except Exception as e:
+        print(f"Error processing {xml_file}: {e}")
+        return None
+
+def _read_voc(
+    source: str,
+    categories: List[Dict],
+    stats: Dict,
+    batch_size: int,
+    jobs: int,
+    classes_file: Optional[str] = None,
+    img_dir: Optional[str] = None,
+    recursive: bool = False
+) -> Iterator[Batch]:
+    """
+    VOC XML 디렉토리를 이미지 묶음으로 반환
+
+    클래스 파일이 있으면 그 순서를 따르고, 없는 클래스 이름은 처음 나온 순서대로 뒤에 추가합니다.
+    VOC 좌표는 1부터 시작하는 픽셀 좌표이므로 x_min, y_min에서 1을 뺍니다.
+    recursive이면 하위 디렉토리까지 찾고, file_name은 XML의 상대 디렉토리 + filename입니다.
+    """
+    if classes_file is not None:
+        categories.extend(
+            {"id": idx, "name": name, "supercategory": "none"}
+            for idx, name in enumerate(read_class_names(classes_file))
+        )
+    class_index = {category["name"]: idx for idx, category in enumerate(categories)}
+
+    def class_of(name: str) -> int:
+        if name not in class_index:
+            class_index[name] = len(categories)
+            categories.append({"id": len(categories), "name": name, "supercategory": "none"})
+        return class_index[name]
+
+    xml_root = Path(source)
+    xml_files = scan_files(xml_root, "*.xml", recursive)
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        while True:
+            batch = list(islice(xml_files, batch_size))
+            if not batch:
+                break
+            with metrics.stage('parse'):
+                parsed = list(executor.map(_parse_voc, batch))
+            stats["error_files"].extend(str(xml_file) for xml_file, result in zip(batch, parsed) if result is None)
+            parsed_files = [xml_file for xml_file, result in zip(batch, parsed) if result is not None]
+            parsed = [result for result in parsed if result is not None]
+            with metrics.stage('compute'):
+                objects = [obj for _, _, _, image_objects in parsed for obj in image_objects]
+                boxes = np.array([box for _, box in objects], dtype=np.float64).reshape(-1, 4)
+                boxes[:, :2] -= 1
+                result = _make_batch(
+                    [
+                        (xml_file.parent.relative_to(xml_root) / name).as_posix()
+                        for xml_file, (name, _, _, _) in zip(parsed_files, parsed)
+                    ],
+                    [(width, height) for _, width, height, _ in parsed],
+                    [len(image_objects) for _, _, _, image_objects in parsed],
+                    [class_of(name) for name, _ in objects],
+                    boxes
+                )
+            yield result
+
+# --- 출력 형식 ---
+
+def _write_coco(batches: Iterator[Batch], output: str, categories: List[Dict], stats: Dict, jobs: int) -> None:
+    """
+    이미지 묶음을 COCO JSON 하나로 기록
+
+    images와 annotations 배열을 파일에 바로 기록하므로 메모리 사용량은 데이터셋 크기와
+    무관합니다. categories는 입력을 모두 읽은 뒤에 기록합니다 (VOC 입력은 읽으면서 클래스가 늘어남).
+    """
+    output_path = Path(output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # annotations는 임시 파일에 모았다가 images 배열 뒤에 이어 붙임
+    with open(output_path, 'w') as out, \
+            tempfile.TemporaryFile('w+', dir=output_path.parent) as ann_out:
+        out.write('{"images":[')
+        for batch in batches:
+            with metrics.stage('compute'):
+                category_ids = np.array([category["id"] for category in categories], dtype=np.int64)
+                boxes, areas = xyxy_to_coco(batch["boxes"])
+                image_ids = np.repeat(np.arange(len(batch["counts"])) + stats["images"], batch["counts"])
+                ann_ids = np.arange(len(areas)) + stats["annotations"]
+            with metrics.stage('write'):
+                images = [
+                    json.dumps({"id": img_id, "file_name": name, "width": width, "height": height})
+                    for img_id, name, (width, height) in zip(
+                        range(stats["images"], stats["images"] + len(batch["file_names"])),
+                        batch["file_names"], batch["sizes"].tolist()
+                    )
+                ]
+                annotations = [
+                    f'{{"id":{ann_id},"image_id":{img_id},"category_id":{category_id},'
+                    f'"bbox":[{x!r},{y!r},{w!r},{h!r}],"area":{area!r},"iscrowd":0}}'
+                    for ann_id, img_id, category_id, (x, y, w, h), area in zip(
+                        ann_ids.tolist(), image_ids.tolist(), category_ids[batch["classes"]].tolist(),
+                        boxes.tolist(), areas.tolist()
+                    )
+                ]
+                if images:
+                    out.write((',' if stats["images"] else '') + ','.join(images))
+                if annotations:
+                    ann_out.write((',' if stats["annotations"] else '') + ','.join(annotations))
+            stats["images"] += len(images)
+            stats["annotations"] += len(annotations)
+
+        with metrics.stage('write'):
+            out.write('],"annotations":[')
+            ann_out.seek(0)
+            shutil.copyfileobj(ann_out, out)
+            out.write('],"categories":')
+            out.write(json.dumps(categories, ensure_ascii=False))
+            out.write('}')
+
+def _output_file(output_dir: str, name: str, suffix: str, created: set) -> Path:
+    """
+    이미지 file_name에 해당하는 출력 파일 경로 (하위 디렉토리 유지, 필요하면 생성)
+
+    COCO file_name의 a/0001.jpg, b/0001.jpg가 서로 덮어쓰지 않도록 상대 경로를 유지하며,
+    절대 경로와 '..'은 무시하여 output_dir 밖에는 기록하지 않습니다.
+    """
+    path = Path(name)
+    parts = [part for part in path.parts if part not in (path.anchor, '.', '..')]
+    output_file = Path(output_dir).joinpath(*parts).with_suffix(suffix)
+    parent = output_file.parent
+    if parent not in created:
+        parent.mkdir(parents=True, exist_ok=True)
+        created.add(parent)
+    return output_file
+
+def _write_yolo_batch(output_dir: str, batch: Batch, class_names: List[str]) -> Tuple[int, List[str]]:
+    """이미지 묶음을 이미지별 YOLO 라벨 파일로 기록 (작업 프로세스에서 실행), (객체 수, 오류 파일 목록) 반환"""
+    sizes = np.repeat(batch["sizes"], batch["counts"], axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        boxes = xyxy_to_yolo(batch["boxes"], sizes).tolist()
+    lines = [
+        f"{class_id} {x:.6f} {y:.6f} {w:.6f} {h:.6f}\n"
+        for class_id, (x, y, w, h) in zip(batch["classes"].tolist(), boxes)
+    ]
+    written = 0
+    errors = []
+    created = set()
+    start = 0
+    for name, (width, height), count in zip(batch["file_names"], batch["sizes"].tolist(), batch["counts"].tolist()):
+        label_file = None
+        try:
+            label_file = _output_file(output_dir, name, '.txt', created)
+            if count and (width <= 0 or height <= 0):
+                raise ValueError("이미지 크기를 알 수 없어 좌표를 정규화할 수 없습니다")
+            with open(label_file, 'w') as f:
+                f.write(''.join(lines[start:start + count]))
+            written += count
+        except Exception as e:
+            print(f"Error processing {label_file or name}: {e}")
+            errors.append(str(label_file or name))
+        start += count
+    return written, errors
+
+def _write_voc_batch(output_dir: str, batch: Batch, class_names: List[str]) -> Tuple[int, List[str]]:
+    """이미지 묶음을 이미지별 VOC XML로 기록 (작업 프로세스에서 실행), (객체 수, 오류 파일 목록) 반환"""
+    # 1부터 시작하는 정수 픽셀 좌표
+    boxes = np.rint(batch["boxes"]).astype(np.int64)
+    boxes[:, :2] += 1
+    objects = [
+        f"\t<object>\n\t\t<name>{escape(class_names[class_id])}</name>\n\t\t<pose>Unspecified</pose>\n"
+        f"\t\t<truncated>0</truncated>\n\t\t<difficult>0</difficult>\n\t\t<bndbox>\n"
+        f"\t\t\t<xmin>{x_min}</xmin>\n\t\t\t<ymin>{y_min}</ymin>\n\t\t\t<xmax>{x_max}</xmax>\n\t\t\t<ymax>{y_max}</ymax>\n"
+        f"\t\t</bndbox>\n\t</object>\n"
+        for class_id, (x_min, y_min, x_max, y_max) in zip(batch["classes"].tolist(), boxes.tolist())
+    ]
+    written = 0
+    errors = []
+    created = set()
+    start = 0
+    for name, (width, height), count in zip(batch["file_names"], batch["sizes"].tolist(), batch["counts"].tolist()):
+        xml_file = None
+        try:
+            xml_file = _output_file(output_dir, name, '.xml', created)
+            with open(xml_file, 'w') as f:
+                f.write(
+                    f"<annotation>\n\t<filename>{escape(Path(name).name)}</filename>\n"
+                    f"\t<size>\n\t\t<width>{width}</width>\n\t\t<height>{height}</height>\n\t\t<depth>3</depth>\n\t</size>\n"
+                    + ''.join(objects[start:start + count]) + "</annotation>\n"
+                )
+            written += count
+        except Exception as e:
+            print(f"Error processing {xml_file or name}: {e}")
+            errors.append(str(xml_file or name))
+        start += count
+    return written, errors
+
+def _write_files_parallel(
+    batches: Iterator[Batch],
+    write_batch: Callable,
+    output: str,
+    categories: List[Dict],
+    stats: Dict,
+    jobs: int
+) -> None:
+    """
+    이미지별 출력 파일(YOLO, VOC)을 작업 프로세스에서 묶음 단위로 동시에 기록
+
+    메모리 사용량을 제한하기 위해 처리 중인 묶음은 jobs * 2개까지만 유지합니다.
+    """
+    Path(output).mkdir(parents=True, exist_ok=True)
+
+    def args(batch: Batch) -> Tuple:
+        # 클래스 이름은 읽는 중에 늘어날 수 있으므로 (VOC 입력) 묶음마다 지금까지의 목록을 넘김
+        return output, batch, [category["name"] for category in categories]
+
+    def collect(result: Tuple[int, List[str]], num_images: int) -> None:
+        written, errors = result
+        stats["images"] += num_images - len(errors)
+        stats["annotations"] += written
+        stats["error_files"].extend(errors)
+
+    # 입력을 읽는 시간이 섞이지 않도록 기록하거나 기록을 기다리는 동안만 단계 시간에 포함
+    if jobs <= 1:
+        for batch in batches:
+            with metrics.stage('write'):
+                collect(write_batch(*args(batch)), len(batch["file_names"]))
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        for batch in batches:
+            pending.append((executor.submit(write_batch, *args(batch)), len(batch["file_names"])))
+            if len(pending) >= jobs * 2:
+                future, num_images = pending.popleft()
+                with metrics.stage('write'):
+                    collect(future.result(), num_images)
+        with metrics.stage('write'):
+            for future, num_images in pending:
+                collect(future.result(), num_images)
+
+def _write_yolo(batches: Iterator[Batch], output: str, categories: List[Dict], stats: Dict, jobs: int) -> None:
+    """이미지 묶음을 이미지별 YOLO 라벨 파일과 classes.txt로 기록"""
+    _write_files_parallel(batches, _write_yolo_batch, output, categories, stats, jobs)
+    with open(Path(output) / "classes.txt", 'w') as f:
+        f.write(''.join(f"{category['name']}\n" for category in categories))
+
+def _write_voc(batches: Iterator[Batch], output: str, categories: List[Dict], stats: Dict, jobs: int) -> None:
+    """이미지 묶음을 이미지별 VOC XML로 기록"""
+    _write_files_parallel(batches, _write_voc_batch, output, categories, stats, jobs)
+
+READERS = {"coco": _read_coco, "yolo": _read_yolo, "voc": _read_voc}
+WRITERS = {"coco": _write_coco, "yolo": _write_yolo, "voc": _write_voc}
+
+def convert_dataset(
+    source: str,
+    output: str,
+    from_format: str,
+    to_format: str,
+    classes_file: Optional[str] = None,
+    img_dir: Optional[str] = None,
+    jobs: int = 8,
+    batch_size: int = 2048,
+    recursive: bool = False
+) -> Dict:
+    """
+    COCO, YOLO, VOC 형식 사이에서 데이터셋 변환
+
+    입력을 이미지 묶음 단위로 읽어 좌표를 묶음 전체에 대한 배열 연산으로 변환합니다.
+    COCO는 JSON 파일 하나로 스트리밍 기록하고, YOLO와 VOC는 이미지별 파일을 작업 프로세스에서
+    동시에 기록합니다. COCO 입력의 카테고리는 categories 배열 순서대로 YOLO 클래스 번호가 됩니다.
+
+    Args:
+        source: 입력 (COCO: JSON 파일, YOLO: 라벨 디렉토리 또는 라벨 저장소, VOC: XML 디렉토리)
+        output: 출력 (COCO: JSON 파일, YOLO: 라벨 디렉토리 (classes.txt 포함), VOC: XML 디렉토리,
+            이미지별 파일은 file_name의 하위 디렉토리를 유지)
+        from_format: 입력 형식 ("coco", "yolo", "voc")
+        to_format: 출력 형식 ("coco", "yolo", "voc")
+        classes_file: 클래스 이름 파일 (YOLO 입력은 필수, VOC 입력은 클래스 순서 지정)
+        img_dir: YOLO 입력의 이미지 디렉토리 (없으면 source, 저장소는 원본 라벨 디렉토리)
+        jobs: 파일을 읽고 쓰는 병렬 수
+        batch_size: 한 번에 처리할 이미지 수
+        recursive: YOLO/VOC 입력의 하위 디렉토리 포함 여부 (하위 디렉토리가 있는 출력을 다시 읽을 때 필요,
+            file_name에 상대 경로를 기록)
+
+    Returns:
+        Dict: {"images": 기록한 이미지 수, "annotations": 기록한 객체 수, "skipped": 건너뛴 객체 수,
+               "errors": 오류가 발생한 파일 수, "error_files": 오류가 발생한 파일 목록}
+    """
+    if from_format not in READERS or to_format not in WRITERS:
+        raise ValueError(f"지원하지 않는 형식입니다: {from_format} -> {to_format} (지원: {', '.join(CONVERT_FORMATS)})")
+
+    categories = []
+    stats = {"images": 0, "annotations": 0, "skipped": 0, "error_files": []}
+    batches = READERS[from_format](
+        source, categories, stats, batch_size, jobs, classes_file=classes_file, img_dir=img_dir, recursive=recursive
+    )
+
+    def progress(batches: Iterator[Batch]) -> Iterator[Batch]:
+        with tqdm(desc="Converting", unit="img") as pbar:
+            for batch in batches:
+                yield batch
+                pbar.update(len(batch["file_names"]))
+
+    WRITERS[to_format](progress(batches), output, categories, stats, jobs)
+    stats["errors"] = len(stats["error_files"])
+    metrics.count(files=stats["images"], errors=stats["errors"])
+    return stats
\ No newline at end of file
@@ -1,18 +1,87 @@
 import os
-import json
+import errno
+import fnmatch
 import random
 import shutil
 import click
 from pathlib import Path
-from typing import List, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 from tqdm import tqdm
+from .. import metrics
+from .label_store import is_label_store, load_label_store
+from .convert import CONVERT_FORMATS, convert_dataset
+from .pair_check import ORPHAN_ACTIONS, check_pairs, clean_orphans
+from .shards import DEFAULT_SHARD_SIZE, pack_dataset, pack_shards
+from .stratify import build_class_matrix, iterative_stratification
+from ..file_management.scanner import scan_files
+from ..file_management.transfer import copy_file, same_path
+
+SPLIT_MODES = ['copy', 'hardlink', 'symlink', 'reflink', 'manifest', 'shards']
+
+# linux/fs.h의 FICLONE ioctl 번호
+FICLONE = 0x40049409
+
+def _reflink(src: Path, dst: Path) -> None:
+    """FICLONE으로 데이터 블록을 공유하는 복사본 생성 (Btrfs, XFS 등)"""
+    import fcntl
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+    shutil.copystat(src, dst)
+
+def transfer_file(src: Path, dst: Path, mode: str = 'copy') -> str:
+    """
+    파일을 지정한 방식으로 대상 경로에 배치
+
+    hardlink와 reflink는 다른 파일시스템이거나 지원하지 않는 경우 복사로 대체합니다.
+
+    Args:
+        src: 원본 파일
+        dst: 대상 파일 (이미 있으면 교체)
+        mode: copy, hardlink, symlink, reflink
+
+    Returns:
+        str: 실제로 사용한 방식
+    """
+    if os.path.lexists(dst):
+        # 대상이 원본 자체이면 지우면 안 됨 (원본을 가리키는 링크는 지우고 다시 만듦)
+        if same_path(src, dst):
+            raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+        os.unlink(dst)
+    if mode == 'copy':
+        copy_file(src, dst)
+        return mode
+    try:
+        if mode == 'hardlink':
+            os.link(src, dst)
+        elif mode == 'symlink':
+            os.symlink(os.path.abspath(src), dst)
+        elif mode == 'reflink':
+            _reflink(src, dst)
+        else:
+            raise ValueError(f"지원하지 않는 방식: {mode}")
+        return mode
+    except (OSError, ImportError) as e:
+        if mode == 'symlink' or (isinstance(e, OSError) and e.errno not in (
+            errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.EPERM
+        )):
+            raise
+        if os.path.lexists(dst):
+            os.unlink(dst)
+        copy_file(src, dst)
+        return 'copy'
 
 def split_dataset(
     data_dir: str,
     output_dir: str,
     splits: Tuple[float, float, float] = (0.7, 0.2, 0.1),
     file_patterns: List[str] = ["*.jpg", "*.png"],
-    seed: int = 42
+    seed: int = 42,
+    mode: str = 'copy',
+    label_dir: Optional[str] = None,
+    jobs: int = 8,
+    stratify: bool = False,
+    shard_size: int = DEFAULT_SHARD_SIZE
 ):
     """
     데이터셋을 train/val/test로 분할
@@ -23,27 +92,53 @@ def split_dataset(
         splits: (train, val, test) 비율
         file_patterns: 이미지 파일 패턴 리스트
         seed: 랜덤 시드
+        mode: 파일 배치 방식
+            copy/hardlink/symlink/reflink: output_dir/<split>/에 파일 배치
+            manifest: 파일은 그대로 두고 output_dir/<split>.txt에 이미지 경로 목록만 기록
+            shards: output_dir/<split>/에 tar 샤드와 색인으로 묶어 기록 (shards.pack_shards 참고)
+        label_dir: YOLO 라벨 디렉토리 또는 라벨 저장소
+            (지정하면 같은 이름의 .txt 라벨도 이미지와 함께 배치)
+        jobs: 파일 배치 스레드 수
+        stratify: True이면 클래스 분포가 각 분할에 고르게 유지되도록 계층화 분할
+            (라벨은 label_dir, 없으면 data_dir에서 읽음)
+        shard_size: shards 방식의 샤드 하나의 최대 바이트 수
     """
+    if mode not in SPLIT_MODES:
+        raise ValueError(f"지원하지 않는 방식: {mode}")
+    
     random.seed(seed)
     
-    # 모든 이미지 파일 수집
+    # 모든 이미지 파일을 한 번의 탐색으로 수집하고, 같은 seed면 이전과 같은 결과가 나오도록 패턴 순서대로 정렬
     data_path = Path(data_dir)
-    files = []
-    for pattern in file_patterns:
-        files.extend(list(data_path.glob(pattern)))
-    
-    # 파일 랜덤 섞기
-    random.shuffle(files)
-    
-    # 분할 인덱스 계산
-    total = len(files)
-    train_idx = int(total * splits[0])
-    val_idx = train_idx + int(total * splits[1])
+    by_pattern = [[] for _ in file_patterns]
+    for file in scan_files(data_path, file_patterns):
+        matched = next(i for i, pattern in enumerate(file_patterns) if fnmatch.fnmatchcase(file.name, pattern))
+        by_pattern[matched].append(file)
+    files = [file for group in by_pattern for file in group]
     
-    # 분할된 파일 리스트
-    train_files = files[:train_idx]
-    val_files = files[train_idx:val_idx]
-    test_files = files[val_idx:]
+    if stratify:
+        # 클래스 분포를 고려한 분할 (파일 순서와 무관하게 결정되도록 정렬)
+        files.sort()
+        with metrics.stage('parse'):
+            img_idx, cls_idx = build_class_matrix(files, label_dir or data_dir, jobs)
+        with metrics.stage('compute'):
+            assignment = iterative_stratification(img_idx, cls_idx, len(files), splits, seed)
+        train_files, val_files, test_files = (
+            [file for file, split_id in zip(files, assignment) if split_id == i] for i in range(3)
+        )
+    else:
+        # 파일 랜덤 섞기
+        random.shuffle(files)
+        
+        # 분할 인덱스 계산
+        total = len(files)
+        train_idx = int(total * splits[0])
+        val_idx = train_idx + int(total * splits[1])
+        
+        # 분할된 파일 리스트
+        train_files = files[:train_idx]
+        val_files = files[train_idx:val_idx]
+        test_files = files[val_idx:]
     
     # 파일 복사
     splits_dict = {
@@ -53,89 +148,73 @@ def split_dataset(
     }
     
     output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    
+    if mode == 'manifest':
+        # 경로 목록만 기록 (YOLO 학습 설정에서 train.txt 등으로 바로 사용 가능)
+        for split_name, split_files in splits_dict.items():
+            with open(output_path / f"{split_name}.txt", 'w') as f:
+                for file in split_files:
+                    f.write(f"{file.resolve()}\n")
+        return
+    
+    if mode == 'shards':
+        # 분할별로 샤드를 바로 기록 (이미지를 복사한 뒤 다시 묶지 않음)
+        for split_name, split_files in splits_dict.items():
+            pack_shards(split_files, output_path / split_name, label_dir, shard_size=shard_size, jobs=jobs)
+        return
+    
+    label_path = None
+    if label_dir:
+        # 라벨 저장소는 원본 라벨 디렉토리의 파일을 배치
+        label_path = Path(load_label_store(label_dir)["meta"]["source_dir"] if is_label_store(label_dir) else label_dir)
     for split_name, split_files in splits_dict.items():
         split_dir = output_path / split_name
         split_dir.mkdir(parents=True, exist_ok=True)
         
-        for file in tqdm(split_files, desc=f"Copying {split_name} files"):
-            shutil.copy2(file, split_dir / file.name)
+        # (원본, 대상) 작업 목록: 이미지와 짝이 되는 라벨
+        tasks = []
+        for file in split_files:
+            tasks.append((file, split_dir / file.name))
+            if label_path is not None:
+                label_file = label_path / f"{file.stem}.txt"
+                if label_file.exists():
+                    tasks.append((label_file, split_dir / label_file.name))
+        
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor, metrics.stage('write'):
+            results = executor.map(lambda task: transfer_file(task[0], task[1], mode), tasks)
+            for _ in tqdm(results, total=len(tasks), desc=f"Copying {split_name} files"):
+                pass
+        metrics.count(files=len(tasks))
 
 def convert_yolo_to_coco(
     yolo_dir: str,
     class_file: str,
     output_file: str,
-    img_dir: str = None
-):
+    img_dir: str = None,
+    jobs: int = 8,
+    batch_size: int = 1024
+) -> Dict:
     """
-    YOLO 형식을 COCO 형식으로 변환
+    YOLO 형식을 COCO 형식으로 변환 (convert_dataset 참고)
     
     Args:
-        yolo_dir: YOLO 라벨 디렉토리
+        yolo_dir: YOLO 라벨 디렉토리 또는 라벨 저장소
         class_file: 클래스 이름이 있는 파일
         output_file: 출력 COCO JSON 파일 경로
-        img_dir: 이미지 디렉토리 (없으면 yolo_dir과 동일)
+        img_dir: 이미지 디렉토리 (없으면 yolo_dir과 동일, 저장소는 원본 라벨 디렉토리)
+        jobs: 이미지 헤더와 라벨을 읽는 스레드 수
+        batch_size: 한 번에 처리할 이미지 수
+
+    Returns:
+        Dict: {"images": 이미지 수, "annotations": 어노테이션 수,
+               "error_files": 크기를 읽을 수 없어 제외한 이미지 등 오류가 발생한 파일 목록}
     """
-    if img_dir is None:
-        img_dir = yolo_dir
-    
-    # 클래스 정보 읽기
-    with open(class_file, 'r') as f:
-        classes = [line.strip() for line in f.readlines()]
-    
-    # COCO 형식 초기화
-    coco_format = {
-        "images": [],
-        "annotations": [],
-        "categories": []
-    }
-    
-    # 카테고리 정보 추가
-    for idx, class_name in enumerate(classes):
-        coco_format["categories"].append({
-            "id": idx,
-            "name": class_name,
-            "supercategory": "none"
-        })
-    
-    # 이미지와 어노테이션 정보 추가
-    img_path = Path(img_dir)
-    label_path = Path(yolo_dir)
-    
-    ann_id = 0
-    for img_id, img_file in enumerate(tqdm(list(img_path.glob("*.jpg")))):
-        # 이미지 정보
-        coco_format["images"].append({
-            "id": img_id,
-            "file_name": img_file.name,
-            "width": 0,  # TODO: 실제 이미지 크기 읽기
-            "height": 0
-        })
-        
-        # 라벨 파일 읽기
-        label_file = label_path / f"{img_file.stem}.txt"
-        if not label_file.exists():
-            continue
-        
-        with open(label_file, 'r') as f:
-            for line in f:
-                class_id, x, y, w, h = map(float, line.strip().split())
-                
-                # YOLO to COCO 좌표 변환
-                # TODO: 실제 변환 구현
-                
-                coco_format["annotations"].append({
-                    "id": ann_id,
-                    "image_id": img_id,
-                    "category_id": int(class_id),
-                    "bbox": [x, y, w, h],
-                    "area": w * h,
-                    "iscrowd": 0
-                })
-                ann_id += 1
-    
-    # COCO JSON 저장
-    with open(output_file, 'w') as f:
-        json.dump(coco_format, f, indent=2)
+    stats = convert_dataset(
+        yolo_dir, output_file, 'yolo', 'coco',
+        classes_file=class_file, img_dir=img_dir, jobs=jobs, batch_size=batch_size
+    )
+    return {"images": stats["images"], "annotations": stats["annotations"], "error_files": stats["error_files"]}
 
 @click.group()
 def cli():
@@ -149,18 +228,155 @@ def cli():
 @click.option('--val', '-v', default=0.2, help='검증 데이터 비율')
 @click.option('--test', '-s', default=0.1, help='테스트 데이터 비율')
 @click.option('--seed', default=42, help='랜덤 시드')
-def split(data_dir, output_dir, train, val, test, seed):
+@click.option('--mode', '-m', type=click.Choice(SPLIT_MODES), default='copy', help='파일 배치 방식')
+@click.option('--label-dir', '-l', help='함께 배치할 YOLO 라벨 디렉토리')
+@click.option('--jobs', '-j', default=8, help='파일 배치 스레드 수')
+@click.option('--stratify', is_flag=True, help='클래스 분포를 유지하는 계층화 분할')
+@click.option('--shard-size', default=DEFAULT_SHARD_SIZE // (1024 * 1024), show_default=True, help='shards 방식의 샤드 최대 크기 (MB)')
+def split(data_dir, output_dir, train, val, test, seed, mode, label_dir, jobs, stratify, shard_size):
     """데이터셋을 train/val/test로 분할합니다."""
-    split_dataset(data_dir, output_dir, (train, val, test), seed=seed)
+    split_dataset(
+        data_dir, output_dir, (train, val, test), seed=seed,
+        mode=mode, label_dir=label_dir, jobs=jobs, stratify=stratify,
+        shard_size=shard_size * 1024 * 1024
+    )
 
 @cli.command()
 @click.argument('yolo_dir')
 @click.argument('class_file')
 @click.argument('output_file')
 @click.option('--img-dir', help='이미지 디렉토리 (옵션)')
-def yolo2coco(yolo_dir, class_file, output_file, img_dir):
+@click.option('--jobs', '-j', default=8, help='이미지 헤더와 라벨을 읽는 스레드 수')
+def yolo2coco(yolo_dir, class_file, output_file, img_dir, jobs):
     """YOLO 형식을 COCO 형식으로 변환합니다."""
-    convert_yolo_to_coco(yolo_dir, class_file, output_file, img_dir)
+    counts = convert_yolo_to_coco(yolo_dir, class_file, output_file, img_dir, jobs)
+    click.echo(f"이미지 수: {counts['images']}, 어노테이션 수: {counts['annotations']}")
+    if counts['error_files']:
+        click.echo(f"처리 중 오류가 발생한 파일 수: {len(counts['error_files'])}")
+        raise click.exceptions.Exit(1)
+
+@cli.command()
+@click.argument('source')
+@click.argument('output')
+@click.option('--from', 'from_format', type=click.Choice(CONVERT_FORMATS), required=True, help='입력 형식')
+@click.option('--to', 'to_format', type=click.Choice(CONVERT_FORMATS), required=True, help='출력 형식')
+@click.option('--classes', '-c', 'classes_file', help='클래스 이름 파일 (YOLO 입력은 필수, VOC 입력은 클래스 순서 지정)')
+@click.option('--img-dir', help='YOLO 입력의 이미지 디렉토리 (이미지 크기를 읽음, 기본: SOURCE)')
+@click.option('--recursive', '-r', is_flag=True, help='YOLO/VOC 입력의 하위 디렉토리 포함 (상대 경로를 file_name으로 유지)')
+@click.option('--jobs', '-j', default=8, help='파일을 읽고 쓰는 병렬 수')
+def convert(source, output, from_format, to_format, classes_file, img_dir, recursive, jobs):
+    """COCO, YOLO, VOC 형식 사이에서 변환합니다.
+
+    SOURCE/OUTPUT은 COCO는 JSON 파일, YOLO와 VOC는 디렉토리입니다.
+    YOLO/VOC 출력은 COCO file_name의 하위 디렉토리를 유지하므로 다시 읽을 때는 -r을 사용하세요.
+    오류가 발생한 파일이 있으면 종료 코드 1로 끝납니다.
+
+    예: kwtools dataset convert instances.json labels/ --from coco --to yolo
+    """
+    try:
+        stats = convert_dataset(
+            source, output, from_format, to_format, classes_file, img_dir, jobs, recursive=recursive
+        )
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"이미지 수: {stats['images']}, 어노테이션 수: {stats['annotations']}")
+    if stats['skipped']:
+        click.echo(f"건너뛴 어노테이션 수 (이미지/클래스를 찾을 수 없음): {stats['skipped']}")
+    if stats['errors']:
+        click.echo(f"처리 중 오류가 발생한 파일 수: {stats['errors']}")
+        raise click.exceptions.Exit(1)
+
+@cli.command('check-pairs')
+@click.argument('image_dir')
+@click.argument('label_dir', required=False)
+@click.option('--recursive', '-r', is_flag=True, help='하위 디렉토리 포함 (하위 경로까지 같아야 짝으로 봄)')
+@click.option('--jobs', '-j', default=8, help='탐색/정리 스레드 수')
+@click.option('--action', type=click.Choice(ORPHAN_ACTIONS), help='짝이 없는 파일 정리 방식 (move: --target으로 이동, delete: 삭제)')
+@click.option('--target', help='짝이 없는 파일을 옮길 디렉토리 (images/, labels/ 아래에 상대 경로 유지)')
+@click.option('--only', type=click.Choice(['images', 'labels']), help='한쪽의 짝이 없는 파일만 정리')
+@click.option('--output', '-o', type=click.Path(dir_okay=False), help='짝이 없는 파일과 충돌 목록을 저장할 파일 (종류<TAB>경로)')
+@click.option('--show', default=20, show_default=True, help='화면에 출력할 파일 수')
+def check_pairs_command(image_dir, label_dir, recursive, jobs, action, target, only, output, show):
+    """이미지와 YOLO 라벨이 같은 이름으로 짝지어져 있는지 검사합니다.
+
+    LABEL_DIR이 없으면 IMAGE_DIR에서 라벨을 찾습니다. 정리하지 않았는데 문제가 있으면 (같은 이름의
+    파일이 여러 개인 경우 포함) 종료 코드 1로 끝납니다.
+    """
+    if action == 'move' and not target:
+        raise click.BadParameter("--action move에는 --target이 필요합니다.", param_hint='--target')
+    try:
+        stats = check_pairs(image_dir, label_dir, recursive, jobs)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    click.echo("\n=== 검사 결과 ===")
+    click.echo(f"이미지 수: {stats['images']}, 라벨 수: {stats['labels']}, 짝이 맞는 이미지 수: {stats['paired']}")
+    click.echo(f"라벨이 없는 이미지 수: {len(stats['orphan_images'])}")
+    click.echo(f"이미지가 없는 라벨 수: {len(stats['orphan_labels'])}")
+    click.echo(f"같은 이름의 파일이 여러 개인 경우: {len(stats['conflicts'])}")
+    click.echo(f"소요 시간: {stats['elapsed']:.2f}초")
+
+    problems = (
+        [("orphan-image", file) for file in stats['orphan_images']]
+        + [("orphan-label", file) for file in stats['orphan_labels']]
+        + [("conflict", file) for key in sorted(stats['conflicts']) for file in stats['conflicts'][key]]
+    )
+    if problems and show > 0:
+        click.echo("\n=== 문제 목록 ===")
+        for kind, file in problems[:show]:
+            click.echo(f"[{kind}] {file}")
+        if len(problems) > show:
+            click.echo(f"... 외 {len(problems) - show}개 (--output으로 전체 저장)")
+    if output:
+        with open(output, 'w') as f:
+            f.writelines(f"{kind}\t{file}\n" for kind, file in problems)
+        click.echo(f"\n목록 저장: {output}")
+
+    if action is None:
+        if problems:
+            raise click.exceptions.Exit(1)
+        return
+
+    # 같은 이름의 파일이 여러 개이고 짝이 있으면 어느 쪽이 맞는지 알 수 없으므로 정리하지 않음 (짝이 없으면 모두 정리)
+    errors = 0
+    for kind, files, root in (
+        ('images', stats['orphan_images'], image_dir),
+        ('labels', stats['orphan_labels'], label_dir or image_dir),
+    ):
+        if only not in (None, kind) or not files:
+            continue
+        result = clean_orphans(files, root, action, target and str(Path(target) / kind), jobs)
+        errors += len(result['error_files'])
+        verb = "이동" if action == 'move' else "삭제"
+        click.echo(f"{verb}한 짝 없는 {'이미지' if kind == 'images' else '라벨'} 수: {result['files'] - len(result['error_files'])}")
+    if errors:
+        click.echo(f"처리 중 오류가 발생한 파일 수: {errors}")
+        raise click.exceptions.Exit(1)
+
+@cli.command()
+@click.argument('image_dir')
+@click.argument('output_dir')
+@click.option('--label-dir', '-l', help='YOLO 라벨 디렉토리 또는 라벨 저장소 (기본: IMAGE_DIR)')
+@click.option('--recursive', '-r', is_flag=True, help='하위 디렉토리 포함 (키에 상대 경로 유지)')
+@click.option('--shard-size', default=DEFAULT_SHARD_SIZE // (1024 * 1024), show_default=True, help='샤드 최대 크기 (MB)')
+@click.option('--max-samples', type=int, help='샤드 하나의 최대 샘플 수')
+@click.option('--jobs', '-j', default=8, help='동시에 기록할 샤드 수')
+def pack(image_dir, output_dir, label_dir, recursive, shard_size, max_samples, jobs):
+    """이미지와 YOLO 라벨을 tar 샤드로 묶습니다 (webdataset 호환).
+
+    OUTPUT_DIR에 shard-000000.tar ...와 색인(index.npy, keys.txt, meta.json)을 기록하며,
+    shards.ShardReader로 압축을 풀지 않고 순서대로 읽을 수 있습니다.
+    오류가 발생한 파일이 있으면 (해당 샘플은 제외) 종료 코드 1로 끝납니다.
+    """
+    stats = pack_dataset(image_dir, output_dir, label_dir, recursive, shard_size * 1024 * 1024, max_samples, jobs)
+    click.echo(f"샘플 수: {stats['samples']}, 라벨 수: {stats['labels']}, 샤드 수: {stats['shards']}")
+    click.echo(f"전체 크기: {stats['bytes'] / (1024 * 1024):.1f}MB")
+    if stats['shards']:
+        last = stats['shards'] - 1
+        click.echo(f"webdataset 경로: {Path(output_dir) / f'shard-{{000000..{last:06d}}}.tar'}")
+    if stats['error_files']:
+        click.echo(f"처리 중 오류가 발생한 파일 수: {len(stats['error_files'])}")
+        raise click.exceptions.Exit(1)
 
 if __name__ == '__main__':
     cli()
\ No newline at end of file
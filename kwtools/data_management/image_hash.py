@@ -0,0 +1,238 @@
+import click
+import numpy as np
+from PIL import Image
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, Optional
+from tqdm import tqdm
+from .. import metrics
+from ..file_management.scanner import scan_files
+
+HASH_METHODS = ['ahash', 'dhash', 'phash']
+
+# 비트 수 계산용 테이블 (np.bitwise_count가 없는 NumPy 버전용)
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+def _popcount64(values: np.ndarray) -> np.ndarray:
+    """uint64 배열의 원소별 1 비트 수"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values).astype(np.int64)
+    return _POPCOUNT_TABLE[values.view(np.uint8)].reshape(-1, 8).sum(axis=1, dtype=np.int64)
+
+def _dct_matrix(n: int) -> np.ndarray:
+    """n x n DCT-II 변환 행렬"""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    return np.cos(np.pi * (2 * i + 1) * k / (2 * n))
+
+def _load_gray(file: Path, width: int, height: int) -> np.ndarray:
+    """
+    이미지를 흑백으로 읽어 (height, width)로 축소
+
+    JPEG은 draft 모드로 필요한 크기에 가깝게 축소된 상태로 디코딩합니다.
+    """
+    with Image.open(file) as img:
+        img.draft('L', (width * 4, height * 4))
+        img = img.convert('L').resize((width, height), Image.LANCZOS)
+        return np.asarray(img, dtype=np.float64)
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    """bool 배열(최대 64개)을 정수 해시로 변환"""
+    value = 0
+    for bit in bits.ravel():
+        value = (value << 1) | int(bit)
+    return value
+
+def image_hash(file: Path, method: str = 'dhash', hash_size: int = 8) -> int:
+    """
+    이미지의 perceptual hash 계산
+
+    Args:
+        file: 이미지 파일 경로
+        method: 'ahash' (평균), 'dhash' (인접 픽셀 차이), 'phash' (DCT)
+        hash_size: 해시 한 변의 크기 (hash_size ** 2 비트, 최대 8)
+
+    Returns:
+        int: hash_size ** 2 비트 정수 해시
+    """
+    if method == 'ahash':
+        pixels = _load_gray(file, hash_size, hash_size)
+        bits = pixels > pixels.mean()
+    elif method == 'dhash':
+        pixels = _load_gray(file, hash_size + 1, hash_size)
+        bits = pixels[:, 1:] > pixels[:, :-1]
+    elif method == 'phash':
+        size = hash_size * 4
+        pixels = _load_gray(file, size, size)
+        dct = _dct_matrix(size)
+        low = (dct @ pixels @ dct.T)[:hash_size, :hash_size]
+        bits = low > np.median(low)
+    else:
+        raise ValueError(f"지원하지 않는 해시 방식: {method}")
+    return _bits_to_int(bits)
+
+def _hash_batch(files: List[Path], method: str, hash_size: int) -> List[Optional[int]]:
+    """이미지 묶음의 해시 계산 (읽을 수 없는 이미지는 None)"""
+    hashes = []
+    for file in files:
+        try:
+            hashes.append(image_hash(file, method, hash_size))
+        except Exception as e:
+            print(f"Error processing {file}: {e}")
+            hashes.append(None)
+    return hashes
+
+def find_similar_pairs(hashes: np.ndarray, max_distance: int, bits: int = 64) -> np.ndarray:
+    """
+    해밍 거리가 max_distance 이하인 해시 쌍을 multi-index hashing으로 찾음
+
+    해시를 max_distance + 1개의 조각으로 나누면, 거리가 max_distance 이하인 두 해시는
+    비둘기집 원리에 의해 적어도 한 조각이 완전히 같습니다. 조각별로 정렬하여 같은
+    값을 가진 항목끼리만 비교하므로 전체 쌍을 비교하지 않습니다.
+
+    Args:
+        hashes: uint64 해시 배열
+        max_distance: 최대 해밍 거리
+        bits: 해시 비트 수
+
+    Returns:
+        np.ndarray: (N, 3) 배열 [i, j, 거리] (i < j)
+    """
+    # 조각이 bits개보다 많을 수 없으므로 max_distance가 bits 이상이면 비둘기집 원리가 성립하지 않음
+    if not 0 <= max_distance < bits:
+        raise ValueError(f"최대 해밍 거리는 0 이상 해시 비트 수({bits}) 미만이어야 합니다: {max_distance}")
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    n = len(hashes)
+    num_chunks = max_distance + 1
+    bounds = np.linspace(0, bits, num_chunks + 1).astype(int)
+
+    found = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        mask = np.uint64((1 << int(end - start)) - 1)
+        chunk = (hashes >> np.uint64(start)) & mask
+        order = np.argsort(chunk, kind='stable')
+        sorted_chunk = chunk[order]
+
+        # 정렬된 배열에서 lag만큼 떨어진 원소가 같은 조각 값이면 후보 쌍
+        active = np.flatnonzero(sorted_chunk[1:] == sorted_chunk[:-1])
+        lag = 1
+        while len(active):
+            a = order[active]
+            b = order[active + lag]
+            distance = _popcount64(hashes[a] ^ hashes[b])
+            close = distance <= max_distance
+            if close.any():
+                found.append(np.stack([
+                    np.minimum(a[close], b[close]),
+                    np.maximum(a[close], b[close]),
+                    distance[close],
+                ], axis=1))
+            lag += 1
+            active = active[active + lag < n]
+            active = active[sorted_chunk[active] == sorted_chunk[active + lag]]
+
+    if not found:
+        return np.zeros((0, 3), dtype=np.int64)
+    pairs = np.concatenate(found).astype(np.int64)
+    _, unique_idx = np.unique(pairs[:, 0] * n + pairs[:, 1], return_index=True)
+    return pairs[unique_idx]
+
+def _group_pairs(pairs: np.ndarray, n: int) -> List[List[int]]:
+    """쌍들을 연결 요소(그룹)로 묶음"""
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b, _ in pairs.tolist():
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+
+    groups = {}
+    for idx in sorted(set(pairs[:, :2].ravel().tolist())):
+        groups.setdefault(find(idx), []).append(idx)
+    return list(groups.values())
+
+def find_near_duplicate_images(
+    directory: str,
+    recursive: bool = False,
+    method: str = 'dhash',
+    max_distance: int = 4,
+    hash_size: int = 8,
+    jobs: int = 1,
+    batch_size: int = 256
+) -> List[List[str]]:
+    """
+    재인코딩, 크기 변경 등으로 완전히 같지는 않은 유사 중복 이미지 찾기
+
+    Args:
+        directory: 이미지 디렉토리
+        recursive: 하위 디렉토리 포함 여부
+        method: 해시 방식 (ahash, dhash, phash)
+        max_distance: 유사 이미지로 볼 최대 해밍 거리
+        hash_size: 해시 한 변의 크기 (최대 8)
+        jobs: 해시 계산 프로세스 수
+        batch_size: 프로세스에 한 번에 넘길 이미지 수
+
+    Returns:
+        List[List[str]]: 서로 유사한 이미지 경로 그룹 목록
+    """
+    if not 2 <= hash_size <= 8:
+        raise ValueError("hash_size는 2 이상 8 이하여야 합니다")
+    if not 0 <= max_distance < hash_size ** 2:
+        raise ValueError(f"최대 해밍 거리는 0 이상 해시 비트 수({hash_size ** 2}) 미만이어야 합니다: {max_distance}")
+
+    files = list(scan_files(directory, ["*.jpg", "*.png"], recursive))
+
+    batches = [files[i:i + batch_size] for i in range(0, len(files), batch_size)]
+    with metrics.stage('read'):
+        if jobs <= 1:
+            results = (_hash_batch(batch, method, hash_size) for batch in batches)
+            hash_lists = list(tqdm(results, total=len(batches), desc="Hashing images"))
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                results = executor.map(_hash_batch, batches, repeat(method), repeat(hash_size))
+                hash_lists = list(tqdm(results, total=len(batches), desc="Hashing images"))
+
+    # 해시를 계산하지 못한 이미지 제외
+    valid_files = []
+    valid_hashes = []
+    for batch, hashes in zip(batches, hash_lists):
+        for file, value in zip(batch, hashes):
+            if value is not None:
+                valid_files.append(file)
+                valid_hashes.append(value)
+
+    metrics.count(files=len(files), errors=len(files) - len(valid_files))
+    with metrics.stage('compute'):
+        pairs = find_similar_pairs(np.array(valid_hashes, dtype=np.uint64), max_distance, hash_size ** 2)
+        groups = _group_pairs(pairs, len(valid_files))
+    return [[str(valid_files[idx]) for idx in group] for group in groups]
+
+@click.command(name='near-duplicates')
+@click.argument('directory')
+@click.option('--recursive', '-r', is_flag=True, help='하위 디렉토리 포함')
+@click.option('--method', '-m', type=click.Choice(HASH_METHODS), default='dhash', help='해시 방식')
+@click.option('--max-distance', '-d', default=4, help='유사 이미지로 볼 최대 해밍 거리')
+@click.option('--jobs', '-j', default=1, help='해시 계산 프로세스 수')
+def near_duplicates(directory, recursive, method, max_distance, jobs):
+    """유사 중복 이미지를 찾아서 출력합니다."""
+    try:
+        groups = find_near_duplicate_images(directory, recursive, method, max_distance, jobs=jobs)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    if not groups:
+        click.echo("유사 중복 이미지가 없습니다.")
+        return
+
+    click.echo("\n=== 유사 중복 이미지 목록 ===")
+    for idx, group in enumerate(groups, 1):
+        click.echo(f"\n그룹 {idx} ({len(group)}개):")
+        for file_path in group:
+            click.echo(f"  - {file_path}")
\ No newline at end of file
@@ -4,25 +4,160 @@ import numpy as np
 from PIL import Image
 from pathlib import Path
 from tqdm import tqdm
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from .. import metrics
+from .scan_manifest import default_manifest_path, incremental_scan
+from .image_hash import near_duplicates
+from ..file_management.scanner import scan_entries
 
-def analyze_images(directory: str, recursive: bool = False) -> Dict:
+def _analyze_image_file(file: Path) -> Dict:
     """
-    이미지 파일들의 통계 분석
-    
+    이미지 파일 하나의 속성을 읽어 파일 단위 결과를 반환
+
     Returns:
-        Dict: 이미지 통계 정보
+        Dict: {"format", "size", "width", "height", "mode", "error"}
     """
-    path = Path(directory)
-    
-    if recursive:
-        files = list(path.rglob("*.jpg")) + list(path.rglob("*.png"))
-    else:
-        files = list(path.glob("*.jpg")) + list(path.glob("*.png"))
-    
-    stats = {
-        "total_images": len(files),
+    result = {
+        "format": file.suffix.lower(),
+        "size": file.stat().st_size,
+        "width": 0,
+        "height": 0,
+        "mode": None,
+        "error": None
+    }
+    try:
+        with Image.open(file) as img:
+            result["width"], result["height"] = img.size
+            result["mode"] = img.mode
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+def _read_image_headers(files: List[Path], jobs: int = 8) -> List[Dict]:
+    """
+    이미지 헤더를 스레드 풀에서 읽어 파일 단위 결과 목록을 반환
+
+    Image.open은 헤더만 읽고 픽셀은 디코딩하지 않으므로 I/O 대기가 대부분입니다.
+    """
+    if jobs <= 1:
+        return [_analyze_image_file(f) for f in tqdm(files, desc="Analyzing images")]
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return list(tqdm(executor.map(_analyze_image_file, files), total=len(files), desc="Analyzing images"))
+
+def _merge_moments(a: Tuple, b: Tuple) -> Tuple:
+    """
+    (픽셀 수, 채널별 평균, 채널별 편차 제곱합) 두 개를 병합 (Chan et al. 병렬 알고리즘)
+    """
+    n_a, mean_a, m2_a = a
+    n_b, mean_b, m2_b = b
+    if n_a == 0:
+        return b
+    if n_b == 0:
+        return a
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * (n_b / n)
+    m2 = m2_a + m2_b + delta ** 2 * (n_a * n_b / n)
+    return n, mean, m2
+
+# 픽셀 합을 구할 때 한 번에 정수로 변환하는 행 수 (이미지 크기와 무관하게 작업 메모리 제한)
+_STRIP_ROWS = 128
+
+def _image_moments(pixels: np.ndarray) -> Tuple:
+    """
+    (H, W, 3) uint8 이미지의 (픽셀 수, 채널별 평균, 채널별 편차 제곱합)
+
+    행 묶음마다 채널별 합과 제곱합을 정수로 누적하므로 float 배열을 만들지 않고,
+    편차 제곱합은 파이썬 정수로 정확히 계산한 뒤 float로 변환합니다.
+    """
+    n = pixels.shape[0] * pixels.shape[1]
+    total = np.zeros(3, dtype=np.uint64)
+    squares = np.zeros(3, dtype=np.uint64)
+    for start in range(0, pixels.shape[0], _STRIP_ROWS):
+        strip = pixels[start:start + _STRIP_ROWS]
+        total += np.add.reduce(strip, axis=(0, 1), dtype=np.uint64)
+        wide = strip.astype(np.uint32)
+        squares += np.add.reduce(wide * wide, axis=(0, 1), dtype=np.uint64)
+    total = [int(v) for v in total]
+    squares = [int(v) for v in squares]
+    mean = np.array([s / n for s in total])
+    m2 = np.array([(q * n - s * s) / n for s, q in zip(total, squares)])
+    return n, mean, m2
+
+def _pixel_moments(files: List[Path], pixel_size: Optional[int] = None) -> Tuple:
+    """
+    이미지 묶음의 채널별 픽셀 통계 계산 (디코딩한 uint8 픽셀 외에는 이미지 크기에 비례하는 메모리를 쓰지 않음)
+
+    Args:
+        files: 이미지 파일 목록
+        pixel_size: 지정하면 JPEG을 draft 모드로 이 크기에 가깝게 축소하여 디코딩
+
+    Returns:
+        Tuple: (픽셀 수, 채널별 평균, 채널별 편차 제곱합, 오류 파일 수)
+    """
+    moments = (0, np.zeros(3), np.zeros(3))
+    errors = 0
+    for file in files:
+        try:
+            with Image.open(file) as img:
+                if pixel_size:
+                    img.draft('RGB', (pixel_size, pixel_size))
+                pixels = np.asarray(img.convert('RGB'))
+        except Exception as e:
+            print(f"Error processing {file}: {e}")
+            errors += 1
+            continue
+        if pixels.size == 0:
+            continue
+        moments = _merge_moments(moments, _image_moments(pixels))
+    return moments + (errors,)
+
+def analyze_pixels(
+    files: List[Path],
+    jobs: int = 8,
+    pixel_size: Optional[int] = None,
+    batch_size: int = 64
+) -> Dict:
+    """
+    이미지들의 채널별(RGB) 픽셀 평균/표준편차를 프로세스 풀에서 계산
+
+    묶음별 통계를 Chan의 병렬 알고리즘으로 병합하므로 수치적으로 안정적이며,
+    메모리 사용량은 이미지 수와 무관합니다.
+
+    Args:
+        files: 이미지 파일 목록
+        jobs: 프로세스 수
+        pixel_size: 지정하면 JPEG을 이 크기에 가깝게 축소하여 디코딩 (빠르지만 근사값)
+        batch_size: 프로세스에 한 번에 넘길 이미지 수
+
+    Returns:
+        Dict: {"pixel_count", "mean", "std", "error_count"} (값 범위 0-255)
+    """
+    batches = [files[i:i + batch_size] for i in range(0, len(files), batch_size)]
+    total = (0, np.zeros(3), np.zeros(3))
+    error_count = 0
+    with ProcessPoolExecutor(max_workers=max(1, jobs)) as executor:
+        results = executor.map(_pixel_moments, batches, repeat(pixel_size))
+        for n, mean, m2, errors in tqdm(results, total=len(batches), desc="Analyzing pixels"):
+            total = _merge_moments(total, (n, mean, m2))
+            error_count += errors
+
+    n, mean, m2 = total
+    std = np.sqrt(m2 / n) if n else np.zeros(3)
+    return {
+        "pixel_count": int(n),
+        "mean": mean.tolist(),
+        "std": std.tolist(),
+        "error_count": error_count
+    }
+
+def _new_image_stats(total_images: int = 0) -> Dict:
+    """비어있는 이미지 통계 생성"""
+    return {
+        "total_images": total_images,
         "formats": defaultdict(int),
         "sizes": defaultdict(int),
         "resolutions": defaultdict(int),
@@ -30,39 +165,95 @@ def analyze_images(directory: str, recursive: bool = False) -> Dict:
         "color_modes": defaultdict(int),
         "total_size_mb": 0
     }
+
+def _add_image_result(stats: Dict, file: Path, result: Dict) -> None:
+    """파일 단위 결과를 이미지 통계에 누적"""
+    # 파일 형식
+    stats["formats"][result["format"]] += 1
     
-    for file in tqdm(files, desc="Analyzing images"):
-        # 파일 형식
-        stats["formats"][file.suffix.lower()] += 1
-        
-        # 파일 크기
-        size_mb = file.stat().st_size / (1024 * 1024)
-        stats["total_size_mb"] += size_mb
-        size_category = f"{int(size_mb)}MB" if size_mb >= 1 else f"{int(size_mb * 1024)}KB"
-        stats["sizes"][size_category] += 1
-        
-        # 이미지 속성
-        try:
-            with Image.open(file) as img:
-                width, height = img.size
-                resolution = f"{width}x{height}"
-                stats["resolutions"][resolution] += 1
-                
-                # 화면비
-                ratio = width / height
-                if ratio == 1:
-                    aspect = "1:1"
-                elif ratio > 1:
-                    aspect = f"{ratio:.2f}:1"
-                else:
-                    aspect = f"1:{1/ratio:.2f}"
-                stats["aspect_ratios"][aspect] += 1
-                
-                # 컬러 모드
-                stats["color_modes"][img.mode] += 1
-        except Exception as e:
-            print(f"Error processing {file}: {e}")
+    # 파일 크기
+    size_mb = result["size"] / (1024 * 1024)
+    stats["total_size_mb"] += size_mb
+    size_category = f"{int(size_mb)}MB" if size_mb >= 1 else f"{int(size_mb * 1024)}KB"
+    stats["sizes"][size_category] += 1
+    
+    if result["error"] is not None:
+        print(f"Error processing {file}: {result['error']}")
+        return
+    
+    # 이미지 속성
+    width, height = result["width"], result["height"]
+    resolution = f"{width}x{height}"
+    stats["resolutions"][resolution] += 1
+    
+    # 화면비
+    ratio = width / height
+    if ratio == 1:
+        aspect = "1:1"
+    elif ratio > 1:
+        aspect = f"{ratio:.2f}:1"
+    else:
+        aspect = f"1:{1/ratio:.2f}"
+    stats["aspect_ratios"][aspect] += 1
     
+    # 컬러 모드
+    stats["color_modes"][result["mode"]] += 1
+
+def analyze_images(
+    directory: str,
+    recursive: bool = False,
+    manifest: Optional[str] = None,
+    jobs: int = 8,
+    pixels: bool = False,
+    pixel_size: Optional[int] = None
+) -> Dict:
+    """
+    이미지 파일들의 통계 분석
+    
+    Args:
+        directory: 이미지 디렉토리
+        recursive: 하위 디렉토리 포함 여부
+        manifest: 증분 분석용 매니페스트 경로 (지정하면 변경된 파일만 다시 읽고,
+            "manifest" 항목에 재사용/갱신/삭제 파일 수를 기록)
+        jobs: 헤더를 읽는 스레드 수 / 픽셀 통계를 계산하는 프로세스 수
+        pixels: True이면 픽셀을 디코딩하여 채널별 평균/표준편차를 "pixels" 항목에 기록
+        pixel_size: 픽셀 통계용 JPEG 축소 디코딩 크기 (None이면 원본 크기)
+    
+    Returns:
+        Dict: 이미지 통계 정보
+    """
+    # 이미지 파일 찾기 (매니페스트를 쓰면 탐색 스레드에서 stat까지 조회)
+    entries = list(scan_entries(directory, ["*.jpg", "*.png"], recursive, stat=bool(manifest)))
+    files = [Path(entry.path) for entry in entries]
+    
+    stats = _new_image_stats(len(files))
+    
+    if manifest:
+        # 증분 분석: 변경된 파일만 읽고 나머지는 매니페스트의 결과를 재사용
+        scope = "images:recursive" if recursive else "images"
+        with metrics.stage('read'):
+            results, summary = incremental_scan(
+                manifest, scope, directory, files,
+                lambda changed: _read_image_headers(changed, jobs),
+                [entry.stat() for entry in entries]
+            )
+        stats["manifest"] = summary
+    else:
+        with metrics.stage('read'):
+            results = _read_image_headers(files, jobs)
+    
+    for file, result in zip(files, results):
+        _add_image_result(stats, file, result)
+    
+    if pixels:
+        with metrics.stage('compute'):
+            stats["pixels"] = analyze_pixels(files, jobs, pixel_size)
+    
+    metrics.count(
+        files=len(files),
+        bytes=sum(result["size"] for result in results),
+        errors=sum(1 for result in results if result["error"] is not None)
+    )
     return stats
 
 @click.group()
@@ -70,16 +261,28 @@ def cli():
     """이미지 분석 도구"""
     pass
 
+cli.add_command(near_duplicates)
+
 @cli.command()
 @click.argument('directory')
 @click.option('--recursive', '-r', is_flag=True, help='하위 디렉토리 포함')
-def analyze(directory, recursive):
+@click.option('--incremental', '-i', is_flag=True, help='매니페스트를 사용해 변경된 파일만 분석')
+@click.option('--manifest', help='매니페스트 파일 경로 (기본: 이미지 디렉토리의 .kwtools_manifest.sqlite)')
+@click.option('--jobs', '-j', default=8, help='병렬 처리 스레드/프로세스 수')
+@click.option('--pixels', is_flag=True, help='채널별 픽셀 평균/표준편차 계산 (픽셀 디코딩)')
+@click.option('--pixel-size', type=int, help='픽셀 통계용 축소 디코딩 크기 (JPEG draft 모드)')
+def analyze(directory, recursive, incremental, manifest, jobs, pixels, pixel_size):
     """이미지 파일들의 통계를 분석합니다."""
-    stats = analyze_images(directory, recursive)
+    if incremental and not manifest:
+        manifest = default_manifest_path(directory)
+    stats = analyze_images(directory, recursive, manifest, jobs, pixels, pixel_size)
     
     click.echo("\n=== 이미지 통계 ===")
     click.echo(f"\n총 이미지 수: {stats['total_images']}")
     click.echo(f"총 용량: {stats['total_size_mb']:.2f}MB")
+    if 'manifest' in stats:
+        summary = stats['manifest']
+        click.echo(f"매니페스트: 재사용 {summary['reused']}, 갱신 {summary['updated']}, 삭제 {summary['removed']}")
     
     click.echo("\n파일 형식:")
     for fmt, count in stats["formats"].items():
@@ -100,6 +303,14 @@ def analyze(directory, recursive):
     click.echo("\n컬러 모드:")
     for mode, count in stats["color_modes"].items():
         click.echo(f"  - {mode}: {count}")
+    
+    if 'pixels' in stats:
+        pixel_stats = stats['pixels']
+        click.echo(f"\n픽셀 통계 (RGB, {pixel_stats['pixel_count']} 픽셀):")
+        click.echo(f"  - 평균: {', '.join(f'{v:.4f}' for v in pixel_stats['mean'])}")
+        click.echo(f"  - 표준편차: {', '.join(f'{v:.4f}' for v in pixel_stats['std'])}")
+        click.echo(f"  - 정규화 (0-1): mean=[{', '.join(f'{v / 255:.4f}' for v in pixel_stats['mean'])}], "
+                   f"std=[{', '.join(f'{v / 255:.4f}' for v in pixel_stats['std'])}]")
 
 if __name__ == '__main__':
     cli()
\ No newline at end of file
@@ -2,27 +2,225 @@ import os
 import click
 from pathlib import Path
 from collections import Counter
-from typing import Dict, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, Iterable, List, Optional, Tuple
 from tqdm import tqdm
+from .. import metrics
+from .label_store import is_label_store, analyze_label_store, pack
+from .box_geometry import GEOMETRY_BINS, BoxGeometry, label_store_geometry
+from .scan_manifest import default_manifest_path, incremental_scan
+from ..file_management.scanner import scan_entries
+from .label_transform import transform
+from .label_lint import lint
+
+def _analyze_label_file(label_file: Path, verbose: bool = False, geometry: bool = False) -> Dict:
+    """
+    라벨 파일 하나를 분석하여 파일 단위 결과를 반환
+
+    Args:
+        label_file: 라벨 파일 경로
+        verbose: 상세 정보 출력 여부
+        geometry: True이면 박스 좌표도 반환
+
+    Returns:
+        Dict: {"error", "empty", "valid_lines", "classes": {class_id: 객체 수}}
+            (geometry이면 "boxes": [[class_id, x, y, w, h], ...] 추가)
+    """
+    result = {"error": False, "empty": False, "valid_lines": 0, "classes": {}}
+    classes = result["classes"]
+    if geometry:
+        boxes = result["boxes"] = []
+
+    try:
+        with open(label_file, 'r') as f:
+            lines = f.readlines()
+    except Exception as e:
+        result["error"] = True
+        if verbose:
+            print(f"파일 처리 오류: {label_file} - {str(e)}")
+        return result
+
+    if not lines:
+        result["empty"] = True
+        if verbose:
+            print(f"빈 파일: {label_file}")
+        return result
+
+    for line in lines:
+        line = line.strip()
+        if not line:  # 빈 줄 건너뛰기
+            continue
+
+        parts = line.split()
+        if len(parts) != 5:  # YOLO 형식: class_id x y width height
+            if verbose:
+                print(f"잘못된 형식의 라인 ({len(parts)} values): {label_file} - {line}")
+            continue
+
+        try:
+            class_id = int(float(parts[0]))
+        except ValueError:
+            if verbose:
+                print(f"클래스 ID 변환 오류: {label_file} - {line}")
+            continue
+
+        classes[class_id] = classes.get(class_id, 0) + 1
+        result["valid_lines"] += 1
+
+        if geometry:
+            try:
+                boxes.append([class_id, float(parts[1]), float(parts[2]), float(parts[3]), float(parts[4])])
+            except ValueError:
+                pass  # 좌표를 읽을 수 없는 객체는 개수에만 포함
+
+    if result["valid_lines"] == 0 and verbose:
+        print(f"유효한 객체가 없는 파일: {label_file}")
+
+    return result
+
+def _new_label_stats(total_files: int = 0, geometry_bins: Optional[int] = None) -> Tuple[Dict, Dict]:
+    """비어있는 (기본 통계, 클래스별 통계) 쌍 생성 (geometry_bins가 있으면 박스 기하 히스토그램 포함)"""
+    stats = {
+        "total_files": total_files,
+        "empty_files": 0,
+        "no_object_files": 0,  # 객체가 없는 파일 수
+        "total_objects": 0,
+        "error_files": []  # 에러가 발생한 파일 목록
+    }
+    if geometry_bins is not None:
+        stats["geometry"] = BoxGeometry(geometry_bins)
+    class_stats = {}  # class_id -> {"count": int, "files": int}
+    return stats, class_stats
+
+def _add_file_result(stats: Dict, class_stats: Dict, label_file, result: Dict) -> None:
+    """파일 단위 분석 결과를 통계에 누적"""
+    if result["error"]:
+        stats["error_files"].append(str(label_file))
+        return
+    if result["empty"]:
+        stats["empty_files"] += 1
+        return
+    if result["valid_lines"] == 0:
+        stats["no_object_files"] += 1
+
+    stats["total_objects"] += result["valid_lines"]
+    if "geometry" in stats and result.get("boxes"):
+        stats["geometry"].add_rows(result["boxes"])
+    for class_id, count in result["classes"].items():
+        if class_id not in class_stats:
+            class_stats[class_id] = {"count": 0, "files": 0}
+        class_stats[class_id]["count"] += count
+        class_stats[class_id]["files"] += 1
+
+def _analyze_label_chunk(
+    label_files: List[Path],
+    verbose: bool = False,
+    geometry_bins: Optional[int] = None
+) -> Tuple[Dict, Dict]:
+    """
+    라벨 파일 묶음(chunk)을 분석하여 부분 통계를 반환
+
+    반환값은 merge_label_stats로 다른 chunk의 결과와 정확히 합칠 수 있습니다.
+    """
+    stats, class_stats = _new_label_stats(len(label_files), geometry_bins)
+    for label_file in label_files:
+        _add_file_result(stats, class_stats, label_file, _analyze_label_file(label_file, verbose, geometry_bins is not None))
+    return stats, class_stats
+
+def merge_label_stats(partials: Iterable[Tuple[Dict, Dict]]) -> Tuple[Dict, Dict]:
+    """
+    부분 통계들을 하나로 병합
+
+    partials의 순서대로 병합하므로, 파일 순서대로 나눈 chunk를 순서대로 넘기면
+    직렬 처리와 동일한 결과(에러 파일 목록과 클래스 등장 순서 포함)를 얻습니다.
+
+    Args:
+        partials: (기본 통계, 클래스별 통계) 쌍들
+
+    Returns:
+        Tuple[Dict, Dict]: 병합된 (기본 통계, 클래스별 통계)
+    """
+    stats, class_stats = _new_label_stats()
+    for part_stats, part_class_stats in partials:
+        for key in ("total_files", "empty_files", "no_object_files", "total_objects"):
+            stats[key] += part_stats[key]
+        stats["error_files"].extend(part_stats["error_files"])
+        if "geometry" in part_stats:
+            if "geometry" not in stats:
+                stats["geometry"] = BoxGeometry(part_stats["geometry"].bins)
+            stats["geometry"].merge(part_stats["geometry"])
+
+        for class_id, class_stat in part_class_stats.items():
+            if class_id not in class_stats:
+                class_stats[class_id] = {"count": 0, "files": 0}
+            class_stats[class_id]["count"] += class_stat["count"]
+            class_stats[class_id]["files"] += class_stat["files"]
+    return stats, class_stats
+
+def _split_chunks(items: List, jobs: int, chunk_size: Optional[int] = None) -> List[List]:
+    """리스트를 순서를 유지한 채 chunk로 분할"""
+    if chunk_size is None:
+        # 작업자당 여러 chunk를 주어 부하를 고르게 분산
+        chunk_size = max(1, min(10000, len(items) // (jobs * 8) or 1))
+    return [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+def _analyze_label_files(
+    label_files: List[Path],
+    verbose: bool = False,
+    jobs: int = 1,
+    chunk_size: Optional[int] = None
+) -> List[Dict]:
+    """라벨 파일들의 파일 단위 결과 목록을 반환 (jobs > 1이면 프로세스 풀 사용)"""
+    if jobs <= 1:
+        return [_analyze_label_file(f, verbose) for f in tqdm(label_files, desc="Analyzing labels")]
+    
+    if chunk_size is None:
+        chunk_size = max(1, min(10000, len(label_files) // (jobs * 8)))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        results = executor.map(_analyze_label_file, label_files, repeat(verbose), chunksize=chunk_size)
+        return list(tqdm(results, total=len(label_files), desc="Analyzing labels"))
 
 def analyze_txt_labels(
     label_dir: str,
     class_names_file: Optional[str] = None,
     recursive: bool = False,
-    verbose: bool = False
+    verbose: bool = False,
+    jobs: int = 1,
+    chunk_size: Optional[int] = None,
+    manifest: Optional[str] = None,
+    geometry_bins: Optional[int] = None
 ) -> Tuple[Dict, Dict]:
     """
     YOLO 형식의 txt 라벨 파일들을 분석
 
     Args:
-        label_dir: 라벨 파일이 있는 디렉토리
+        label_dir: 라벨 파일이 있는 디렉토리 또는 pack_labels로 만든 라벨 저장소
         class_names_file: 클래스 이름이 있는 파일 (옵션)
         recursive: 하위 디렉토리 포함 여부
         verbose: 상세 정보 출력 여부
+        jobs: 병렬 처리 프로세스 수 (1이면 직렬 처리)
+        chunk_size: 프로세스에 한 번에 넘길 파일 수 (None이면 자동)
+        manifest: 증분 분석용 매니페스트 경로 (지정하면 변경된 파일만 다시 분석하고,
+            기본 통계의 "manifest" 항목에 재사용/갱신/삭제 파일 수를 기록)
+        geometry_bins: 지정하면 클래스별 박스 너비/높이/넓이/종횡비 히스토그램과 중심 히트맵을
+            이 구간 수로 누적하여 기본 통계의 "geometry" 항목(BoxGeometry)에 기록
 
     Returns:
         Tuple[Dict, Dict]: (기본 통계, 클래스별 통계)
     """
+    if manifest and geometry_bins is not None:
+        raise ValueError("박스 기하 분석은 증분 분석과 함께 사용할 수 없습니다 (매니페스트에는 좌표가 저장되지 않음).")
+
+    # 라벨 저장소는 벡터 연산으로 분석
+    if is_label_store(label_dir):
+        with metrics.stage('compute'):
+            stats, class_stats = analyze_label_store(label_dir)
+            if geometry_bins is not None:
+                stats["geometry"] = label_store_geometry(label_dir, geometry_bins)
+        metrics.count(files=stats["total_files"], errors=len(stats["error_files"]))
+        return stats, class_stats
+    
     path = Path(label_dir)
     
     # 클래스 이름 로드 (있는 경우)
@@ -32,84 +230,50 @@ def analyze_txt_labels(
             for idx, line in enumerate(f):
                 class_names[idx] = line.strip()
     
-    # 라벨 파일 찾기
-    if recursive:
-        label_files = list(path.rglob("*.txt"))
-    else:
-        label_files = list(path.glob("*.txt"))
-    
-    # 통계 초기화
-    stats = {
-        "total_files": len(label_files),
-        "empty_files": 0,
-        "no_object_files": 0,  # 객체가 없는 파일 수
-        "total_objects": 0,
-        "error_files": []  # 에러가 발생한 파일 목록
-    }
-    
-    class_stats = {}  # class_id -> {"count": int, "files": int}
+    # 라벨 파일 찾기 (매니페스트를 쓰면 탐색 스레드에서 stat까지 조회)
+    entries = list(scan_entries(path, "*.txt", recursive, stat=bool(manifest)))
+    label_files = [Path(entry.path) for entry in entries]
+
+    if manifest:
+        # 증분 분석: 변경된 파일만 분석하고 나머지는 매니페스트의 결과를 재사용
+        scope = "labels:recursive" if recursive else "labels"
+        with metrics.stage('parse'):
+            results, summary = incremental_scan(
+                manifest, scope, label_dir, label_files,
+                lambda files: _analyze_label_files(files, verbose, jobs, chunk_size),
+                [entry.stat() for entry in entries]
+            )
+        stats, class_stats = _new_label_stats(len(label_files))
+        for label_file, result in zip(label_files, results):
+            # JSON으로 저장된 결과는 클래스 ID가 문자열이므로 정수로 복원
+            result["classes"] = {int(k): v for k, v in result["classes"].items()}
+            _add_file_result(stats, class_stats, label_file, result)
+        stats["manifest"] = summary
+        metrics.count(files=stats["total_files"], errors=len(stats["error_files"]))
+        return stats, class_stats
     
-    # 파일 분석
-    for label_file in tqdm(label_files, desc="Analyzing labels"):
-        classes_in_file = set()
-        objects_in_file = 0
-        
-        try:
-            with open(label_file, 'r') as f:
-                lines = f.readlines()
-                
-                if not lines:
-                    stats["empty_files"] += 1
-                    if verbose:
-                        print(f"빈 파일: {label_file}")
-                    continue
-                
-                valid_lines = 0
-                for line in lines:
-                    line = line.strip()
-                    if not line:  # 빈 줄 건너뛰기
-                        continue
-                        
-                    parts = line.split()
-                    if len(parts) != 5:  # YOLO 형식: class_id x y width height
-                        if verbose:
-                            print(f"잘못된 형식의 라인 ({len(parts)} values): {label_file} - {line}")
-                        continue
-                    
-                    try:
-                        class_id = int(float(parts[0]))
-                        
-                        # 클래스별 통계 초기화 (필요한 경우)
-                        if class_id not in class_stats:
-                            class_stats[class_id] = {"count": 0, "files": 0}
-                        
-                        # 클래스별 객체 수 증가
-                        class_stats[class_id]["count"] += 1
-                        objects_in_file += 1
-                        classes_in_file.add(class_id)
-                        valid_lines += 1
-                        
-                    except ValueError as e:
-                        if verbose:
-                            print(f"클래스 ID 변환 오류: {label_file} - {line}")
-                        continue
-                
-                if valid_lines == 0:
-                    stats["no_object_files"] += 1
-                    if verbose:
-                        print(f"유효한 객체가 없는 파일: {label_file}")
-                
-                stats["total_objects"] += objects_in_file
-                
-                # 클래스별 파일 수 업데이트
-                for class_id in classes_in_file:
-                    class_stats[class_id]["files"] += 1
-                    
-        except Exception as e:
-            stats["error_files"].append(str(label_file))
-            if verbose:
-                print(f"파일 처리 오류: {label_file} - {str(e)}")
+    with metrics.stage('parse'):
+        if jobs <= 1:
+            # 직렬 처리
+            stats, class_stats = _new_label_stats(len(label_files), geometry_bins)
+            for label_file in tqdm(label_files, desc="Analyzing labels"):
+                _add_file_result(stats, class_stats, label_file, _analyze_label_file(label_file, verbose, geometry_bins is not None))
+        else:
+            # 병렬 처리: chunk별 부분 통계를 순서대로 병합
+            chunks = _split_chunks(label_files, jobs, chunk_size)
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                with tqdm(total=len(label_files), desc="Analyzing labels") as pbar:
+                    def partials():
+                        results = executor.map(_analyze_label_chunk, chunks, repeat(verbose), repeat(geometry_bins))
+                        for chunk, partial in zip(chunks, results):
+                            yield partial
+                            pbar.update(len(chunk))
+                    # 도착하는 대로 병합하므로 chunk별 기하 히스토그램을 모아두지 않음
+                    stats, class_stats = merge_label_stats(partials())
+        if geometry_bins is not None:
+            stats.setdefault("geometry", BoxGeometry(geometry_bins)).flush()
     
+    metrics.count(files=stats["total_files"], errors=len(stats["error_files"]))
     return stats, class_stats
 
 @click.group()
@@ -117,20 +281,41 @@ def cli():
     """라벨 분석 도구"""
     pass
 
+cli.add_command(pack)
+cli.add_command(transform)
+cli.add_command(lint)
+
 @cli.command()
 @click.argument('label_dir')
 @click.option('--names', '-n', help='클래스 이름 파일 경로')
 @click.option('--recursive', '-r', is_flag=True, help='하위 디렉토리 포함')
 @click.option('--verbose', '-v', is_flag=True, help='상세 정보 출력')
-def analyze(label_dir, names, recursive, verbose):
+@click.option('--jobs', '-j', default=1, help='병렬 처리 프로세스 수')
+@click.option('--incremental', '-i', is_flag=True, help='매니페스트를 사용해 변경된 파일만 분석')
+@click.option('--manifest', help='매니페스트 파일 경로 (기본: 라벨 디렉토리의 .kwtools_manifest.sqlite)')
+@click.option('--geometry', '-g', is_flag=True, help='클래스별 박스 너비/높이/넓이/종횡비 히스토그램과 중심 히트맵 계산')
+@click.option('--bins', default=GEOMETRY_BINS, show_default=True, help='기하 히스토그램 구간 수 (중심 히트맵은 구간 수 x 구간 수)')
+@click.option('--geometry-out', type=click.Path(dir_okay=False), help='기하 히스토그램을 저장할 파일 (.json 또는 .csv, --geometry 포함)')
+def analyze(label_dir, names, recursive, verbose, jobs, incremental, manifest, geometry, bins, geometry_out):
     """YOLO 형식의 txt 라벨 파일들을 분석합니다."""
-    stats, class_stats = analyze_txt_labels(label_dir, names, recursive, verbose)
+    if incremental and not manifest:
+        manifest = default_manifest_path(label_dir)
+    geometry_bins = bins if geometry or geometry_out else None
+    try:
+        stats, class_stats = analyze_txt_labels(
+            label_dir, names, recursive, verbose, jobs=jobs, manifest=manifest, geometry_bins=geometry_bins
+        )
+    except ValueError as e:
+        raise click.ClickException(str(e))
     
     click.echo("\n=== 기본 통계 ===")
     click.echo(f"총 파일 수: {stats['total_files']}")
     click.echo(f"빈 파일 수: {stats['empty_files']}")
     click.echo(f"객체가 없는 파일 수: {stats['no_object_files']}")
     click.echo(f"총 객체 수: {stats['total_objects']}")
+    if 'manifest' in stats:
+        summary = stats['manifest']
+        click.echo(f"매니페스트: 재사용 {summary['reused']}, 갱신 {summary['updated']}, 삭제 {summary['removed']}")
     
     if stats['error_files']:
         click.echo(f"\n처리 중 오류가 발생한 파일 수: {len(stats['error_files'])}")
@@ -154,6 +339,29 @@ def analyze(label_dir, names, recursive, verbose):
         click.echo(f"\n클래스 {class_id} {class_name}:")
         click.echo(f"  총 객체 수: {class_stat['count']}")
         click.echo(f"  등장한 파일 수: {class_stat['files']}")
+        if 'geometry' in stats and class_id in stats['geometry'].classes:
+            _echo_geometry_medians(stats['geometry'], stats['geometry'].classes[class_id])
+
+    if 'geometry' in stats:
+        click.echo("\n=== 전체 박스 기하 ===")
+        _echo_geometry_medians(stats['geometry'], stats['geometry'].total())
+        if geometry_out:
+            class_names = {}
+            if names:
+                with open(names, 'r') as f:
+                    class_names = {idx: line.strip() for idx, line in enumerate(f)}
+            stats['geometry'].write(geometry_out, class_names)
+            click.echo(f"기하 히스토그램 저장: {geometry_out}")
+
+def _echo_geometry_medians(geometry: BoxGeometry, histograms: Dict) -> None:
+    """히스토그램에서 구한 중앙값 출력 (구간 중앙 값이므로 근삿값)"""
+    medians = {name: geometry.median(histograms[name], name) for name in ("width", "height", "area", "aspect")}
+    if medians["width"] is None:
+        return
+    click.echo(
+        f"  중앙값(근사): 너비 {medians['width']:.3f}, 높이 {medians['height']:.3f}, "
+        f"넓이 {medians['area']:.2e}, 종횡비(w/h) {medians['aspect']:.2f}"
+    )
 
 if __name__ == '__main__':
     cli()
\ No newline at end of file
@@ -2,6 +2,9 @@ import os
 import click
 from pathlib import Path
 from tqdm import tqdm
+from .. import metrics
+from .label_store import is_label_store, load_label_store, drop_store_confidence
+from ..file_management.scanner import scan_files
 
 def remove_confidence(
     label_dir: str,
@@ -13,18 +16,24 @@ def remove_confidence(
     YOLO 형식 라벨에서 confidence 값을 제거합니다.
     
     Args:
-        label_dir: 라벨 파일이 있는 디렉토리
+        label_dir: 라벨 파일이 있는 디렉토리 또는 라벨 저장소
         recursive: 하위 디렉토리 포함 여부
         backup: 원본 파일 백업 여부
         verbose: 상세 정보 출력 여부
     """
+    # 라벨 저장소는 confidence 컬럼만 제거
+    if is_label_store(label_dir):
+        total_files = len(load_label_store(label_dir)["stems"])
+        return {
+            "total_files": total_files,
+            "modified_files": drop_store_confidence(label_dir, backup),
+            "error_files": []
+        }
+    
     path = Path(label_dir)
     
     # 라벨 파일 찾기
-    if recursive:
-        label_files = list(path.rglob("*.txt"))
-    else:
-        label_files = list(path.glob("*.txt"))
+    label_files = list(scan_files(path, "*.txt", recursive))
     
     stats = {
         "total_files": len(label_files),
@@ -75,6 +84,7 @@ def remove_confidence(
             if verbose:
                 print(f"오류 발생: {label_file} - {str(e)}")
     
+    metrics.count(files=stats["total_files"], written=stats["modified_files"], errors=len(stats["error_files"]))
     return stats
 
 @click.command()
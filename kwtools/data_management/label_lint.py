@@ -0,0 +1,304 @@
+import csv
+import click
+import numpy as np
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, List, Optional, Tuple
+from tqdm import tqdm
+from .. import metrics
+from .convert import read_class_names
+from .label_store import is_label_store
+from ..file_management.scanner import scan_files
+
+# 검사 항목
+#   format: 값 개수가 5(또는 confidence가 있는 6)가 아니거나 숫자가 아닌 라인
+#   nan: NaN 또는 무한대 값
+#   unknown-class: 정수가 아니거나 음수이거나 클래스 이름 파일에 없는 클래스 ID
+#   degenerate: 너비나 높이가 min_size 이하인 박스
+#   range: 중심이 [0, 1]을 벗어나거나 박스가 이미지 밖으로 나가는 경우
+#   duplicate: 앞 라인의 박스와 IoU가 기준 이상인 박스
+LINT_CHECKS = ('format', 'nan', 'unknown-class', 'degenerate', 'range', 'duplicate')
+
+# 중복 후보 쌍을 한 번에 계산하는 최대 개수 (메모리 제한)
+_MAX_PAIRS = 1 << 20
+
+Issue = Tuple[int, str, str]  # (라인 번호, 검사 항목, 내용)
+
+def _box_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """[x_min, y_min, x_max, y_max] 박스 쌍들의 IoU"""
+    iw = np.clip(np.minimum(a[:, 2], b[:, 2]) - np.maximum(a[:, 0], b[:, 0]), 0, None)
+    ih = np.clip(np.minimum(a[:, 3], b[:, 3]) - np.maximum(a[:, 1], b[:, 1]), 0, None)
+    inter = iw * ih
+    union = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1]) + (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1]) - inter
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(union > 0, inter / union, 0.0)
+
+def find_duplicate_boxes(
+    boxes: np.ndarray,
+    classes: Optional[np.ndarray] = None,
+    iou_threshold: float = 0.9
+) -> List[Tuple[int, int, float]]:
+    """
+    IoU가 기준 이상인 박스 쌍을 모든 쌍을 비교하지 않고 찾음
+
+    IoU >= t이면 두 박스의 x_min 차이는 (1 - t) * max(w)보다 작고 너비 비율은 t 이상이므로,
+    x_min으로 정렬한 뒤 각 박스에서 x_min + (1 - t) / t * w까지만 후보로 봅니다 (정렬 + 이진 탐색).
+    완전히 같은 박스는 먼저 묶어서 처리하므로 같은 박스가 수천 개 쌓여 있어도 후보가 늘지 않습니다.
+
+    Args:
+        boxes: (N, 4) 박스 [x_min, y_min, x_max, y_max]
+        classes: (N,) 클래스 ID (있으면 같은 클래스끼리만 비교)
+        iou_threshold: IoU 기준 (0 < t <= 1)
+
+    Returns:
+        List[Tuple[int, int, float]]: (중복 박스 위치, 먼저 나온 박스 위치, IoU), 박스마다 한 번만 보고
+            (완전히 같은 박스는 처음 나온 같은 박스, 그 외에는 가장 먼저 나온 겹치는 박스)
+    """
+    if not 0 < iou_threshold <= 1:
+        raise ValueError(f"IoU 기준은 0보다 크고 1 이하여야 합니다: {iou_threshold}")
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    if classes is None:
+        classes = np.zeros(len(boxes), dtype=np.float64)
+    if len(boxes) < 2:
+        return []
+
+    # 완전히 같은 (클래스, 박스)는 처음 나온 박스의 중복
+    keys = np.column_stack([classes, boxes])
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    partner = first[inverse]
+    duplicates = {int(i): (int(partner[i]), 1.0) for i in np.flatnonzero(partner != np.arange(len(boxes)))}
+
+    # 서로 다른 박스 사이의 근접 중복: x_min으로 정렬하여 범위 안의 후보만 비교
+    if iou_threshold < 1 and len(first) > 1:
+        ubox = boxes[first]
+        uclass = classes[first]
+        order = np.argsort(ubox[:, 0], kind='stable')
+        x_min = ubox[order, 0]
+        width = ubox[order, 2] - ubox[order, 0]
+        reach = np.searchsorted(x_min, x_min + (1 - iou_threshold) / iou_threshold * np.maximum(width, 0), side='right')
+        counts = np.maximum(reach - np.arange(len(order)) - 1, 0)
+
+        start = 0
+        while start < len(order):
+            # 후보 쌍이 _MAX_PAIRS를 넘지 않도록 나누어 계산
+            end = start + max(1, int(np.searchsorted(np.cumsum(counts[start:]), _MAX_PAIRS, side='right')))
+            num = counts[start:end]
+            i = np.repeat(np.arange(start, end), num)
+            j = i + 1 + (np.arange(num.sum()) - np.repeat(np.cumsum(num) - num, num))
+            a, b = order[i], order[j]
+            same = uclass[a] == uclass[b]
+            a, b = a[same], b[same]
+            iou = _box_iou(ubox[a], ubox[b])
+            hit = iou >= iou_threshold
+            for ua, ub, value in zip(first[a[hit]].tolist(), first[b[hit]].tolist(), iou[hit].tolist()):
+                later, earlier = max(ua, ub), min(ua, ub)
+                if later not in duplicates or duplicates[later][0] > earlier:
+                    duplicates[later] = (earlier, value)
+            start = end
+
+    return sorted((later, earlier, iou) for later, (earlier, iou) in duplicates.items())
+
+def _lint_label_file(
+    label_file: Path,
+    num_classes: Optional[int] = None,
+    iou_threshold: float = 0.9,
+    min_size: float = 0.0,
+    tolerance: float = 1e-4,
+    cross_class: bool = False
+) -> Optional[List[Issue]]:
+    """
+    라벨 파일 하나를 검사
+
+    라인 파싱만 파일 단위로 하고 나머지 검사는 파일 전체 박스에 대한 배열 연산으로 수행합니다.
+
+    Returns:
+        Optional[List[Issue]]: 발견한 문제 목록 (라인 번호 순), 파일을 읽을 수 없으면 None
+    """
+    try:
+        with open(label_file, 'r') as f:
+            lines = f.readlines()
+    except Exception as e:
+        print(f"Error processing {label_file}: {e}")
+        return None
+
+    issues = []
+    rows = []
+    line_numbers = []
+    for number, line in enumerate(lines, 1):
+        parts = line.split()
+        if not parts:
+            continue
+        if len(parts) not in (5, 6):
+            issues.append((number, 'format', f"값이 {len(parts)}개입니다 (5개 또는 6개)"))
+            continue
+        try:
+            rows.append([float(v) for v in parts[:5]])
+        except ValueError:
+            issues.append((number, 'format', "숫자가 아닌 값이 있습니다"))
+            continue
+        line_numbers.append(number)
+
+    if rows:
+        rows = np.array(rows, dtype=np.float64)
+        line_numbers = np.array(line_numbers)
+        class_ids, x, y, w, h = rows.T
+
+        finite = np.isfinite(rows).all(axis=1)
+        unknown = finite & ((class_ids != np.floor(class_ids)) | (class_ids < 0))
+        if num_classes is not None:
+            unknown |= finite & (class_ids >= num_classes)
+        degenerate = finite & ((w <= min_size) | (h <= min_size))
+        low, high = -tolerance, 1 + tolerance
+        out_of_range = finite & (
+            (x < low) | (x > high) | (y < low) | (y > high)
+            | (x - w / 2 < low) | (x + w / 2 > high) | (y - h / 2 < low) | (y + h / 2 > high)
+        )
+
+        for k in np.flatnonzero(~finite).tolist():
+            issues.append((int(line_numbers[k]), 'nan', "NaN 또는 무한대 값이 있습니다"))
+        for k in np.flatnonzero(unknown).tolist():
+            issues.append((int(line_numbers[k]), 'unknown-class', f"알 수 없는 클래스 ID {class_ids[k]:g}"))
+        for k in np.flatnonzero(degenerate).tolist():
+            issues.append((int(line_numbers[k]), 'degenerate', f"크기가 너무 작습니다 (w={w[k]:g}, h={h[k]:g})"))
+        for k in np.flatnonzero(out_of_range).tolist():
+            issues.append((int(line_numbers[k]), 'range', f"좌표가 이미지를 벗어납니다 (x={x[k]:g}, y={y[k]:g}, w={w[k]:g}, h={h[k]:g})"))
+
+        # 중복 검사는 값이 정상인 박스만 대상
+        valid = np.flatnonzero(finite)
+        boxes = np.column_stack([x - w / 2, y - h / 2, x + w / 2, y + h / 2])[valid]
+        classes = None if cross_class else class_ids[valid]
+        for later, earlier, iou in find_duplicate_boxes(boxes, classes, iou_threshold):
+            issues.append((
+                int(line_numbers[valid[later]]), 'duplicate',
+                f"{int(line_numbers[valid[earlier]])}번 라인과 겹칩니다 (IoU {iou:.3f})"
+            ))
+
+    issues.sort(key=lambda issue: (issue[0], LINT_CHECKS.index(issue[1])))
+    return issues
+
+def _lint_label_chunk(label_files: List[Path], *args) -> List[Optional[List[Issue]]]:
+    """라벨 파일 묶음(chunk) 검사"""
+    return [_lint_label_file(label_file, *args) for label_file in label_files]
+
+def lint_labels(
+    label_dir: str,
+    class_names_file: Optional[str] = None,
+    recursive: bool = False,
+    iou_threshold: float = 0.9,
+    min_size: float = 0.0,
+    tolerance: float = 1e-4,
+    cross_class: bool = False,
+    jobs: int = 8,
+    chunk_size: Optional[int] = None
+) -> Dict:
+    """
+    YOLO 라벨의 좌표 범위, 크기, NaN, 클래스 ID, 중복 박스를 검사
+
+    Args:
+        label_dir: 라벨 파일이 있는 디렉토리
+        class_names_file: 클래스 이름 파일 (있으면 줄 수 이상의 클래스 ID를 보고)
+        recursive: 하위 디렉토리 포함 여부
+        iou_threshold: 중복으로 볼 IoU 기준
+        min_size: 너비나 높이가 이 값 이하이면 degenerate (정규화 좌표)
+        tolerance: 범위 검사에서 허용하는 오차
+        cross_class: True이면 클래스가 달라도 중복으로 봄
+        jobs: 병렬 처리 프로세스 수 (1이면 직렬 처리)
+        chunk_size: 프로세스에 한 번에 넘길 파일 수 (None이면 자동)
+
+    Returns:
+        Dict: {"total_files", "files_with_issues", "issues": {검사 항목: 개수},
+               "details": [(파일, 라인 번호, 검사 항목, 내용)], "error_files"}
+    """
+    if is_label_store(label_dir):
+        raise ValueError("라벨 저장소는 지원하지 않습니다. 원본 라벨 디렉토리를 검사하세요.")
+    if not 0 < iou_threshold <= 1:
+        raise ValueError(f"IoU 기준은 0보다 크고 1 이하여야 합니다: {iou_threshold}")
+
+    num_classes = None
+    if class_names_file:
+        num_classes = len(read_class_names(class_names_file))
+
+    label_files = list(scan_files(Path(label_dir), "*.txt", recursive))
+    args = (num_classes, iou_threshold, min_size, tolerance, cross_class)
+
+    with metrics.stage('compute'):
+        if jobs <= 1:
+            results = [_lint_label_file(f, *args) for f in tqdm(label_files, desc="Linting labels")]
+        else:
+            if chunk_size is None:
+                chunk_size = max(1, min(10000, len(label_files) // (jobs * 8)))
+            chunks = [label_files[i:i + chunk_size] for i in range(0, len(label_files), chunk_size)]
+            results = []
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                with tqdm(total=len(label_files), desc="Linting labels") as pbar:
+                    for chunk_results in executor.map(_lint_label_chunk, chunks, *[repeat(arg) for arg in args]):
+                        results.extend(chunk_results)
+                        pbar.update(len(chunk_results))
+
+    stats = {
+        "total_files": len(label_files),
+        "files_with_issues": 0,
+        "issues": {check: 0 for check in LINT_CHECKS},
+        "details": [],
+        "error_files": [],
+    }
+    for label_file, issues in zip(label_files, results):
+        if issues is None:
+            stats["error_files"].append(str(label_file))
+            continue
+        if issues:
+            stats["files_with_issues"] += 1
+        for number, check, message in issues:
+            stats["issues"][check] += 1
+            stats["details"].append((str(label_file), number, check, message))
+
+    metrics.count(files=stats["total_files"], errors=len(stats["error_files"]))
+    return stats
+
+@click.command()
+@click.argument('label_dir')
+@click.option('--names', '-n', help='클래스 이름 파일 경로 (알 수 없는 클래스 ID 검사)')
+@click.option('--recursive', '-r', is_flag=True, help='하위 디렉토리 포함')
+@click.option('--iou', default=0.9, show_default=True, help='중복 박스로 볼 IoU 기준')
+@click.option('--min-size', default=0.0, show_default=True, help='너비나 높이가 이 값 이하이면 크기 오류 (정규화 좌표)')
+@click.option('--tolerance', default=1e-4, show_default=True, help='좌표 범위 검사에서 허용하는 오차')
+@click.option('--cross-class', is_flag=True, help='클래스가 달라도 중복 박스로 검사')
+@click.option('--jobs', '-j', default=8, help='병렬 처리 프로세스 수')
+@click.option('--output', '-o', type=click.Path(dir_okay=False), help='모든 문제를 저장할 CSV 파일')
+@click.option('--show', default=20, show_default=True, help='화면에 출력할 문제 수')
+def lint(label_dir, names, recursive, iou, min_size, tolerance, cross_class, jobs, output, show):
+    """YOLO 라벨의 좌표 범위, 크기, NaN, 클래스 ID, 중복 박스를 검사합니다.
+
+    문제가 있으면 종료 코드 1로 끝납니다.
+    """
+    try:
+        stats = lint_labels(label_dir, names, recursive, iou, min_size, tolerance, cross_class, jobs)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    click.echo("\n=== 검사 결과 ===")
+    click.echo(f"검사한 파일 수: {stats['total_files']}")
+    click.echo(f"문제가 있는 파일 수: {stats['files_with_issues']}")
+    for check, count in stats['issues'].items():
+        click.echo(f"  {check}: {count}")
+    if stats['error_files']:
+        click.echo(f"처리 중 오류가 발생한 파일 수: {len(stats['error_files'])}")
+
+    if stats['details'] and show > 0:
+        click.echo("\n=== 문제 목록 ===")
+        for file, number, check, message in stats['details'][:show]:
+            click.echo(f"{file}:{number}: [{check}] {message}")
+        if len(stats['details']) > show:
+            click.echo(f"... 외 {len(stats['details']) - show}개 (--output으로 전체 저장)")
+
+    if output:
+        with open(output, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["file", "line", "check", "message"])
+            writer.writerows(stats['details'])
+        click.echo(f"\n문제 목록 저장: {output}")
+
+    if stats['details'] or stats['error_files']:
+        raise click.exceptions.Exit(1)
\ No newline at end of file
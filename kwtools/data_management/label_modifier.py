@@ -1,99 +1,150 @@
 import os
 import json
+import time
+import tempfile
 import click
+import numpy as np
 from pathlib import Path
-from tqdm import tqdm
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Union
+from .. import metrics
+from .coco_stream import resolve_category_mapping, stream_remap_coco
+from .label_store import is_label_store, load_label_store, remap_store_classes
+from .label_transform import transform_labels, echo_rewrite_stats
 
 def modify_yolo_labels(
     label_dir: str,
     class_mapping: Dict[int, int],
-    recursive: bool = False
-) -> None:
+    recursive: bool = False,
+    jobs: int = 8,
+    dry_run: bool = False,
+    chunk_size: Optional[int] = None
+) -> Dict:
     """
     YOLO 형식 라벨 파일의 클래스를 수정
 
+    매핑되는 클래스가 있어 내용이 실제로 바뀌는 파일만 다시 씁니다. 쓰기는 임시 파일을
+    만든 뒤 교체하는 방식이라 중간에 중단되어도 파일이 반쯤 쓰인 상태로 남지 않습니다.
+
     Args:
-        label_dir: 라벨 파일이 있는 디렉토리
+        label_dir: 라벨 파일이 있는 디렉토리 또는 라벨 저장소
         class_mapping: {원본 클래스 ID: 새로운 클래스 ID} 형식의 매핑
         recursive: 하위 디렉토리 포함 여부
+        jobs: 병렬 처리 프로세스 수 (1이면 직렬 처리)
+        dry_run: True이면 파일을 쓰지 않고 변경될 파일 수만 계산
+        chunk_size: 프로세스에 한 번에 넘길 파일 수 (None이면 자동)
+
+    Returns:
+        Dict: {"total_files", "modified_files", "skipped_files", "error_files", "elapsed"}
     """
-    path = Path(label_dir)
+    start_time = time.perf_counter()
     
-    if recursive:
-        label_files = list(path.rglob("*.txt"))
-    else:
-        label_files = list(path.glob("*.txt"))
+    # 라벨 저장소는 class_id 컬럼을 벡터 연산으로 수정
+    if is_label_store(label_dir):
+        store = load_label_store(label_dir)
+        class_ids = np.asarray(store["class_id"])
+        changes = {old_id: new_id for old_id, new_id in class_mapping.items() if old_id != new_id}
+        changed_rows = np.isin(class_ids, list(changes)) if changes else np.zeros(len(class_ids), dtype=bool)
+        file_idx = np.repeat(np.arange(len(store["flags"])), np.diff(np.asarray(store["offsets"])))
+        modified_files = len(np.unique(file_idx[changed_rows]))
+        total_files = len(store["stems"])
+        del store, class_ids
+        if modified_files and not dry_run:
+            remap_store_classes(label_dir, class_mapping)
+        return {
+            "total_files": total_files,
+            "modified_files": modified_files,
+            "skipped_files": total_files - modified_files,
+            "error_files": [],
+            "elapsed": time.perf_counter() - start_time
+        }
     
-    for label_file in tqdm(label_files, desc="Modifying YOLO labels"):
-        # 파일 내용 읽기
-        with open(label_file, 'r') as f:
-            lines = f.readlines()
-        
-        modified_lines = []
-        for line in lines:
-            parts = line.strip().split()
-            if not parts:  # 빈 줄 건너뛰기
-                continue
-                
-            class_id = int(float(parts[0]))  # 첫 번째 값이 클래스 ID
-            if class_id in class_mapping:
-                # 클래스 ID 수정
-                parts[0] = str(class_mapping[class_id])
-                modified_lines.append(' '.join(parts) + '\n')
-            else:
-                modified_lines.append(line)
-        
-        # 수정된 내용 저장
-        with open(label_file, 'w') as f:
-            f.writelines(modified_lines)
+    return transform_labels(label_dir, [('remap', class_mapping)], recursive, jobs, dry_run, chunk_size)
 
 def modify_coco_labels(
     json_file: str,
-    class_mapping: Dict[int, Union[int, str]],
-    output_file: str = None
-) -> None:
+    class_mapping: Dict[int, Union[int, str, Dict]],
+    output_file: str = None,
+    stream: bool = False,
+    indent: Optional[int] = None
+) -> Dict[str, int]:
     """
     COCO 형식 라벨 파일의 클래스를 수정
 
     Args:
         json_file: COCO 형식 JSON 파일 경로
-        class_mapping: {원본 클래스 ID: 새로운 클래스 ID 또는 이름} 형식의 매핑
+        class_mapping: {원본 클래스 ID: 새로운 클래스 ID, 이름 또는 {"id", "name"}} 형식의 매핑
         output_file: 출력 파일 경로 (None이면 원본 파일 덮어쓰기)
+        stream: True이면 파일 전체를 메모리에 올리지 않고 스트리밍으로 수정
+            (categories와 annotations의 category_id 외의 내용은 바이트 그대로 유지)
+        indent: JSON 들여쓰기 (None이면 압축 형식, 스트리밍 모드에서는 무시)
+
+    Returns:
+        Dict[str, int]: {"categories": 수정된 카테고리 수, "annotations": 수정된 어노테이션 수}
     """
     if output_file is None:
         output_file = json_file
     
+    id_map, name_map = resolve_category_mapping(class_mapping)
+    
+    metrics.count(files=1, bytes=os.path.getsize(json_file))
+    if stream:
+        # 같은 디렉토리의 임시 파일에 쓴 뒤 교체 (원본 덮어쓰기 지원)
+        output_path = Path(output_file)
+        try:
+            mode = os.stat(output_path).st_mode & 0o7777
+        except FileNotFoundError:
+            # 새 파일은 open()으로 만든 것과 같은 권한 (mkstemp는 0600)
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        fd, tmp_file = tempfile.mkstemp(dir=output_path.parent, suffix='.tmp')
+        try:
+            try:
+                dst = os.fdopen(fd, 'wb')
+            except BaseException:
+                os.close(fd)
+                raise
+            # 읽기, 토큰 분석, 쓰기가 조각 단위로 이어지므로 하나의 단계로 기록
+            with dst, open(json_file, 'rb') as src, metrics.stage('parse'):
+                counts = stream_remap_coco(src, dst, id_map, name_map)
+            os.chmod(tmp_file, mode)
+            os.replace(tmp_file, output_path)
+        except BaseException:
+            os.unlink(tmp_file)
+            raise
+        return counts
+    
     # JSON 파일 읽기
-    with open(json_file, 'r') as f:
+    with open(json_file, 'r') as f, metrics.stage('parse'):
         data = json.load(f)
     
+    counts = {"categories": 0, "annotations": 0}
+    
     # 카테고리 수정
-    id_to_new_id = {}  # 이전 ID와 새로운 ID 매핑
     for cat in data['categories']:
         old_id = cat['id']
-        if old_id in class_mapping:
-            new_value = class_mapping[old_id]
-            if isinstance(new_value, str):
-                # 클래스 이름만 변경
-                cat['name'] = new_value
-            else:
-                # ID 변경 (및 선택적으로 이름도 변경)
-                id_to_new_id[old_id] = new_value
-                cat['id'] = new_value
-                if isinstance(new_value, dict):
-                    cat['name'] = new_value.get('name', cat['name'])
+        if old_id in name_map or old_id in id_map:
+            if old_id in name_map:
+                # 클래스 이름 변경
+                cat['name'] = name_map[old_id]
+            if old_id in id_map:
+                # ID 변경
+                cat['id'] = id_map[old_id]
+            counts["categories"] += 1
     
     # 어노테이션 수정
-    if id_to_new_id:
+    if id_map:
         for ann in data['annotations']:
             old_id = ann['category_id']
-            if old_id in id_to_new_id:
-                ann['category_id'] = id_to_new_id[old_id]
+            if old_id in id_map:
+                ann['category_id'] = id_map[old_id]
+                counts["annotations"] += 1
     
     # 수정된 내용 저장
-    with open(output_file, 'w') as f:
-        json.dump(data, f, indent=2)
+    with open(output_file, 'w') as f, metrics.stage('write'):
+        json.dump(data, f, indent=indent)
+    
+    return counts
 
 @click.command()
 @click.argument('label_dir')
@@ -101,7 +152,11 @@ def modify_coco_labels(
 @click.option('--recursive', '-r', is_flag=True, help='하위 디렉토리 포함')
 @click.option('--format', '-f', type=click.Choice(['yolo', 'coco']), required=True, help='라벨 형식')
 @click.option('--output', '-o', help='출력 파일 경로 (COCO 형식만 해당)')
-def cli(label_dir, mapping_file, recursive, format, output):
+@click.option('--stream', is_flag=True, help='대용량 COCO 파일을 스트리밍으로 수정 (COCO 형식만 해당)')
+@click.option('--indent', type=int, help='JSON 들여쓰기 (기본: 압축 형식, COCO 형식만 해당)')
+@click.option('--jobs', '-j', default=8, help='병렬 처리 프로세스 수 (YOLO 형식만 해당)')
+@click.option('--dry-run', is_flag=True, help='파일을 쓰지 않고 변경될 파일 수만 출력 (YOLO 형식만 해당)')
+def cli(label_dir, mapping_file, recursive, format, output, stream, indent, jobs, dry_run):
     """라벨 클래스를 수정합니다.
     
     mapping_file은 JSON 형식으로 다음과 같이 작성:
@@ -122,11 +177,14 @@ def cli(label_dir, mapping_file, recursive, format, output):
     if format == 'yolo':
         # YOLO 형식은 모든 값이 정수여야 함
         mapping = {k: int(v) for k, v in mapping.items()}
-        modify_yolo_labels(label_dir, mapping, recursive)
+        stats = modify_yolo_labels(label_dir, mapping, recursive, jobs, dry_run)
+        echo_rewrite_stats(stats, dry_run)
+        if dry_run:
+            return
     else:  # coco
         if not output and not click.confirm('출력 파일이 지정되지 않아 원본 파일을 덮어쓰게 됩니다. 계속하시겠습니까?'):
             return
-        modify_coco_labels(label_dir, mapping, output)
+        modify_coco_labels(label_dir, mapping, output, stream, indent)
     
     click.echo("라벨 수정이 완료되었습니다.")
 
@@ -0,0 +1,324 @@
+import os
+import json
+import click
+import numpy as np
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from tqdm import tqdm
+from .. import metrics
+from ..file_management.scanner import scan_files
+
+# 라벨 저장소 디렉토리 구성
+#   meta.json      : 저장소 정보 (형식 버전, 원본 디렉토리, 개수 등)
+#   stems.npy      : 라벨 파일의 상대 경로 (확장자 제외), 파일 순서
+#   flags.npy      : 파일 상태 (FLAG_OK / FLAG_EMPTY / FLAG_ERROR)
+#   offsets.npy    : 파일 i의 객체는 [offsets[i], offsets[i + 1]) 범위
+#   class_id.npy, x.npy, y.npy, w.npy, h.npy : 객체별 컬럼
+#   conf.npy       : confidence 컬럼 (confidence가 없는 객체는 NaN, 옵션)
+STORE_FORMAT = "kwtools-label-store"
+STORE_VERSION = 1
+META_FILE = "meta.json"
+COLUMNS = ("class_id", "x", "y", "w", "h")
+
+FLAG_OK = 0
+FLAG_EMPTY = 1
+FLAG_ERROR = 2
+
+def is_label_store(path: str) -> bool:
+    """경로가 pack_labels로 만든 라벨 저장소인지 확인"""
+    meta_file = Path(path) / META_FILE
+    if not meta_file.is_file():
+        return False
+    try:
+        with open(meta_file, 'r') as f:
+            return json.load(f).get("format") == STORE_FORMAT
+    except (OSError, ValueError):
+        return False
+
+def _parse_label_files(label_files: List[Path]) -> Tuple:
+    """
+    라벨 파일 묶음을 컬럼 배열로 변환
+
+    5개(class_id x y w h) 또는 6개(+ conf) 값을 가진 라인만 저장하며,
+    클래스 ID를 읽을 수 없는 라인은 analyze_txt_labels와 동일하게 버립니다.
+    confidence를 읽을 수 없는 (NaN 포함) 6개 값 라인도 형식 오류로 버립니다 (NaN으로 저장하면
+    confidence가 없는 5개 값 라인과 구별할 수 없음).
+    """
+    flags = np.zeros(len(label_files), dtype=np.uint8)
+    counts = np.zeros(len(label_files), dtype=np.int64)
+    class_ids = []
+    coords = []
+    confs = []
+
+    for i, label_file in enumerate(label_files):
+        try:
+            with open(label_file, 'r') as f:
+                lines = f.readlines()
+        except Exception:
+            flags[i] = FLAG_ERROR
+            continue
+
+        if not lines:
+            flags[i] = FLAG_EMPTY
+            continue
+
+        for line in lines:
+            parts = line.split()
+            if len(parts) not in (5, 6):
+                continue
+            try:
+                class_id = int(float(parts[0]))
+                conf = float(parts[5]) if len(parts) == 6 else np.nan
+            except ValueError:
+                continue
+            if len(parts) == 6 and np.isnan(conf):
+                continue
+
+            values = []
+            for part in parts[1:5]:
+                try:
+                    values.append(float(part))
+                except ValueError:
+                    values.append(np.nan)
+
+            class_ids.append(class_id)
+            coords.append(values[:4])
+            confs.append(conf)
+            counts[i] += 1
+
+    return (
+        flags,
+        counts,
+        np.array(class_ids, dtype=np.int32),
+        np.array(coords, dtype=np.float64).reshape(-1, 4),
+        np.array(confs, dtype=np.float64),
+    )
+
+def pack_labels(
+    label_dir: str,
+    output_dir: str,
+    recursive: bool = False,
+    jobs: int = 1,
+    chunk_size: int = 10000
+) -> Dict:
+    """
+    YOLO 라벨 디렉토리를 메모리 매핑 가능한 컬럼형 저장소로 변환
+
+    Args:
+        label_dir: 라벨 파일이 있는 디렉토리
+        output_dir: 저장소 디렉토리
+        recursive: 하위 디렉토리 포함 여부
+        jobs: 병렬 처리 프로세스 수
+        chunk_size: 프로세스에 한 번에 넘길 파일 수
+
+    Returns:
+        Dict: 저장소 메타 정보
+    """
+    path = Path(label_dir)
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    label_files = sorted(scan_files(path, "*.txt", recursive))
+
+    chunks = [label_files[i:i + chunk_size] for i in range(0, len(label_files), chunk_size)]
+    with metrics.stage('parse'):
+        if jobs <= 1:
+            results = (_parse_label_files(chunk) for chunk in chunks)
+            parts = list(tqdm(results, total=len(chunks), desc="Packing labels"))
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                results = executor.map(_parse_label_files, chunks)
+                parts = list(tqdm(results, total=len(chunks), desc="Packing labels"))
+
+    if parts:
+        flags, counts, class_ids, coords, confs = (np.concatenate(col) for col in zip(*parts))
+    else:
+        flags = np.zeros(0, dtype=np.uint8)
+        counts = np.zeros(0, dtype=np.int64)
+        class_ids = np.zeros(0, dtype=np.int32)
+        coords = np.zeros((0, 4), dtype=np.float64)
+        confs = np.zeros(0, dtype=np.float64)
+
+    offsets = np.zeros(len(label_files) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    stems = np.array(
+        [label_file.relative_to(path).with_suffix('').as_posix() for label_file in label_files],
+        dtype=np.str_,
+    )
+    has_conf = bool((~np.isnan(confs)).any())
+
+    with metrics.stage('write'):
+        np.save(output_path / "stems.npy", stems)
+        np.save(output_path / "flags.npy", flags)
+        np.save(output_path / "offsets.npy", offsets)
+        np.save(output_path / "class_id.npy", class_ids)
+        for i, name in enumerate(COLUMNS[1:]):
+            np.save(output_path / f"{name}.npy", np.ascontiguousarray(coords[:, i]))
+        conf_file = output_path / "conf.npy"
+        if has_conf:
+            np.save(conf_file, confs)
+        elif conf_file.exists():
+            conf_file.unlink()
+    metrics.count(files=len(label_files), errors=int((flags == FLAG_ERROR).sum()))
+
+    meta = {
+        "format": STORE_FORMAT,
+        "version": STORE_VERSION,
+        "source_dir": str(path.resolve()),
+        "recursive": recursive,
+        "num_files": len(label_files),
+        "num_objects": int(offsets[-1]),
+        "has_conf": has_conf,
+    }
+    with open(output_path / META_FILE, 'w') as f:
+        json.dump(meta, f, indent=2)
+
+    return meta
+
+def load_label_store(store_dir: str, mmap_mode: Optional[str] = 'r') -> Dict:
+    """
+    라벨 저장소를 불러옴
+
+    Args:
+        store_dir: 저장소 디렉토리
+        mmap_mode: np.load의 mmap_mode ('r', 'r+', None)
+
+    Returns:
+        Dict: "meta"와 각 배열 ("stems", "flags", "offsets", "class_id", "x", "y", "w", "h", "conf")
+    """
+    path = Path(store_dir)
+    if not is_label_store(store_dir):
+        raise ValueError(f"라벨 저장소가 아닙니다: {store_dir}")
+
+    with open(path / META_FILE, 'r') as f:
+        store = {"meta": json.load(f)}
+
+    for name in ("stems", "flags", "offsets") + COLUMNS:
+        store[name] = np.load(path / f"{name}.npy", mmap_mode=mmap_mode)
+    conf_file = path / "conf.npy"
+    store["conf"] = np.load(conf_file, mmap_mode=mmap_mode) if conf_file.exists() else None
+    return store
+
+def store_file_index(store: Dict) -> Dict[str, int]:
+    """저장소의 stem -> 파일 인덱스 딕셔너리 생성"""
+    return {str(stem): i for i, stem in enumerate(store["stems"])}
+
+def store_file_rows(store: Dict, file_idx: int) -> np.ndarray:
+    """파일 하나의 객체들을 (N, 5) 배열 [class_id, x, y, w, h]로 반환"""
+    start, end = store["offsets"][file_idx], store["offsets"][file_idx + 1]
+    return np.stack([store[name][start:end].astype(np.float64) for name in COLUMNS], axis=1)
+
+def analyze_label_store(store_dir: str) -> Tuple[Dict, Dict]:
+    """
+    라벨 저장소를 벡터 연산으로 분석
+
+    analyze_txt_labels와 같은 형식의 결과를 반환하며, 원본 디렉토리를
+    분석한 결과와 동일합니다 (confidence가 있는 6개 값 라인은 제외).
+
+    Returns:
+        Tuple[Dict, Dict]: (기본 통계, 클래스별 통계)
+    """
+    store = load_label_store(store_dir)
+    flags = np.asarray(store["flags"])
+    offsets = np.asarray(store["offsets"])
+    class_ids = np.asarray(store["class_id"])
+    num_files = len(flags)
+
+    # 객체별 파일 인덱스, analyze_txt_labels는 5개 값 라인만 객체로 셈
+    file_idx = np.repeat(np.arange(num_files), np.diff(offsets))
+    if store["conf"] is not None:
+        valid = np.isnan(np.asarray(store["conf"]))
+        file_idx = file_idx[valid]
+        class_ids = class_ids[valid]
+
+    objects_per_file = np.bincount(file_idx, minlength=num_files)
+    source_dir = Path(store["meta"]["source_dir"])
+
+    stats = {
+        "total_files": num_files,
+        "empty_files": int((flags == FLAG_EMPTY).sum()),
+        "no_object_files": int(((flags == FLAG_OK) & (objects_per_file == 0)).sum()),
+        "total_objects": int(len(class_ids)),
+        "error_files": [
+            str(source_dir / f"{store['stems'][i]}.txt") for i in np.flatnonzero(flags == FLAG_ERROR)
+        ],
+    }
+
+    class_stats = {}
+    if len(class_ids):
+        # 처음 등장한 순서대로 클래스 정렬 (직렬 분석과 동일한 순서)
+        classes, first_idx, counts = np.unique(class_ids, return_index=True, return_counts=True)
+        class_min = int(classes[0])
+        span = int(classes[-1]) - class_min + 1
+        pair_keys = np.unique(file_idx.astype(np.int64) * span + (class_ids - class_min))
+        files_per_class = np.bincount(pair_keys % span, minlength=span)
+
+        for k in np.argsort(first_idx, kind='stable'):
+            class_id = int(classes[k])
+            class_stats[class_id] = {
+                "count": int(counts[k]),
+                "files": int(files_per_class[class_id - class_min]),
+            }
+
+    return stats, class_stats
+
+def remap_store_classes(store_dir: str, class_mapping: Dict[int, int]) -> int:
+    """
+    저장소의 class_id 컬럼을 제자리에서 변경
+
+    Returns:
+        int: 변경된 객체 수
+    """
+    store = load_label_store(store_dir, mmap_mode='r+')
+    class_ids = store["class_id"]
+    original = np.array(class_ids)
+    changed = 0
+    for old_id, new_id in class_mapping.items():
+        mask = original == old_id
+        class_ids[mask] = new_id
+        changed += int(mask.sum())
+    class_ids.flush()
+    return changed
+
+def drop_store_confidence(store_dir: str, backup: bool = True) -> int:
+    """
+    저장소의 confidence 컬럼 제거
+
+    Returns:
+        int: confidence 값이 있던 파일 수
+    """
+    path = Path(store_dir)
+    store = load_label_store(store_dir)
+    if store["conf"] is None:
+        return 0
+
+    has_conf = ~np.isnan(np.asarray(store["conf"]))
+    file_idx = np.repeat(np.arange(len(store["flags"])), np.diff(np.asarray(store["offsets"])))
+    modified_files = len(np.unique(file_idx[has_conf]))
+    del store
+
+    conf_file = path / "conf.npy"
+    if backup:
+        os.replace(conf_file, path / "conf.npy.bak")
+    else:
+        conf_file.unlink()
+
+    with open(path / META_FILE, 'r') as f:
+        meta = json.load(f)
+    meta["has_conf"] = False
+    with open(path / META_FILE, 'w') as f:
+        json.dump(meta, f, indent=2)
+
+    return modified_files
+
+@click.command()
+@click.argument('label_dir')
+@click.argument('output_dir')
+@click.option('--recursive', '-r', is_flag=True, help='하위 디렉토리 포함')
+@click.option('--jobs', '-j', default=1, help='병렬 처리 프로세스 수')
+def pack(label_dir, output_dir, recursive, jobs):
+    """YOLO 라벨 디렉토리를 컬럼형 저장소로 변환합니다."""
+    meta = pack_labels(label_dir, output_dir, recursive, jobs)
+    click.echo(f"파일 수: {meta['num_files']}, 객체 수: {meta['num_objects']}")
+    click.echo(f"저장소: {output_dir}")
\ No newline at end of file
@@ -0,0 +1,240 @@
+import os
+import json
+import time
+import tempfile
+import click
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from tqdm import tqdm
+from .. import metrics
+from .label_store import is_label_store
+from ..file_management.scanner import scan_files
+
+# 변환 단계 이름 (지정한 순서대로 적용)
+TRANSFORM_STAGES = ['drop-conf', 'min-conf', 'remap', 'drop-class', 'clamp']
+
+Stage = Tuple[str, Any]
+
+def parse_stage(spec: str) -> Stage:
+    """
+    "이름[=값]" 형식의 변환 단계 지정을 (이름, 인자)로 변환
+
+    - drop-conf: confidence 값 제거
+    - min-conf=0.25: confidence가 값보다 작은 객체 제거 (confidence가 없는 객체는 유지)
+    - remap=0:1,2:3 또는 remap=mapping.json: 클래스 ID 변경
+    - drop-class=3,5: 해당 클래스 객체 제거
+    - clamp: 박스를 이미지 범위 [0, 1]로 자르고, 넓이가 0이 된 박스 제거
+    """
+    name, _, value = spec.partition('=')
+    name = name.strip()
+    value = value.strip()
+    if name not in TRANSFORM_STAGES:
+        raise ValueError(f"지원하지 않는 변환 단계: {name} (가능한 값: {', '.join(TRANSFORM_STAGES)})")
+    if name in ('drop-conf', 'clamp'):
+        return name, None
+    if not value:
+        raise ValueError(f"{name} 단계에는 값이 필요합니다 (예: {name}=...)")
+    if name == 'min-conf':
+        return name, float(value)
+    if name == 'drop-class':
+        return name, {int(v) for v in value.split(',') if v.strip()}
+    # remap
+    if value.endswith('.json'):
+        with open(value, 'r') as f:
+            mapping = json.load(f)
+    else:
+        mapping = dict(item.split(':') for item in value.split(','))
+    return name, {int(k): int(v) for k, v in mapping.items()}
+
+def _clamp_box(parts: List[str]) -> Optional[List[str]]:
+    """박스를 [0, 1] 범위로 자름 (바뀌지 않으면 parts 그대로, 넓이가 0이면 None)"""
+    x, y, w, h = (float(v) for v in parts[1:5])
+    x1, y1 = max(0.0, x - w / 2), max(0.0, y - h / 2)
+    x2, y2 = min(1.0, x + w / 2), min(1.0, y + h / 2)
+    if x2 <= x1 or y2 <= y1:
+        return None
+    if (x1, y1, x2, y2) == (x - w / 2, y - h / 2, x + w / 2, y + h / 2):
+        return parts
+    box = [(x1 + x2) / 2, (y1 + y2) / 2, x2 - x1, y2 - y1]
+    return [parts[0]] + [f"{v:.6f}" for v in box] + parts[5:]
+
+def _apply_stages(rows: List[List], stages: Sequence[Stage]) -> List[List]:
+    """
+    한 파일의 객체 목록에 변환 단계를 순서대로 적용
+
+    각 객체는 [클래스 ID, 원본 줄, 값 목록]이며, 값을 바꾼 객체는 원본 줄을 None으로 두고
+    값 목록으로 다시 씁니다. 바뀌지 않은 객체는 원본 줄을 그대로 유지합니다.
+    """
+    for name, arg in stages:
+        if not rows:
+            break
+        if name == 'remap':
+            for row in rows:
+                if row[0] in arg:
+                    row[0] = arg[row[0]]
+                    parts = row[2] or row[1].split()
+                    parts[0] = str(row[0])
+                    row[1], row[2] = None, parts
+        elif name == 'drop-class':
+            rows = [row for row in rows if row[0] not in arg]
+        else:
+            kept = []
+            for row in rows:
+                parts = row[2] or row[1].split()
+                if name == 'drop-conf':
+                    if len(parts) == 6:
+                        row[1], row[2] = None, parts[:5]
+                elif name == 'min-conf':
+                    if len(parts) == 6 and float(parts[5]) < arg:
+                        continue
+                elif name == 'clamp' and len(parts) >= 5:
+                    clamped = _clamp_box(parts)
+                    if clamped is None:
+                        continue
+                    if clamped is not parts:
+                        row[1], row[2] = None, clamped
+                kept.append(row)
+            rows = kept
+    return rows
+
+def _atomic_write(file: Path, content: str) -> None:
+    """같은 디렉토리의 임시 파일에 쓴 뒤 교체 (중간에 실패해도 원본이 깨지지 않음)"""
+    mode = os.stat(file).st_mode
+    fd, tmp_file = tempfile.mkstemp(dir=file.parent, prefix=f".{file.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+        os.chmod(tmp_file, mode)
+        os.replace(tmp_file, file)
+    except BaseException:
+        os.unlink(tmp_file)
+        raise
+
+def _transform_label_file(label_file: Path, stages: Sequence[Stage], dry_run: bool = False) -> Optional[bool]:
+    """
+    라벨 파일 하나에 모든 변환 단계를 한 번의 읽기/파싱으로 적용
+
+    변환 후 내용이 같으면 파일을 쓰지 않습니다.
+
+    Returns:
+        Optional[bool]: 변경 여부 (True: 변경됨, False: 건너뜀, None: 오류)
+    """
+    try:
+        with open(label_file, 'r') as f:
+            content = f.read()
+
+        rows = []
+        for line in content.splitlines(keepends=True):
+            parts = line.split(None, 1)
+            if parts:  # 빈 줄 건너뛰기
+                rows.append([int(float(parts[0])), line, None])
+
+        # 빠른 경로: 클래스 ID만 보는 단계들로 이루어졌고 해당 클래스가 없으면 파일을 다시 만들지 않음
+        if all(name in ('remap', 'drop-class') for name, _ in stages):
+            if not any(row[0] in arg for name, arg in stages for row in rows):
+                return False
+
+        rows = _apply_stages(rows, stages)
+        modified = ''.join(line if line is not None else ' '.join(parts) + '\n' for _, line, parts in rows)
+        if modified == content:
+            return False
+        if not dry_run:
+            _atomic_write(label_file, modified)
+        return True
+    except Exception as e:
+        print(f"Error processing {label_file}: {e}")
+        return None
+
+def _transform_label_chunk(label_files: List[Path], stages: Sequence[Stage], dry_run: bool = False) -> List[Optional[bool]]:
+    """라벨 파일 묶음(chunk)에 변환 적용"""
+    return [_transform_label_file(label_file, stages, dry_run) for label_file in label_files]
+
+def transform_labels(
+    label_dir: str,
+    stages: Sequence[Stage],
+    recursive: bool = False,
+    jobs: int = 8,
+    dry_run: bool = False,
+    chunk_size: Optional[int] = None
+) -> Dict:
+    """
+    YOLO 라벨에 여러 변환 단계를 파일당 한 번의 읽기와 최대 한 번의 쓰기로 적용
+
+    내용이 실제로 바뀌는 파일만 임시 파일에 쓴 뒤 교체합니다.
+
+    Args:
+        label_dir: 라벨 파일이 있는 디렉토리
+        stages: (단계 이름, 인자) 목록 (parse_stage 참고), 순서대로 적용
+        recursive: 하위 디렉토리 포함 여부
+        jobs: 병렬 처리 프로세스 수 (1이면 직렬 처리)
+        dry_run: True이면 파일을 쓰지 않고 변경될 파일 수만 계산
+        chunk_size: 프로세스에 한 번에 넘길 파일 수 (None이면 자동)
+
+    Returns:
+        Dict: {"total_files", "modified_files", "skipped_files", "error_files", "elapsed"}
+    """
+    if is_label_store(label_dir):
+        raise ValueError("라벨 저장소는 지원하지 않습니다. 원본 라벨 디렉토리에 적용한 뒤 다시 pack 하세요.")
+
+    start_time = time.perf_counter()
+    path = Path(label_dir)
+
+    label_files = list(scan_files(path, "*.txt", recursive))
+
+    desc = "Checking labels" if dry_run else "Transforming labels"
+    # 읽기, 변환, 쓰기가 작업 프로세스 안에서 파일마다 이어지므로 하나의 단계로 기록
+    with metrics.stage('compute'):
+        if jobs <= 1:
+            results = [_transform_label_file(f, stages, dry_run) for f in tqdm(label_files, desc=desc)]
+        else:
+            if chunk_size is None:
+                chunk_size = max(1, min(10000, len(label_files) // (jobs * 8)))
+            chunks = [label_files[i:i + chunk_size] for i in range(0, len(label_files), chunk_size)]
+            results = []
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                with tqdm(total=len(label_files), desc=desc) as pbar:
+                    for chunk_results in executor.map(_transform_label_chunk, chunks, repeat(stages), repeat(dry_run)):
+                        results.extend(chunk_results)
+                        pbar.update(len(chunk_results))
+
+    stats = {
+        "total_files": len(label_files),
+        "modified_files": sum(1 for result in results if result),
+        "skipped_files": sum(1 for result in results if result is False),
+        "error_files": [str(f) for f, result in zip(label_files, results) if result is None],
+        "elapsed": time.perf_counter() - start_time
+    }
+    metrics.count(files=stats["total_files"], written=stats["modified_files"], errors=len(stats["error_files"]))
+    return stats
+
+def echo_rewrite_stats(stats: Dict, dry_run: bool = False) -> None:
+    """transform_labels / modify_yolo_labels 결과 출력"""
+    elapsed = stats['elapsed']
+    click.echo("\n=== 처리 결과 ===")
+    click.echo(f"검사한 파일 수: {stats['total_files']}")
+    click.echo(f"{'변경될' if dry_run else '변경된'} 파일 수: {stats['modified_files']}")
+    click.echo(f"건너뛴 파일 수: {stats['skipped_files']}")
+    click.echo(f"처리 속도: {stats['total_files'] / elapsed if elapsed > 0 else 0:.0f} 파일/초 ({elapsed:.1f}초)")
+    if stats['error_files']:
+        click.echo(f"처리 중 오류가 발생한 파일 수: {len(stats['error_files'])}")
+
+@click.command()
+@click.argument('label_dir')
+@click.option('--stage', '-s', 'stages', multiple=True, required=True,
+              help='변환 단계 (지정한 순서대로 적용): drop-conf, min-conf=0.25, remap=0:1,2:3 또는 remap=mapping.json, drop-class=3,5, clamp')
+@click.option('--recursive', '-r', is_flag=True, help='하위 디렉토리 포함')
+@click.option('--jobs', '-j', default=8, help='병렬 처리 프로세스 수')
+@click.option('--dry-run', is_flag=True, help='파일을 쓰지 않고 변경될 파일 수만 출력')
+def transform(label_dir, stages, recursive, jobs, dry_run):
+    """YOLO 라벨에 여러 변환을 한 번에 적용합니다.
+
+    예: kwtools label transform labels/ -s drop-conf -s remap=mapping.json -s drop-class=3 -s clamp
+    """
+    try:
+        parsed = [parse_stage(spec) for spec in stages]
+    except (ValueError, OSError) as e:
+        raise click.BadParameter(str(e), param_hint='--stage')
+    stats = transform_labels(label_dir, parsed, recursive, jobs, dry_run)
+    echo_rewrite_stats(stats, dry_run)
\ No newline at end of file
@@ -0,0 +1,170 @@
+import os
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from tqdm import tqdm
+from .. import metrics
+from .label_store import is_label_store
+from ..file_management.scanner import DEFAULT_SCAN_THREADS, scan_entries
+from ..file_management.transfer import transfer_files
+
+# 이미지로 보는 확장자 (대소문자 구분 없음)
+IMAGE_EXTENSIONS = frozenset({'jpg', 'jpeg', 'png', 'bmp', 'tif', 'tiff', 'webp'})
+
+# 라벨 디렉토리에 있어도 라벨로 보지 않는 파일 (클래스 이름 목록)
+NON_LABEL_FILES = frozenset({'classes.txt'})
+
+# 짝이 없는 파일을 정리하는 방식
+ORPHAN_ACTIONS = ('move', 'delete')
+
+def _index_tree(
+    root: str,
+    recursive: bool,
+    images: Optional[Dict[str, str]],
+    labels: Optional[Dict[str, str]],
+    conflicts: Dict[str, List[str]],
+    jobs: int
+) -> None:
+    """
+    디렉토리를 한 번 탐색하여 {키: 경로} 색인에 이미지와 라벨을 추가
+
+    키는 root 기준 상대 경로에서 확장자를 뺀 것입니다 (하위 디렉토리를 포함하지 않으면 파일 이름의 stem).
+    같은 키의 이미지가 여러 개이면 (a.jpg, a.png) 처음 것만 색인하고 conflicts에 모두 기록합니다.
+    """
+    root = os.fspath(root)
+    prefix = len(os.path.join(root, ''))
+    # 파일 수백만 개를 도는 루프이므로 파일마다 하는 일을 최소화
+    for entry in scan_entries(root, None, recursive, jobs):
+        name = entry.name
+        stem, dot, ext = name.rpartition('.')
+        ext = ext.lower()
+        if ext in IMAGE_EXTENSIONS:
+            index = images
+        elif ext == 'txt' and name not in NON_LABEL_FILES:
+            index = labels
+        else:
+            continue
+        if index is None or not dot:
+            continue
+        path = entry.path
+        key = path[prefix:-len(name)] + stem if recursive else stem
+        if key in index:
+            if key not in conflicts:
+                conflicts[key] = [index[key]]
+            conflicts[key].append(path)
+            continue
+        index[key] = path
+
+def check_pairs(
+    image_dir: str,
+    label_dir: Optional[str] = None,
+    recursive: bool = False,
+    jobs: int = DEFAULT_SCAN_THREADS
+) -> Dict:
+    """
+    이미지와 YOLO 라벨이 같은 이름으로 짝지어져 있는지 검사
+
+    각 트리를 한 번씩 탐색하여 (같은 디렉토리이면 한 번) 확장자를 뺀 상대 경로를 키로 하는
+    해시 색인을 만든 뒤 키 집합의 차집합으로 짝이 없는 파일을 찾습니다 (파일 수에 비례).
+
+    Args:
+        image_dir: 이미지 디렉토리
+        label_dir: 라벨 디렉토리 (없으면 image_dir)
+        recursive: 하위 디렉토리 포함 여부 (하위 경로까지 같아야 짝으로 봄)
+        jobs: 디렉토리를 동시에 읽는 스레드 수
+
+    Returns:
+        Dict: {"images", "labels", "paired": 키 개수, "orphan_images", "orphan_labels": 경로 목록 (정렬),
+               "conflicts": {키: 같은 키의 파일 경로 목록}, "elapsed"}
+            짝이 없는 키의 파일은 conflicts에 있어도 모두 orphan 목록에 포함합니다.
+    """
+    if label_dir is None:
+        label_dir = image_dir
+    if is_label_store(label_dir):
+        raise ValueError("라벨 저장소는 지원하지 않습니다. 원본 라벨 디렉토리를 지정하세요.")
+
+    start_time = time.perf_counter()
+    images = {}
+    labels = {}
+    conflicts = {}
+    if os.path.realpath(image_dir) == os.path.realpath(label_dir):
+        _index_tree(image_dir, recursive, images, labels, conflicts, jobs)
+    else:
+        _index_tree(image_dir, recursive, images, None, conflicts, jobs)
+        _index_tree(label_dir, recursive, None, labels, conflicts, jobs)
+
+    with metrics.stage('compute'):
+        orphan_images = [images[key] for key in images.keys() - labels.keys()]
+        orphan_labels = [labels[key] for key in labels.keys() - images.keys()]
+        # 짝이 없는 키의 나머지 파일도 짝이 없음 (색인에는 처음 것만 있음)
+        for key, paths in conflicts.items():
+            if images.get(key) == paths[0] and key not in labels:
+                orphan_images.extend(paths[1:])
+            elif labels.get(key) == paths[0] and key not in images:
+                orphan_labels.extend(paths[1:])
+        orphan_images.sort()
+        orphan_labels.sort()
+
+    stats = {
+        "images": len(images),
+        "labels": len(labels),
+        "paired": len(images.keys() & labels.keys()),
+        "orphan_images": orphan_images,
+        "orphan_labels": orphan_labels,
+        "conflicts": conflicts,
+        "elapsed": time.perf_counter() - start_time,
+    }
+    metrics.count(files=len(images) + len(labels))
+    return stats
+
+def _delete_files(files: List[str], jobs: int) -> Dict:
+    """파일들을 스레드 풀에서 동시에 삭제"""
+    stats = {"files": 0, "error_files": []}
+
+    def delete(file: str) -> Optional[str]:
+        try:
+            os.unlink(file)
+            return None
+        except OSError as e:
+            print(f"Error processing {file}: {e}")
+            return file
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor, metrics.stage('write'):
+        for failed in tqdm(executor.map(delete, files), total=len(files), desc="Deleting files"):
+            stats["files"] += 1
+            if failed is not None:
+                stats["error_files"].append(failed)
+    metrics.count(errors=len(stats["error_files"]))
+    return stats
+
+def clean_orphans(
+    files: List[str],
+    root: str,
+    action: str,
+    target_dir: Optional[str] = None,
+    jobs: int = DEFAULT_SCAN_THREADS
+) -> Dict:
+    """
+    짝이 없는 파일들을 한 번에 옮기거나 삭제
+
+    Args:
+        files: check_pairs의 orphan_images 또는 orphan_labels
+        root: files를 찾은 디렉토리 (옮길 때 이 기준의 상대 경로를 유지)
+        action: 'move' (target_dir로 이동) 또는 'delete'
+        target_dir: 옮길 디렉토리
+
+    Returns:
+        Dict: {"files", "error_files", ...} (move는 transfer_files 결과)
+    """
+    if action not in ORPHAN_ACTIONS:
+        raise ValueError(f"지원하지 않는 방식: {action}")
+    if action == 'delete':
+        return _delete_files(files, jobs)
+    if target_dir is None:
+        raise ValueError("옮길 디렉토리가 필요합니다.")
+
+    prefix = len(os.path.join(os.fspath(root), ''))
+    target = Path(target_dir)
+    pairs: List[Tuple[str, Path]] = [(file, target / file[prefix:]) for file in files]
+    return transfer_files(pairs, 'move', jobs, desc="Moving orphans")
\ No newline at end of file
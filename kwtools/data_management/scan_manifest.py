@@ -0,0 +1,112 @@
+import os
+import json
+import sqlite3
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# 데이터셋 디렉토리에 두는 기본 매니페스트 파일 이름
+DEFAULT_MANIFEST_NAME = ".kwtools_manifest.sqlite"
+
+def default_manifest_path(directory: str) -> str:
+    """데이터셋 디렉토리의 기본 매니페스트 경로"""
+    return str(Path(directory) / DEFAULT_MANIFEST_NAME)
+
+def _connect(manifest_path: str) -> sqlite3.Connection:
+    """매니페스트 DB 연결 (없으면 생성)"""
+    conn = sqlite3.connect(manifest_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS entries ("
+        " scope TEXT NOT NULL,"
+        " path TEXT NOT NULL,"
+        " size INTEGER NOT NULL,"
+        " mtime_ns INTEGER NOT NULL,"
+        " result TEXT NOT NULL,"
+        " PRIMARY KEY (scope, path))"
+    )
+    return conn
+
+def incremental_scan(
+    manifest_path: str,
+    scope: str,
+    root: str,
+    files: Sequence[Path],
+    analyze_files: Callable[[List[Path]], List],
+    stat_results: Optional[Sequence[os.stat_result]] = None
+) -> Tuple[List, Dict]:
+    """
+    매니페스트를 이용해 변경된 파일만 분석
+
+    (경로, 크기, mtime_ns)가 같은 파일은 저장된 결과를 재사용하고, 새 파일이나
+    수정된 파일만 analyze_files로 분석합니다. 더 이상 없는 파일은 매니페스트에서
+    제거합니다.
+
+    Args:
+        manifest_path: 매니페스트(SQLite) 파일 경로
+        scope: 결과 종류 구분자 (예: "labels", "images:recursive")
+        root: 경로를 상대 경로로 저장할 기준 디렉토리
+        files: 분석할 파일 목록
+        analyze_files: 파일 목록을 받아 JSON으로 저장 가능한 파일별 결과 목록을 반환하는 함수
+        stat_results: files와 같은 순서의 os.stat 결과 (디렉토리 탐색 중에 이미 조회했으면 재사용)
+
+    Returns:
+        Tuple[List, Dict]: (files와 같은 순서의 파일별 결과, {"reused", "updated", "removed"})
+    """
+    root_path = Path(root)
+    keys = [file.relative_to(root_path).as_posix() for file in files]
+    stat_list = []
+    if stat_results is not None:
+        stat_list = [(st.st_size, st.st_mtime_ns) for st in stat_results]
+    else:
+        for file in files:
+            try:
+                st = os.stat(file)
+                stat_list.append((st.st_size, st.st_mtime_ns))
+            except OSError:
+                stat_list.append((-1, -1))
+
+    conn = _connect(manifest_path)
+    try:
+        cached = {
+            path: (size, mtime_ns, result)
+            for path, size, mtime_ns, result in conn.execute(
+                "SELECT path, size, mtime_ns, result FROM entries WHERE scope = ?", (scope,)
+            )
+        }
+
+        results = [None] * len(files)
+        stale = []
+        for i, (key, (size, mtime_ns)) in enumerate(zip(keys, stat_list)):
+            entry = cached.get(key)
+            if entry is not None and entry[0] == size and entry[1] == mtime_ns and size >= 0:
+                results[i] = json.loads(entry[2])
+            else:
+                stale.append(i)
+
+        fresh = analyze_files([files[i] for i in stale]) if stale else []
+        for i, result in zip(stale, fresh):
+            results[i] = result
+
+        removed = set(cached) - set(keys)
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO entries (scope, path, size, mtime_ns, result) VALUES (?, ?, ?, ?, ?)",
+                (
+                    (scope, keys[i], stat_list[i][0], stat_list[i][1], json.dumps(result))
+                    for i, result in zip(stale, fresh)
+                ),
+            )
+            conn.executemany(
+                "DELETE FROM entries WHERE scope = ? AND path = ?",
+                ((scope, path) for path in removed),
+            )
+    finally:
+        conn.close()
+
+    summary = {
+        "reused": len(files) - len(stale),
+        "updated": len(stale),
+        "removed": len(removed),
+    }
+    return results, summary
\ No newline at end of file
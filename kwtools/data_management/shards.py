@@ -0,0 +1,330 @@
+import io
+import os
+import json
+import mmap
+import tarfile
+import numpy as np
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from tqdm import tqdm
+from .. import metrics
+from .label_store import is_label_store, load_label_store
+from .pair_check import IMAGE_EXTENSIONS
+from ..file_management.scanner import scan_entries
+
+# 샤드 디렉토리 구성 (webdataset 호환)
+#   shard-000000.tar ... : 샘플마다 {key}.{jpg,png,...}와 {key}.txt (라벨이 있을 때) 순서로 저장한 tar
+#   index.npy            : 샘플별 (shard, image_offset, image_size, label_offset, label_size) 구조체 배열
+#                          offset은 tar 안의 데이터 시작 위치, 라벨이 없으면 label_size = -1
+#   keys.txt             : 샘플 키 (index.npy와 같은 순서, 줄 단위)
+#   meta.json            : 형식 정보와 샤드 파일 목록
+SHARDS_FORMAT = "kwtools-shards"
+SHARDS_VERSION = 1
+META_FILE = "meta.json"
+INDEX_DTYPE = np.dtype([
+    ("shard", "<u4"),
+    ("image_offset", "<u8"),
+    ("image_size", "<u8"),
+    ("label_offset", "<u8"),
+    ("label_size", "<i8"),
+])
+
+# 샤드 하나의 기본 최대 크기
+DEFAULT_SHARD_SIZE = 512 * 1024 * 1024
+
+# 크기를 계획할 때 샘플마다 더하는 tar 헤더와 라벨 크기 추정치
+_SAMPLE_OVERHEAD = 2048
+
+Sample = Tuple[str, str, Optional[str]]  # (키, 이미지 경로, 라벨 경로)
+
+def is_shard_dir(path: str) -> bool:
+    """경로가 pack_shards로 만든 샤드 디렉토리인지 확인"""
+    meta_file = Path(path) / META_FILE
+    if not meta_file.is_file():
+        return False
+    try:
+        with open(meta_file, 'r') as f:
+            return json.load(f).get("format") == SHARDS_FORMAT
+    except (OSError, ValueError):
+        return False
+
+def _sample_key(relative_stem: str, seen: Dict[str, int]) -> str:
+    """
+    webdataset 키 생성
+
+    webdataset은 파일 이름의 첫 '.' 앞까지를 키로 보므로 stem의 '.'은 '_'로 바꾸고,
+    같은 키가 이미 있으면 (a.jpg, a.png) 뒤에 번호를 붙입니다.
+    """
+    head, _, name = relative_stem.rpartition('/')
+    key = (head + '/' if head else '') + name.replace('.', '_').replace('\n', '_')
+    if key in seen:
+        seen[key] += 1
+        key = f"{key}_{seen[key]}"
+        seen.setdefault(key, 0)
+    else:
+        seen[key] = 0
+    return key
+
+def _add_member(tar: tarfile.TarFile, name: str, path: str, data: Optional[bytes] = None) -> Tuple[int, int]:
+    """파일(data가 있으면 미리 읽은 내용)을 tar에 추가하고 (데이터 시작 위치, 크기) 반환"""
+    with (io.BytesIO(data) if data is not None else open(path, 'rb')) as f:
+        info = tarfile.TarInfo(name)
+        if data is not None:
+            info.size = len(data)
+            info.mtime = int(os.path.getmtime(path))
+        else:
+            stat = os.fstat(f.fileno())
+            info.size = stat.st_size
+            info.mtime = int(stat.st_mtime)
+        info.mode = 0o644
+        tar.addfile(info, f)
+    # 데이터는 헤더 뒤에 오고 512바이트 단위로 채워짐
+    padded = -(-info.size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+    return tar.offset - padded, info.size
+
+def _write_shard(shard_file: str, samples: List[Sample]) -> Tuple[np.ndarray, List[str]]:
+    """
+    샘플들을 tar 샤드 하나로 기록 (작업 프로세스에서 실행)
+
+    임시 파일에 쓴 뒤 교체하므로 중간에 실패해도 불완전한 샤드가 남지 않습니다.
+    라벨은 먼저 읽어 두므로 이미지나 라벨을 읽을 수 없는 샘플은 샤드에 전혀 기록하지 않습니다.
+
+    Returns:
+        Tuple[np.ndarray, List[str]]: (샘플별 index 행 (shard 열은 0), 오류가 발생한 샘플의 이미지 목록)
+    """
+    rows = []
+    errors = []
+    tmp_file = f"{shard_file}.tmp"
+    try:
+        with tarfile.open(tmp_file, 'w', format=tarfile.USTAR_FORMAT) as tar:
+            for key, image_path, label_path in samples:
+                ext = Path(image_path).suffix.lower()
+                label = None
+                if label_path is not None:
+                    try:
+                        with open(label_path, 'rb') as f:
+                            label = f.read()
+                    except FileNotFoundError:
+                        pass  # 라벨이 없는 이미지
+                    except OSError as e:
+                        print(f"Error processing {label_path}: {e}")
+                        errors.append(image_path)
+                        continue
+                try:
+                    image_offset, image_size = _add_member(tar, key + ext, image_path)
+                except Exception as e:
+                    print(f"Error processing {image_path}: {e}")
+                    errors.append(image_path)
+                    continue
+                label_offset, label_size = 0, -1
+                if label is not None:
+                    label_offset, label_size = _add_member(tar, key + '.txt', label_path, label)
+                rows.append((0, image_offset, image_size, label_offset, label_size))
+        os.replace(tmp_file, shard_file)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.unlink(tmp_file)
+        raise
+    return np.array(rows, dtype=INDEX_DTYPE), errors
+
+def _plan_shards(sizes: Sequence[int], shard_size: int, max_samples: Optional[int]) -> List[Tuple[int, int]]:
+    """샘플을 순서대로 샤드에 나눔, 샤드별 (시작, 끝) 반환 (샘플 하나가 shard_size보다 커도 샤드 하나에 들어감)"""
+    plans = []
+    start = 0
+    total = 0
+    for i, size in enumerate(sizes):
+        size += _SAMPLE_OVERHEAD
+        if i > start and (total + size > shard_size or (max_samples and i - start >= max_samples)):
+            plans.append((start, i))
+            start, total = i, 0
+        total += size
+    if start < len(sizes):
+        plans.append((start, len(sizes)))
+    return plans
+
+def pack_shards(
+    image_files: Sequence[str],
+    output_dir: str,
+    label_dir: Optional[str] = None,
+    root: Optional[str] = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    max_samples: Optional[int] = None,
+    sizes: Optional[Sequence[int]] = None,
+    jobs: int = 8
+) -> Dict:
+    """
+    이미지와 YOLO 라벨을 정해진 크기의 tar 샤드들과 오프셋 색인으로 묶음
+
+    샤드는 webdataset 형식({key}.jpg, {key}.txt)이므로 webdataset으로도 읽을 수 있고,
+    색인을 쓰면 ShardReader로 압축을 풀지 않고 메모리 맵에서 바로 읽을 수 있습니다.
+    샤드 나누기는 미리 계획하고, 샤드마다 작업 프로세스에서 동시에 기록합니다.
+
+    Args:
+        image_files: 이미지 파일 목록 (이 순서대로 저장)
+        output_dir: 샤드 디렉토리
+        label_dir: YOLO 라벨 디렉토리 또는 라벨 저장소 (키와 같은 경로의 .txt를 함께 저장)
+        root: 키를 만들 기준 디렉토리 (있으면 상대 경로, 없으면 파일 이름의 stem이 키)
+        shard_size: 샤드 하나의 최대 바이트 수 (근삿값)
+        max_samples: 샤드 하나의 최대 샘플 수
+        sizes: 이미지 파일 크기 (없으면 조회)
+        jobs: 동시에 기록할 샤드 수
+
+    Returns:
+        Dict: {"samples", "labels", "shards", "bytes", "error_files"}
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    image_files = [os.fspath(file) for file in image_files]
+
+    label_path = None
+    if label_dir:
+        # 라벨 저장소는 원본 라벨 디렉토리의 파일을 저장
+        label_path = load_label_store(label_dir)["meta"]["source_dir"] if is_label_store(label_dir) else os.fspath(label_dir)
+
+    if sizes is None:
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor, metrics.stage('scan'):
+            sizes = list(executor.map(os.path.getsize, image_files))
+
+    prefix = len(os.path.join(os.fspath(root), '')) if root is not None else None
+    seen = {}
+    samples = []
+    for file in image_files:
+        stem = os.path.splitext(file[prefix:] if prefix is not None else os.path.basename(file))[0]
+        label_file = os.path.join(label_path, stem + '.txt') if label_path else None
+        samples.append((_sample_key(stem.replace(os.sep, '/'), seen), file, label_file))
+
+    plans = _plan_shards(sizes, shard_size, max_samples)
+    shard_names = [f"shard-{i:06d}.tar" for i in range(len(plans))]
+    shard_files = [str(output_path / name) for name in shard_names]
+    batches = [samples[start:end] for start, end in plans]
+
+    indices = []
+    keys = []
+    errors = []
+    with metrics.stage('write'):
+        with ProcessPoolExecutor(max_workers=max(1, jobs)) as executor:
+            results = executor.map(_write_shard, shard_files, batches)
+            for shard_id, (batch, (rows, failed)) in enumerate(
+                zip(batches, tqdm(results, total=len(batches), desc="Packing shards"))
+            ):
+                rows["shard"] = shard_id
+                indices.append(rows)
+                failed = set(failed)
+                keys.extend(key for key, image_path, _ in batch if image_path not in failed)
+                errors.extend(failed)
+
+    index = np.concatenate(indices) if indices else np.zeros(0, dtype=INDEX_DTYPE)
+    np.save(output_path / "index.npy", index)
+    with open(output_path / "keys.txt", 'w') as f:
+        f.writelines(f"{key}\n" for key in keys)
+    total_bytes = sum(os.path.getsize(file) for file in shard_files)
+    meta = {
+        "format": SHARDS_FORMAT,
+        "version": SHARDS_VERSION,
+        "shards": shard_names,
+        "num_samples": len(index),
+        "num_labels": int((index["label_size"] >= 0).sum()),
+        "shard_size": shard_size,
+    }
+    with open(output_path / META_FILE, 'w') as f:
+        json.dump(meta, f, indent=2)
+
+    metrics.count(files=len(index), bytes=total_bytes, errors=len(errors))
+    return {
+        "samples": meta["num_samples"],
+        "labels": meta["num_labels"],
+        "shards": len(shard_names),
+        "bytes": total_bytes,
+        "error_files": errors,
+    }
+
+def pack_dataset(
+    image_dir: str,
+    output_dir: str,
+    label_dir: Optional[str] = None,
+    recursive: bool = False,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    max_samples: Optional[int] = None,
+    jobs: int = 8
+) -> Dict:
+    """
+    이미지 디렉토리를 샤드로 묶음 (pack_shards 참고)
+
+    모든 이미지 확장자를 한 번의 탐색으로 찾고 (크기도 함께 조회), 경로 순으로 정렬하여 저장합니다.
+    라벨은 label_dir (없으면 image_dir)에서 같은 상대 경로의 .txt를 찾습니다 (check_pairs와 같은 기준).
+    """
+    entries = [
+        entry for entry in scan_entries(image_dir, None, recursive, stat=True)
+        if entry.name.rpartition('.')[2].lower() in IMAGE_EXTENSIONS
+    ]
+    entries.sort(key=lambda entry: entry.path)
+    return pack_shards(
+        [entry.path for entry in entries], output_dir, label_dir or image_dir, root=image_dir,
+        shard_size=shard_size, max_samples=max_samples, sizes=[entry.stat().st_size for entry in entries], jobs=jobs
+    )
+
+def parse_yolo_label(data: bytes) -> np.ndarray:
+    """YOLO 라벨 내용을 (N, 5) 배열 [class_id, x, y, w, h]로 변환 (confidence 등 추가 값은 무시)"""
+    rows = [parts[:5] for parts in (line.split() for line in data.splitlines()) if len(parts) >= 5]
+    return np.array(rows, dtype=np.float64).reshape(-1, 5)
+
+class ShardReader:
+    """
+    pack_shards로 만든 샤드를 메모리 맵으로 읽음
+
+    색인의 오프셋으로 샤드에서 바로 잘라 읽으므로 tar를 풀거나 헤더를 훑지 않습니다.
+    순서대로 읽으면 (for image, labels in reader) 샤드 하나씩 연속으로 읽게 됩니다.
+
+        with ShardReader("shards/train") as reader:
+            for image_bytes, labels in reader:
+                ...
+    """
+
+    def __init__(self, shard_dir: str):
+        if not is_shard_dir(shard_dir):
+            raise ValueError(f"샤드 디렉토리가 아닙니다: {shard_dir}")
+        self.path = Path(shard_dir)
+        with open(self.path / META_FILE, 'r') as f:
+            self.meta = json.load(f)
+        self.index = np.load(self.path / "index.npy", mmap_mode='r')
+        self._maps: Dict[int, mmap.mmap] = {}
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def _shard(self, shard_id: int) -> mmap.mmap:
+        shard = self._maps.get(shard_id)
+        if shard is None:
+            with open(self.path / self.meta["shards"][shard_id], 'rb') as f:
+                shard = self._maps[shard_id] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return shard
+
+    def __getitem__(self, i: int) -> Tuple[bytes, np.ndarray]:
+        """샘플 i의 (이미지 바이트, (N, 5) 라벨 배열), 라벨이 없으면 빈 배열"""
+        shard_id, image_offset, image_size, label_offset, label_size = self.index[i].tolist()
+        shard = self._shard(shard_id)
+        image = shard[image_offset:image_offset + image_size]
+        if label_size < 0:
+            return image, np.zeros((0, 5))
+        return image, parse_yolo_label(shard[label_offset:label_offset + label_size])
+
+    def __iter__(self) -> Iterator[Tuple[bytes, np.ndarray]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def keys(self) -> List[str]:
+        """샘플 키 목록 (색인과 같은 순서)"""
+        with open(self.path / "keys.txt", 'r') as f:
+            return f.read().splitlines()
+
+    def close(self) -> None:
+        for shard in self._maps.values():
+            shard.close()
+        self._maps.clear()
+
+    def __enter__(self) -> "ShardReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
\ No newline at end of file
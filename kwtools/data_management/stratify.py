@@ -0,0 +1,167 @@
+import numpy as np
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Sequence, Tuple
+from tqdm import tqdm
+from .label_store import is_label_store, load_label_store, store_file_index
+
+def _read_classes(label_file: Path) -> List[int]:
+    """라벨 파일에 등장하는 클래스 ID 목록 (없거나 읽을 수 없으면 빈 목록)"""
+    classes = set()
+    try:
+        with open(label_file, 'r') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) < 5:
+                    continue
+                try:
+                    classes.add(int(float(parts[0])))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return sorted(classes)
+
+def build_class_matrix(
+    image_files: Sequence[Path],
+    label_dir: str,
+    jobs: int = 8
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    이미지 x 클래스 희소 행렬(등장 여부)을 COO 형식으로 생성
+
+    label_dir이 라벨 저장소이면 파일을 읽지 않고 저장소 배열을 사용합니다.
+
+    Args:
+        image_files: 이미지 파일 목록
+        label_dir: YOLO 라벨 디렉토리 또는 라벨 저장소
+        jobs: 라벨 파일을 읽는 스레드 수
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (이미지 인덱스, 클래스 ID) 배열 (중복 없음)
+    """
+    if is_label_store(label_dir):
+        store = load_label_store(label_dir)
+        index = store_file_index(store)
+        offsets = np.asarray(store["offsets"])
+        file_idx = np.array([index.get(f.stem, -1) for f in image_files], dtype=np.int64)
+        has_label = np.flatnonzero(file_idx >= 0)
+        starts = offsets[file_idx[has_label]]
+        lengths = offsets[file_idx[has_label] + 1] - starts
+        rows = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths) + np.arange(lengths.sum())
+        img_idx = np.repeat(has_label, lengths)
+        cls_idx = np.asarray(store["class_id"])[rows].astype(np.int64)
+    else:
+        label_path = Path(label_dir)
+        label_files = [label_path / f"{f.stem}.txt" for f in image_files]
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            results = list(tqdm(executor.map(_read_classes, label_files), total=len(label_files), desc="Reading labels"))
+        lengths = np.array([len(classes) for classes in results], dtype=np.int64)
+        img_idx = np.repeat(np.arange(len(image_files)), lengths)
+        cls_idx = np.fromiter((c for classes in results for c in classes), dtype=np.int64, count=int(lengths.sum()))
+
+    if len(img_idx) == 0:
+        return img_idx.astype(np.int64), cls_idx.astype(np.int64)
+    # 같은 이미지에 같은 클래스가 여러 번 나와도 한 번만 셈
+    pairs = np.unique(np.stack([img_idx, cls_idx], axis=1), axis=0)
+    return pairs[:, 0], pairs[:, 1]
+
+def _allocate(count: int, weights: np.ndarray) -> np.ndarray:
+    """count개를 weights 비율로 나눔 (최대 나머지 방식, 동률은 앞쪽 우선)"""
+    weights = np.clip(weights, 0, None)
+    if weights.sum() <= 0:
+        weights = np.ones_like(weights)
+    exact = count * weights / weights.sum()
+    quotas = np.floor(exact).astype(np.int64)
+    remainder = count - quotas.sum()
+    if remainder > 0:
+        order = np.argsort(-(exact - quotas), kind='stable')
+        quotas[order[:remainder]] += 1
+    return quotas
+
+def iterative_stratification(
+    img_idx: np.ndarray,
+    cls_idx: np.ndarray,
+    num_images: int,
+    ratios: Sequence[float],
+    seed: int = 42
+) -> np.ndarray:
+    """
+    다중 라벨 데이터를 위한 반복 계층화 분할 (Sechidis et al., 2011의 일괄 처리 변형)
+
+    가장 드문 클래스부터 차례로, 그 클래스를 포함하면서 아직 배정되지 않은 이미지들을
+    각 분할의 남은 필요 개수에 비례하여 한 번에 배정합니다. 반복 횟수는 클래스 수와 같고
+    각 반복은 NumPy 배열 연산이므로 전체 비용은 (이미지, 클래스) 쌍 수에 비례합니다.
+
+    Args:
+        img_idx: (이미지 인덱스, 클래스) 쌍의 이미지 인덱스
+        cls_idx: (이미지 인덱스, 클래스) 쌍의 클래스 ID
+        num_images: 전체 이미지 수 (라벨이 없는 이미지 포함)
+        ratios: 분할 비율
+        seed: 랜덤 시드 (같은 입력과 시드면 항상 같은 결과)
+
+    Returns:
+        np.ndarray: 이미지별 분할 번호 (num_images,)
+    """
+    rng = np.random.default_rng(seed)
+    ratios = np.asarray(ratios, dtype=np.float64)
+    ratios = ratios / ratios.sum()
+    num_splits = len(ratios)
+
+    img_idx = np.asarray(img_idx, dtype=np.int64)
+    classes, cls_pos = np.unique(np.asarray(cls_idx, dtype=np.int64), return_inverse=True)
+    cls_pos = cls_pos.ravel()
+    num_classes = len(classes)
+
+    # 이미지 기준 정렬 (배정한 이미지의 클래스 조회용)
+    by_img = np.argsort(img_idx, kind='stable')
+    img_ptr = np.searchsorted(img_idx[by_img], np.arange(num_images + 1))
+    img_classes = cls_pos[by_img]
+
+    # 클래스 기준 정렬 (클래스를 포함하는 이미지 조회용)
+    by_cls = np.argsort(cls_pos, kind='stable')
+    cls_ptr = np.searchsorted(cls_pos[by_cls], np.arange(num_classes + 1))
+    cls_images = img_idx[by_cls]
+
+    class_totals = np.diff(cls_ptr)
+    desired = ratios[:, None] * class_totals[None, :]  # (분할, 클래스) 남은 필요 개수
+    desired_total = ratios * num_images
+    remaining = class_totals.astype(np.int64).copy()
+    assignment = np.full(num_images, -1, dtype=np.int64)
+
+    def assign(images: np.ndarray, split_ids: np.ndarray) -> None:
+        assignment[images] = split_ids
+        np.subtract.at(desired_total, split_ids, 1)
+        # 배정한 이미지가 포함하는 모든 클래스의 필요 개수와 남은 개수 갱신
+        starts = img_ptr[images]
+        lengths = img_ptr[images + 1] - starts
+        rows = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths) + np.arange(lengths.sum())
+        pair_classes = img_classes[rows]
+        np.subtract.at(desired, (np.repeat(split_ids, lengths), pair_classes), 1)
+        np.subtract.at(remaining, pair_classes, 1)
+
+    done = np.zeros(num_classes, dtype=bool)
+    for _ in range(num_classes):
+        # 남은 이미지가 가장 적은 클래스 선택 (동률이면 클래스 ID 순)
+        candidates = np.where(done | (remaining <= 0), np.iinfo(np.int64).max, remaining)
+        label = int(np.argmin(candidates))
+        if candidates[label] == np.iinfo(np.int64).max:
+            break
+        done[label] = True
+
+        images = cls_images[cls_ptr[label]:cls_ptr[label + 1]]
+        images = images[assignment[images] < 0]
+        if len(images) == 0:
+            continue
+        images = rng.permutation(images)
+        quotas = _allocate(len(images), desired[:, label])
+        assign(images, np.repeat(np.arange(num_splits), quotas))
+
+    # 라벨이 없는 이미지는 분할 전체 크기에 맞춰 배정
+    rest = np.flatnonzero(assignment < 0)
+    if len(rest):
+        rest = rng.permutation(rest)
+        quotas = _allocate(len(rest), desired_total)
+        assignment[rest] = np.repeat(np.arange(num_splits), quotas)
+
+    return assignment
\ No newline at end of file
@@ -2,9 +2,19 @@
 File management utilities
 """
 
-from .file_ops import move_files
-from .rename_utils import batch_rename, add_prefix, add_suffix
-from .file_utils import copy_files_by_pattern, find_duplicate_files
+from .._lazy import lazy_exports
+
+# 공개 이름은 처음 사용할 때 해당 모듈을 불러옴 (kwtools/_lazy.py 참고)
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'move_files': ('.file_ops', 'move_files'),
+    'batch_rename': ('.rename_utils', 'batch_rename'),
+    'add_prefix': ('.rename_utils', 'add_prefix'),
+    'add_suffix': ('.rename_utils', 'add_suffix'),
+    'copy_files_by_pattern': ('.file_utils', 'copy_files_by_pattern'),
+    'find_duplicate_files': ('.file_utils', 'find_duplicate_files'),
+    'scan_files': ('.scanner', 'scan_files'),
+    'scan_entries': ('.scanner', 'scan_entries'),
+})
 
 __all__ = [
     'move_files',
@@ -13,4 +23,6 @@ __all__ = [
     'add_suffix',
     'copy_files_by_pattern',
     'find_duplicate_files',
+    'scan_files',
+    'scan_entries',
 ]
\ No newline at end of file
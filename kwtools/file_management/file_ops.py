@@ -1,33 +1,63 @@
 import os
-import shutil
 import click
 from pathlib import Path
-from tqdm import tqdm
+from typing import Dict, Optional
+from .scanner import scan_files
+from .transfer import DEFAULT_TRANSFER_THREADS, transfer_files, echo_transfer_stats
+from .journal import default_journal_path, prepare_journal, journal_options, already_applied
 
-def move_files(source_pattern: str, target_dir: str, recursive: bool = False):
+def move_files(
+    source_pattern: str,
+    target_dir: str,
+    recursive: bool = False,
+    jobs: int = DEFAULT_TRANSFER_THREADS,
+    journal: Optional[str] = None,
+    resume: bool = False,
+    undo: bool = False
+) -> Dict:
     """
     주어진 패턴에 맞는 파일들을 대상 디렉토리로 이동
     
+    같은 장치 안에서는 rename으로, 다른 장치로는 커널 내 복사 후 원본 삭제로 이동하며
+    여러 파일을 동시에 처리합니다. 계획과 완료한 작업을 기록(journal)에 남기므로
+    중단되어도 기록만 읽어서 이어서 하거나 되돌릴 수 있습니다.
+    
     Args:
         source_pattern: 이동할 파일 패턴 (예: "*.jpg", "data/*.txt")
         target_dir: 대상 디렉토리
         recursive: 하위 디렉토리도 검색할지 여부
+        jobs: 동시에 처리할 파일 수
+        journal: 기록 파일 경로 (None이면 인자로 정한 기본 경로)
+        resume: 중단된 작업을 기록에서 이어서 실행
+        undo: 기록된 작업을 역순으로 되돌림
+    
+    Returns:
+        Dict: transfer_files 결과 (파일 수, 바이트 수, 소요 시간 등)
     """
     source_path = Path(source_pattern)
     target_path = Path(target_dir)
     
-    # 대상 디렉토리가 없으면 생성
-    target_path.mkdir(parents=True, exist_ok=True)
+    def plan():
+        # 대상 디렉토리가 없으면 생성
+        target_path.mkdir(parents=True, exist_ok=True)
+        # 파일 찾기 (이동 중에 다시 탐색되지 않도록 먼저 목록을 만듦)
+        return [(file, target_path / file.name) for file in scan_files(source_path.parent, source_path.name, recursive)]
     
-    # 파일 찾기
-    if recursive:
-        files = list(source_path.parent.rglob(source_path.name))
-    else:
-        files = list(source_path.parent.glob(source_path.name))
+    if journal is None:
+        journal = default_journal_path('move', os.path.abspath(source_pattern), os.path.abspath(target_dir), recursive)
+    log, indices = prepare_journal(journal, 'move', source_path.parent, plan, resume, undo)
     
-    # 파일 이동
-    for file in tqdm(files, desc="Moving files"):
-        shutil.move(str(file), str(target_path / file.name))
+    # 파일 이동 (되돌릴 때는 대상에서 원본으로)
+    pairs = [log.pairs[i][::-1] if undo else log.pairs[i] for i in indices]
+    kind = 'U' if undo else 'D'
+    with log:
+        return transfer_files(
+            pairs, 'move', jobs,
+            # 재개/되돌리기에서는 완료 기록 전에 중단되어 이미 옮겨진 파일을 건너뜀
+            skip=already_applied if resume or undo else None,
+            desc="Undoing moves" if undo else "Moving files",
+            on_done=lambda position: log.mark(kind, indices[position])
+        )
 
 @click.group()
 def cli():
@@ -38,9 +68,15 @@ def cli():
 @click.argument('source')
 @click.argument('target')
 @click.option('--recursive', '-r', is_flag=True, help='하위 디렉토리 포함')
-def move(source, target, recursive):
+@click.option('--jobs', '-j', default=DEFAULT_TRANSFER_THREADS, help='동시에 처리할 파일 수')
+@journal_options
+def move(source, target, recursive, jobs, resume, undo, journal):
     """파일을 이동합니다."""
-    move_files(source, target, recursive)
+    try:
+        stats = move_files(source, target, recursive, jobs, journal, resume, undo)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    echo_transfer_stats(stats)
 
 if __name__ == '__main__':
     cli()
\ No newline at end of file
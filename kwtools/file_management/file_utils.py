@@ -1,21 +1,39 @@
 import os
 import click
-import shutil
 import hashlib
 from pathlib import Path
 from tqdm import tqdm
-from typing import List, Dict, Set
+from typing import List, Dict, Optional, Set, Tuple
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from .. import metrics
+from .hash_cache import HashCache
+from .scanner import scan_entries, scan_files
+from .transfer import DEFAULT_TRANSFER_THREADS, transfer_files, echo_transfer_stats
 
-def copy_files_by_pattern(source_dir: str, target_dir: str, pattern: str, recursive: bool = False):
+def copy_files_by_pattern(
+    source_dir: str,
+    target_dir: str,
+    pattern: str,
+    recursive: bool = False,
+    skip_identical: bool = False,
+    cache: Optional[HashCache] = None,
+    jobs: int = DEFAULT_TRANSFER_THREADS
+) -> Dict:
     """
-    특정 패턴의 파일만 복사
+    특정 패턴의 파일만 복사 (여러 파일을 동시에 복사하며 메타데이터 보존)
     
     Args:
         source_dir: 원본 디렉토리
         target_dir: 대상 디렉토리
         pattern: 파일 패턴 (*.jpg, *.txt 등)
         recursive: 하위 디렉토리 포함 여부
+        skip_identical: 대상 파일이 이미 있고 내용이 같으면 복사하지 않음
+        cache: 내용 비교에 사용할 해시 캐시
+        jobs: 동시에 처리할 파일 수
+    
+    Returns:
+        Dict: transfer_files 결과 (파일 수, 바이트 수, 소요 시간 등)
     """
     source_path = Path(source_dir)
     target_path = Path(target_dir)
@@ -23,46 +41,142 @@ def copy_files_by_pattern(source_dir: str, target_dir: str, pattern: str, recurs
     # 대상 디렉토리 생성
     target_path.mkdir(parents=True, exist_ok=True)
     
-    if recursive:
-        files = list(source_path.rglob(pattern))
-    else:
-        files = list(source_path.glob(pattern))
-    
-    for file in tqdm(files, desc="Copying files"):
-        # 상대 경로 유지
-        rel_path = file.relative_to(source_path)
-        target_file = target_path / rel_path
-        target_file.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(file, target_file)
+    # 탐색과 복사를 동시에 진행 (상대 경로 유지)
+    files = scan_files(source_path, pattern, recursive)
+    if target_path.resolve().is_relative_to(source_path.resolve()):
+        # 대상이 원본 안에 있으면 복사한 파일(과 복사 중인 임시 파일)을 다시 탐색하지 않도록 먼저 목록을 만듦
+        files = list(files)
+    pairs = ((file, target_path / file.relative_to(source_path)) for file in files)
+    skip = (lambda src, dst: _is_identical(src, dst, cache)) if skip_identical else None
+    return transfer_files(pairs, 'copy', jobs, skip, desc="Copying files")
+
+HASH_ALGORITHMS = ['sha256', 'blake2b', 'sha1', 'md5']
 
-def get_file_hash(file_path: Path, block_size: int = 65536) -> str:
-    """파일의 SHA-256 해시값 계산"""
-    sha256 = hashlib.sha256()
+def get_file_hash(
+    file_path: Path,
+    block_size: int = 65536,
+    algorithm: str = 'sha256',
+    cache: Optional[HashCache] = None,
+    st: Optional[os.stat_result] = None
+) -> str:
+    """파일의 해시값 계산 (기본 SHA-256, cache가 있으면 캐시된 값 사용, st는 캐시 조회에 쓸 stat 결과)"""
+    if cache is not None:
+        return cache.get(file_path, algorithm, lambda: get_file_hash(file_path, block_size, algorithm), st)
+    
+    hasher = hashlib.new(algorithm)
     with open(file_path, 'rb') as f:
         for block in iter(lambda: f.read(block_size), b''):
-            sha256.update(block)
-    return sha256.hexdigest()
+            hasher.update(block)
+    return hasher.hexdigest()
+
+def get_partial_hash(
+    file_path: Path,
+    size: int,
+    sample_size: int = 4096,
+    algorithm: str = 'sha256',
+    cache: Optional[HashCache] = None,
+    st: Optional[os.stat_result] = None
+) -> Tuple[str, bool]:
+    """
+    파일의 앞/뒤 sample_size 바이트만 해시
+
+    파일이 sample_size * 2 이하이면 파일 전체를 읽게 되므로 결과가 곧 전체 해시입니다.
+    st는 캐시 조회에 쓸 stat 결과입니다 (없으면 캐시에서 새로 조회).
+
+    Returns:
+        Tuple[str, bool]: (해시값, 전체 해시 여부)
+    """
+    if cache is not None:
+        is_full = size <= sample_size * 2
+        kind = algorithm if is_full else f"{algorithm}:partial{sample_size}"
+        digest = cache.get(file_path, kind, lambda: get_partial_hash(file_path, size, sample_size, algorithm)[0], st)
+        return digest, is_full
+    
+    hasher = hashlib.new(algorithm)
+    with open(file_path, 'rb') as f:
+        if size <= sample_size * 2:
+            hasher.update(f.read())
+            return hasher.hexdigest(), True
+        hasher.update(f.read(sample_size))
+        f.seek(-sample_size, os.SEEK_END)
+        hasher.update(f.read(sample_size))
+    return hasher.hexdigest(), False
+
+def _is_identical(source: Path, target: Path, cache: Optional[HashCache] = None) -> bool:
+    """두 파일의 크기와 해시가 같은지 확인"""
+    if not target.is_file():
+        return False
+    source_stat, target_stat = source.stat(), target.stat()
+    if source_stat.st_size != target_stat.st_size:
+        return False
+    return get_file_hash(source, cache=cache, st=source_stat) == get_file_hash(target, cache=cache, st=target_stat)
 
-def find_duplicate_files(directory: str, recursive: bool = False) -> Dict[str, List[str]]:
+def _colliding_groups(keys: Dict) -> List[List]:
+    """같은 키를 가진 항목이 2개 이상인 그룹만 반환"""
+    groups = defaultdict(list)
+    for item, key in keys.items():
+        groups[key].append(item)
+    return [group for group in groups.values() if len(group) > 1]
+
+def find_duplicate_files(
+    directory: str,
+    recursive: bool = False,
+    algorithm: str = 'sha256',
+    jobs: int = 8,
+    sample_size: int = 4096,
+    cache: Optional[HashCache] = None
+) -> Dict[str, List[str]]:
     """
     중복 파일 찾기
+
+    크기가 같은 파일끼리 묶고, 앞/뒤 일부분의 해시가 같은 파일만 전체 해시를 계산합니다.
+    
+    Args:
+        directory: 대상 디렉토리
+        recursive: 하위 디렉토리 포함 여부
+        algorithm: 해시 알고리즘 (sha256, blake2b, sha1, md5)
+        jobs: 해시 계산 스레드 수
+        sample_size: 부분 해시에 사용할 앞/뒤 바이트 수
+        cache: 해시 캐시 (있으면 바뀌지 않은 파일은 다시 읽지 않음)
     
     Returns:
         Dict[str, List[str]]: 해시값을 키로, 중복 파일 경로 리스트를 값으로 하는 딕셔너리
     """
-    path = Path(directory)
+    # 1단계: 크기별로 묶고 크기가 유일한 파일 제외 (탐색 스레드에서 조회한 stat을 해시 캐시 조회에도 사용)
+    files = []
+    stats = []
+    sizes = {}
+    for idx, entry in enumerate(scan_entries(directory, recursive=recursive, stat=True)):
+        files.append(Path(entry.path))
+        stats.append(entry.stat())
+        sizes[idx] = stats[idx].st_size
+    candidates = [idx for group in _colliding_groups(sizes) for idx in group]
+    metrics.count(files=len(files), bytes=sum(sizes.values()))
     
-    if recursive:
-        files = list(path.rglob("*"))
-    else:
-        files = list(path.glob("*"))
+    full_hashes = {}
+    with ThreadPoolExecutor(max_workers=jobs) as executor, metrics.stage('read'):
+        # 2단계: 앞/뒤 일부분 해시
+        partial = executor.map(
+            lambda idx: get_partial_hash(files[idx], sizes[idx], sample_size, algorithm, cache, stats[idx]), candidates
+        )
+        partial_keys = {}
+        for idx, (digest, is_full) in zip(candidates, tqdm(partial, total=len(candidates), desc="Checking files")):
+            if is_full:
+                full_hashes[idx] = digest
+            else:
+                partial_keys[idx] = (sizes[idx], digest)
+        
+        # 3단계: 부분 해시까지 같은 파일만 전체 해시
+        remaining = [idx for group in _colliding_groups(partial_keys) for idx in group]
+        digests = executor.map(
+            lambda idx: get_file_hash(files[idx], algorithm=algorithm, cache=cache, st=stats[idx]), remaining
+        )
+        for idx, digest in zip(remaining, tqdm(digests, total=len(remaining), desc="Hashing files")):
+            full_hashes[idx] = digest
     
-    files = [f for f in files if f.is_file()]
     hash_dict = defaultdict(list)
-    
-    for file in tqdm(files, desc="Checking files"):
-        file_hash = get_file_hash(file)
-        hash_dict[file_hash].append(str(file))
+    for idx in sorted(full_hashes):
+        hash_dict[full_hashes[idx]].append(str(files[idx]))
     
     # 중복된 파일만 반환
     return {k: v for k, v in hash_dict.items() if len(v) > 1}
@@ -77,16 +191,36 @@ def cli():
 @click.argument('target_dir')
 @click.argument('pattern')
 @click.option('--recursive', '-r', is_flag=True, help='하위 디렉토리 포함')
-def copy(source_dir, target_dir, pattern, recursive):
+@click.option('--skip-identical', is_flag=True, help='내용이 같은 대상 파일은 복사하지 않음')
+@click.option('--cache-file', help='해시 캐시 파일 경로')
+@click.option('--jobs', '-j', default=DEFAULT_TRANSFER_THREADS, help='동시에 처리할 파일 수')
+def copy(source_dir, target_dir, pattern, recursive, skip_identical, cache_file, jobs):
     """특정 패턴의 파일만 복사합니다."""
-    copy_files_by_pattern(source_dir, target_dir, pattern, recursive)
+    if not skip_identical:
+        stats = copy_files_by_pattern(source_dir, target_dir, pattern, recursive, jobs=jobs)
+        echo_transfer_stats(stats)
+        return
+    with HashCache(cache_file) as cache:
+        stats = copy_files_by_pattern(source_dir, target_dir, pattern, recursive, skip_identical, cache, jobs)
+    echo_transfer_stats(stats)
+    click.echo(f"해시 캐시: 적중 {cache.hits}, 미스 {cache.misses}")
 
 @cli.command()
 @click.argument('directory')
 @click.option('--recursive', '-r', is_flag=True, help='하위 디렉토리 포함')
-def find_duplicates(directory, recursive):
+@click.option('--algorithm', '-a', type=click.Choice(HASH_ALGORITHMS), default='sha256', help='해시 알고리즘')
+@click.option('--jobs', '-j', default=8, help='해시 계산 스레드 수')
+@click.option('--no-cache', is_flag=True, help='해시 캐시를 사용하지 않음')
+@click.option('--rehash', is_flag=True, help='캐시를 무시하고 모든 해시를 다시 계산')
+@click.option('--cache-file', help='해시 캐시 파일 경로')
+def find_duplicates(directory, recursive, algorithm, jobs, no_cache, rehash, cache_file):
     """중복 파일을 찾아서 출력합니다."""
-    duplicates = find_duplicate_files(directory, recursive)
+    if no_cache:
+        duplicates = find_duplicate_files(directory, recursive, algorithm, jobs)
+    else:
+        with HashCache(cache_file, rehash=rehash) as cache:
+            duplicates = find_duplicate_files(directory, recursive, algorithm, jobs, cache=cache)
+        click.echo(f"해시 캐시: 적중 {cache.hits}, 미스 {cache.misses}")
     
     if not duplicates:
         click.echo("중복 파일이 없습니다.")
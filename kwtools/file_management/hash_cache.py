@@ -0,0 +1,134 @@
+import os
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+# 기본 해시 캐시 위치 (장치/inode 기준이므로 데이터셋과 무관하게 하나만 사용)
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "kwtools" / "hash_cache.sqlite"
+DEFAULT_MAX_ENTRIES = 5_000_000
+
+# 새 항목과 사용 기록이 이 개수만큼 모이면 저장 (메모리 사용량 제한)
+_FLUSH_ENTRIES = 10000
+
+class HashCache:
+    """
+    (장치, inode, 크기, mtime_ns)를 키로 파일 해시를 저장하는 디스크 캐시
+
+    파일 크기나 수정 시각이 바뀌면 캐시를 무시하고 다시 계산합니다.
+    항목 수가 max_entries를 넘으면 가장 오래 사용하지 않은 항목부터 삭제합니다.
+    여러 스레드에서 동시에 사용할 수 있습니다.
+
+    Args:
+        cache_path: 캐시(SQLite) 파일 경로
+        max_entries: 최대 항목 수
+        rehash: True이면 캐시를 읽지 않고 모두 다시 계산하여 덮어씀
+    """
+
+    def __init__(
+        self,
+        cache_path: Optional[str] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        rehash: bool = False
+    ):
+        self.cache_path = Path(cache_path) if cache_path else DEFAULT_CACHE_PATH
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.rehash = rehash
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._pending = []  # 새로 계산한 항목
+        self._touched = []  # 캐시 적중 항목 (LRU 갱신용)
+        self._conn = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            " dev INTEGER NOT NULL,"
+            " inode INTEGER NOT NULL,"
+            " kind TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " mtime_ns INTEGER NOT NULL,"
+            " digest TEXT NOT NULL,"
+            " last_used INTEGER NOT NULL,"
+            " PRIMARY KEY (dev, inode, kind))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS hashes_last_used ON hashes (last_used)")
+
+    def get(
+        self,
+        file_path: Path,
+        kind: str,
+        compute: Callable[[], str],
+        st: Optional[os.stat_result] = None
+    ) -> str:
+        """
+        캐시된 해시를 반환하고, 없거나 파일이 바뀌었으면 compute()로 계산
+
+        Args:
+            file_path: 파일 경로
+            kind: 해시 종류 (알고리즘, 부분 해시 여부 등을 구분하는 문자열)
+            compute: 해시 계산 함수
+            st: 이미 구한 os.stat 결과 (없으면 새로 조회)
+        """
+        if st is None:
+            st = os.stat(file_path)
+        key = (st.st_dev, st.st_ino, kind)
+
+        digest = None
+        if not self.rehash:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT size, mtime_ns, digest FROM hashes WHERE dev = ? AND inode = ? AND kind = ?", key
+                ).fetchone()
+                if row is not None and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+                    self.hits += 1
+                    self._touched.append(key)
+                    digest = row[2]
+
+        if digest is None:
+            digest = compute()
+            with self._lock:
+                self.misses += 1
+                self._pending.append(key + (st.st_size, st.st_mtime_ns, digest))
+        if len(self._pending) + len(self._touched) >= _FLUSH_ENTRIES:
+            self.flush()
+        return digest
+
+    def flush(self) -> None:
+        """새 항목과 사용 기록을 저장하고, 최대 항목 수를 넘으면 오래된 항목 삭제"""
+        with self._lock:
+            now = time.time_ns()
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO hashes (dev, inode, kind, size, mtime_ns, digest, last_used)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (entry + (now,) for entry in self._pending),
+                )
+                self._conn.executemany(
+                    "UPDATE hashes SET last_used = ? WHERE dev = ? AND inode = ? AND kind = ?",
+                    ((now,) + key for key in self._touched),
+                )
+                count = self._conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+                if count > self.max_entries:
+                    self._conn.execute(
+                        "DELETE FROM hashes WHERE rowid IN"
+                        " (SELECT rowid FROM hashes ORDER BY last_used ASC LIMIT ?)",
+                        (count - self.max_entries,),
+                    )
+            self._pending = []
+            self._touched = []
+
+    def close(self) -> None:
+        """캐시를 저장하고 닫음"""
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
\ No newline at end of file
@@ -0,0 +1,332 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import click
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+from tqdm import tqdm
+from .. import metrics
+
+# 기본 작업 기록(journal) 위치 (작업 종류와 인자로 파일 이름을 정하므로 같은 명령이면 같은 기록을 찾음)
+DEFAULT_JOURNAL_DIR = Path.home() / ".cache" / "kwtools" / "journals"
+JOURNAL_VERSION = 1
+
+def default_journal_path(operation: str, *args) -> Path:
+    """작업 종류와 인자(경로는 절대 경로로 변환)로 기본 기록 파일 경로 생성"""
+    key = json.dumps([operation] + [str(arg) for arg in args])
+    return DEFAULT_JOURNAL_DIR / f"{operation}-{hashlib.sha1(key.encode()).hexdigest()[:16]}.jsonl"
+
+class Journal:
+    """
+    대량 이동/이름 변경을 위한 추가 전용(append-only) 작업 기록
+
+    한 줄에 하나의 JSON 배열을 기록합니다.
+        ["H", {"operation", "root", "version"}]  헤더
+        ["P", 원본, 대상]                         계획된 작업 (root 기준 상대 경로)
+        ["B"]                                     계획 기록 완료
+        ["D", 번호] / ["U", 번호]                 작업 완료 / 되돌림 완료
+
+    완료 기록은 checkpoint_every개 또는 checkpoint_interval초마다 fsync 합니다.
+    중단된 작업은 기록만 읽어서 이어서 하거나 되돌릴 수 있습니다 (디렉토리를 다시 탐색하지 않음).
+
+    Args:
+        path: 기록 파일 경로
+        checkpoint_every: fsync 사이의 최대 기록 수
+        checkpoint_interval: fsync 사이의 최대 시간(초)
+    """
+
+    def __init__(self, path: str, checkpoint_every: int = 1000, checkpoint_interval: float = 1.0):
+        self.path = Path(path)
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval = checkpoint_interval
+        self.operation = None
+        self.root = None
+        self.pairs = []  # [(원본, 대상)] 절대 경로 문자열
+        self.planned = False
+        self.done = set()
+        self.undone = set()
+        self._file = None
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def exists(self) -> bool:
+        return self.path.is_file()
+
+    def load(self) -> "Journal":
+        """기록을 읽어 계획과 완료/되돌림 상태를 복원 (마지막 줄이 잘려 있으면 무시)"""
+        self.pairs = []
+        self.planned = False
+        self.done = set()
+        self.undone = set()
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # 기록 중 중단되어 잘린 줄
+                kind = record[0]
+                if kind == 'D':
+                    self.done.add(record[1])
+                elif kind == 'U':
+                    self.undone.add(record[1])
+                elif kind == 'P':
+                    self.pairs.append((self._absolute(record[1]), self._absolute(record[2])))
+                elif kind == 'B':
+                    self.planned = True
+                elif kind == 'H':
+                    self.operation = record[1]["operation"]
+                    self.root = record[1]["root"]
+        return self
+
+    def is_incomplete(self) -> bool:
+        """작업 또는 되돌리기가 중간에 중단된 상태인지 여부"""
+        if not self.planned:
+            return False
+        if self.undone:
+            return bool(self.done - self.undone)
+        return len(self.done) < len(self.pairs)
+
+    def _absolute(self, path: str) -> str:
+        """root 기준 상대 경로를 절대 경로로"""
+        path = os.path.join(self.root, path)
+        return os.path.normpath(path) if os.sep + '.' in path else path
+
+    def _relative(self, path: str) -> str:
+        """절대 경로를 root 기준 상대 경로로 (root 아래이면 문자열 비교만 함)"""
+        prefix = os.path.join(self.root, '')
+        return path[len(prefix):] if path.startswith(prefix) else os.path.relpath(path, self.root)
+
+    def begin(self, operation: str, root: str, pairs: Sequence[Tuple[str, str]]) -> None:
+        """새 기록을 만들고 전체 작업 계획을 기록 (기존 기록은 교체)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.operation = operation
+        self.root = os.path.abspath(root)
+        self.pairs = [
+            (os.fspath(src), os.fspath(dst)) if os.path.isabs(src) and os.path.isabs(dst)
+            else (os.path.abspath(src), os.path.abspath(dst))
+            for src, dst in pairs
+        ]
+        self.done = set()
+        self.undone = set()
+
+        # 계획 전체를 임시 파일에 쓰고 교체하므로 계획이 반만 기록된 상태로 남지 않음
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            header = {"operation": operation, "root": self.root, "version": JOURNAL_VERSION}
+            f.write(json.dumps(["H", header]) + '\n')
+            for src, dst in self.pairs:
+                f.write(json.dumps(["P", self._relative(src), self._relative(dst)]) + '\n')
+            f.write('["B"]\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.planned = True
+
+    def mark(self, kind: str, index: int) -> None:
+        """작업 완료('D') 또는 되돌림 완료('U') 기록 (여러 스레드에서 호출 가능)"""
+        with self._lock:
+            if self._file is None:
+                self._open_append()
+            self._file.write(f'["{kind}",{index}]\n')
+            (self.done if kind == 'D' else self.undone).add(index)
+            self._unsynced += 1
+            now = time.monotonic()
+            if self._unsynced >= self.checkpoint_every or now - self._last_sync >= self.checkpoint_interval:
+                self.checkpoint()
+
+    def _open_append(self) -> None:
+        """기록 파일을 추가 모드로 열기 (중단으로 잘린 마지막 줄은 잘라냄)"""
+        self._file = open(self.path, 'rb+')
+        size = self._file.seek(0, os.SEEK_END)
+        if size:
+            self._file.seek(max(0, size - 4096))
+            tail = self._file.read()
+            if not tail.endswith(b'\n'):
+                self._file.truncate(size - len(tail) + tail.rfind(b'\n') + 1)
+        self._file.close()
+        self._file = open(self.path, 'a')
+
+    def checkpoint(self) -> None:
+        """지금까지의 기록을 디스크에 반영"""
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.checkpoint()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def already_applied(src: str, dst: str) -> bool:
+    """완료 기록 전에 중단된 작업인지 확인 (원본은 없고 대상만 있음)"""
+    return not os.path.lexists(src) and os.path.lexists(dst)
+
+def pending_operations(journal: Journal, undo: bool = False) -> List[int]:
+    """
+    실행할 작업 번호 목록
+
+    undo가 False이면 아직 완료되지 않은 작업을 계획 순서대로, True이면 완료된 작업
+    (완료 기록 전에 중단된 작업 포함) 중 되돌리지 않은 것을 역순으로 반환합니다.
+    """
+    if not undo:
+        return [i for i in range(len(journal.pairs)) if i not in journal.done]
+    indices = []
+    for i in range(len(journal.pairs) - 1, -1, -1):
+        if i in journal.undone:
+            continue
+        if i in journal.done or already_applied(*journal.pairs[i]):
+            indices.append(i)
+    return indices
+
+def prepare_journal(
+    journal_path: str,
+    operation: str,
+    root: str,
+    plan: Callable[[], Sequence[Tuple[str, str]]],
+    resume: bool = False,
+    undo: bool = False
+) -> Tuple[Journal, List[int]]:
+    """
+    기록을 준비하고 실행할 작업 번호 목록을 반환
+
+    - 기본: 이전 작업이 완료되지 않았으면 오류, 아니면 plan()으로 새 계획을 기록
+    - resume: 기록의 계획 중 완료되지 않은 작업만 (plan()을 호출하지 않음)
+    - undo: 완료된 작업을 역순으로 (실행할 때 원본과 대상을 바꿔서 적용)
+    """
+    journal = Journal(journal_path)
+    if resume or undo:
+        if not journal.exists():
+            raise RuntimeError(f"작업 기록이 없습니다: {journal_path}")
+        journal.load()
+        if journal.operation != operation:
+            raise RuntimeError(f"다른 작업의 기록입니다: {journal.operation}")
+        if not journal.planned:
+            # 계획을 기록하던 중 중단되었으면 실행된 작업이 없음
+            return journal, []
+        return journal, pending_operations(journal, undo)
+
+    if journal.exists() and journal.load().is_incomplete():
+        raise RuntimeError(
+            f"완료되지 않은 이전 작업이 있습니다 ({len(journal.done)}/{len(journal.pairs)}). "
+            f"--resume으로 이어서 하거나 --undo로 되돌리세요. (기록: {journal_path})"
+        )
+    journal.begin(operation, root, plan())
+    return journal, list(range(len(journal.pairs)))
+
+def run_journaled(
+    journal: Journal,
+    indices: Sequence[int],
+    apply: Callable[[str, str], None],
+    undo: bool = False,
+    desc: str = "Processing files",
+    recovering: bool = False,
+    group: Optional[Callable[[str, str], Hashable]] = None,
+    jobs: int = 1
+) -> Dict:
+    """
+    기록의 작업들을 실행하며 완료 기록을 남김
+
+    원본이 없어 실패한 작업은 완료 기록 전에 중단되어 이미 적용된 것인지 확인하여,
+    대상이 있으면 완료로 기록합니다 (정상 경로에서는 추가 stat 호출이 없음).
+
+    group을 지정하면 같은 그룹의 작업은 한 스레드에서 순서대로, 서로 다른 그룹은
+    jobs개 스레드에서 동시에 실행합니다.
+
+    Args:
+        journal: prepare_journal로 준비한 기록
+        indices: 실행할 작업 번호
+        apply: (원본, 대상)을 받아 작업을 수행하는 함수
+        undo: True이면 (대상, 원본) 방향으로 실행하고 되돌림으로 기록
+        recovering: True이면 대상이 이미 있어 실패한(FileExistsError) 작업 중 원본이 없는 것을
+            중단 전에 적용된 것으로 봄 (원본이 남아 있으면 오류)
+        group: (원본, 대상)을 받아 순서를 지켜야 하는 작업 묶음의 키를 반환하는 함수
+        jobs: 동시에 실행할 그룹 수
+
+    Returns:
+        Dict: {"planned", "processed", "error_files", "elapsed"}
+    """
+    start_time = time.perf_counter()
+    kind = 'U' if undo else 'D'
+
+    def operation(i: int) -> Tuple[str, str]:
+        src, dst = journal.pairs[i]
+        return (dst, src) if undo else (src, dst)
+
+    def run_group(group_indices: List[int]) -> List[str]:
+        errors = []
+        for i in group_indices:
+            src, dst = operation(i)
+            try:
+                apply(src, dst)
+            except FileNotFoundError as e:
+                if not already_applied(src, dst):
+                    print(f"Error processing {src}: {e}")
+                    errors.append(str(src))
+                    continue
+            except FileExistsError as e:
+                # 원본이 남아 있으면 대상은 이 작업과 무관한 파일이므로 완료로 기록하지 않음
+                if not (recovering and already_applied(src, dst)):
+                    print(f"Error processing {src}: {e}")
+                    errors.append(str(src))
+                    continue
+            except Exception as e:
+                print(f"Error processing {src}: {e}")
+                errors.append(str(src))
+                continue
+            journal.mark(kind, i)
+            pbar.update(1)
+        return errors
+
+    groups = {}
+    if group is None:
+        groups[None] = list(indices)
+    else:
+        for i in indices:
+            groups.setdefault(group(*operation(i)), []).append(i)
+
+    error_files = []
+    with journal, tqdm(total=len(indices), desc=desc) as pbar, metrics.stage('write'):
+        if jobs <= 1 or len(groups) <= 1:
+            for group_indices in groups.values():
+                error_files.extend(run_group(group_indices))
+        else:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                for errors in executor.map(run_group, groups.values()):
+                    error_files.extend(errors)
+
+    metrics.count(files=len(indices), errors=len(error_files))
+    return {
+        "planned": len(journal.pairs),
+        "processed": len(indices) - len(error_files),
+        "error_files": error_files,
+        "elapsed": time.perf_counter() - start_time
+    }
+
+def echo_journal_stats(stats: Dict) -> None:
+    """run_journaled 결과 출력"""
+    click.echo("\n=== 처리 결과 ===")
+    click.echo(f"처리한 파일 수: {stats['processed']} (계획 {stats['planned']}개, {stats['elapsed']:.1f}초)")
+    if stats.get("conflicts"):
+        click.echo(f"이름 충돌로 제외한 파일 수: {len(stats['conflicts'])}")
+    if stats["error_files"]:
+        click.echo(f"처리 중 오류가 발생한 파일 수: {len(stats['error_files'])}")
+
+def journal_options(func):
+    """명령에 --resume / --undo / --journal 옵션 추가"""
+    func = click.option('--journal', default=None, help='작업 기록 파일 경로 (기본: ~/.cache/kwtools/journals 아래 자동 지정)')(func)
+    func = click.option('--undo', is_flag=True, help='기록된 작업을 역순으로 되돌림')(func)
+    func = click.option('--resume', is_flag=True, help='중단된 작업을 기록에서 이어서 실행 (다시 탐색하지 않음)')(func)
+    return func
\ No newline at end of file
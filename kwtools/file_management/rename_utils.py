@@ -1,68 +1,251 @@
 import os
+import errno
 import click
-from pathlib import Path
-from tqdm import tqdm
+from collections import deque
+from pathlib import PurePath
 import re
+from typing import Callable, Dict, List, Optional, Tuple
+from .. import metrics
+from .scanner import scan_entries
+from .journal import default_journal_path, prepare_journal, run_journaled, journal_options, echo_journal_stats
 
-def batch_rename(directory: str, pattern: str, replacement: str, recursive: bool = False):
+# 이름을 동시에 변경할 기본 디렉토리 수
+DEFAULT_RENAME_THREADS = 8
+
+def _plan_directory(names: List[str], new_name: Callable[[str], str]) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
     """
-    디렉토리 내의 파일들의 이름을 일괄 변경
+    디렉토리 하나의 이름 변경 순서를 계산
+    
+    - 대상 이름이 겹치거나, 이름이 바뀌지 않는 파일과 같거나, 잘못된 이름이면 해당 파일은 제외
+    - a→b, b→c 같은 연쇄는 끝에서부터 (b→c 후 a→b) 적용
+    - a→b, b→a 같은 순환은 임시 이름을 거쳐 적용 (a→tmp, b→a, tmp→b)
+    
+    Returns:
+        Tuple: ([(원래 이름, 새 이름)] 적용 순서, [(이름, 제외 사유)])
+    """
+    existing = set(names)
+    mapping = {}
+    conflicts = []
+    for name in names:
+        target = new_name(name)
+        if target == name:
+            continue
+        if not target or target in ('.', '..') or os.sep in target or (os.altsep and os.altsep in target):
+            conflicts.append((name, f"잘못된 이름: {target!r}"))
+            continue
+        mapping[name] = target
+    
+    sources_of = {}
+    for name, target in mapping.items():
+        sources_of.setdefault(target, []).append(name)
+    
+    rejected = deque()
+    for target, sources in sources_of.items():
+        if len(sources) > 1:
+            rejected.extend((name, f"{target}: 여러 파일의 대상 이름이 같음") for name in sources)
+        elif target in existing and target not in mapping:
+            rejected.append((sources[0], f"{target}: 같은 이름의 파일이 이미 있음"))
+    
+    # 제외된 파일은 이름이 그대로 남으므로, 그 이름을 대상으로 하는 파일도 연쇄적으로 제외
+    while rejected:
+        name, reason = rejected.popleft()
+        if mapping.pop(name, None) is None:
+            continue
+        conflicts.append((name, reason))
+        for other in sources_of.get(name, ()):
+            if other in mapping:
+                rejected.append((other, f"{name}: 이름이 바뀌지 않는 파일과 같음"))
+    
+    # 대상이 다른 파일의 원래 이름인 경우 그 파일 (연쇄/순환의 앞 단계)
+    source_of = {target: name for name, target in mapping.items() if target in mapping}
+    steps = []
+    planned = set()
+    
+    # 연쇄: 대상이 비어 있는 마지막 단계부터 거꾸로 적용
+    for name, target in mapping.items():
+        if target in mapping:
+            continue
+        current = name
+        while current is not None:
+            steps.append((current, mapping[current]))
+            planned.add(current)
+            current = source_of.get(current)
+    
+    # 순환: 첫 파일을 임시 이름으로 옮겨 순환을 끊음
+    taken = existing | set(mapping.values())
+    for name in mapping:
+        if name in planned:
+            continue
+        tmp_name = f".{name}.kwtools-rename"
+        counter = 0
+        while tmp_name in taken:
+            counter += 1
+            tmp_name = f".{name}.kwtools-rename-{counter}"
+        taken.add(tmp_name)
+        
+        steps.append((name, tmp_name))
+        planned.add(name)
+        current = source_of[name]
+        while current != name:
+            steps.append((current, mapping[current]))
+            planned.add(current)
+            current = source_of[current]
+        steps.append((tmp_name, mapping[name]))
+    
+    return steps, conflicts
+
+def plan_renames(
+    directory: str,
+    new_name: Callable[[str], str],
+    recursive: bool = False
+) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """
+    한 번의 디렉토리 탐색으로 전체 이름 변경 계획을 메모리에서 계산
+    
+    파일을 실제로 바꾸지 않으며, 같은 디렉토리 안의 단계들은 순서대로 적용해야 합니다
+    (서로 다른 디렉토리는 독립적).
     
     Args:
         directory: 대상 디렉토리
-        pattern: 찾을 패턴 (정규식 사용 가능)
-        replacement: 바꿀 텍스트
+        new_name: 파일 이름을 받아 새 이름을 반환하는 함수
         recursive: 하위 디렉토리 포함 여부
+    
+    Returns:
+        Tuple: ([(원본 경로, 대상 경로)] 적용 순서, [(제외된 파일 경로, 사유)]), 경로는 절대 경로 문자열
     """
-    path = Path(directory)
+    names_by_dir = {}
+    for entry in scan_entries(os.path.abspath(directory), recursive=recursive):
+        names_by_dir.setdefault(os.path.dirname(entry.path), []).append(entry.name)
     
-    if recursive:
-        files = list(path.rglob("*"))
-    else:
-        files = list(path.glob("*"))
+    steps = []
+    conflicts = []
+    for parent, names in names_by_dir.items():
+        with metrics.stage('compute'):
+            dir_steps, dir_conflicts = _plan_directory(names, new_name)
+        prefix = os.path.join(parent, '')
+        steps.extend((prefix + name, prefix + target) for name, target in dir_steps)
+        conflicts.extend((prefix + name, reason) for name, reason in dir_conflicts)
+    return steps, conflicts
+
+def _rename_noreplace(src: str, dst: str) -> None:
+    """대상이 이미 있으면 덮어쓰지 않고 FileExistsError"""
+    if os.path.lexists(dst):
+        raise FileExistsError(errno.EEXIST, "대상 파일이 이미 있습니다", dst)
+    os.rename(src, dst)
+
+def _rename_journaled(
+    operation: str,
+    directory: str,
+    recursive: bool,
+    new_name: Callable[[str], str],
+    key: tuple,
+    journal: Optional[str],
+    resume: bool,
+    undo: bool,
+    jobs: int,
+    desc: str
+) -> Dict:
+    """
+    이름 변경 계획을 기록에 남긴 뒤 디렉토리별로 동시에 적용 (rename_utils 함수들의 공통 부분)
     
-    # 파일만 선택 (디렉토리 제외)
-    files = [f for f in files if f.is_file()]
+    resume/undo일 때는 디렉토리를 다시 탐색하지 않고 기록만 읽습니다.
+    """
+    conflicts = []
     
-    for file in tqdm(files, desc="Renaming files"):
-        new_name = re.sub(pattern, replacement, file.name)
-        if new_name != file.name:
-            new_path = file.parent / new_name
-            file.rename(new_path)
+    def plan():
+        steps, plan_conflicts = plan_renames(directory, new_name, recursive)
+        for path, reason in plan_conflicts:
+            print(f"Skipping {path}: {reason}")
+        conflicts.extend(path for path, _ in plan_conflicts)
+        return steps
+    
+    if journal is None:
+        journal = default_journal_path(operation, os.path.abspath(directory), recursive, *key)
+    log, indices = prepare_journal(journal, operation, directory, plan, resume, undo)
+    stats = run_journaled(
+        log, indices, _rename_noreplace, undo, "Undoing renames" if undo else desc,
+        recovering=resume or undo, group=lambda src, dst: os.path.dirname(src), jobs=jobs
+    )
+    stats["conflicts"] = conflicts
+    return stats
 
-def add_prefix(directory: str, prefix: str, recursive: bool = False):
-    """파일 이름 앞에 접두사 추가"""
-    path = Path(directory)
+def batch_rename(
+    directory: str,
+    pattern: str,
+    replacement: str,
+    recursive: bool = False,
+    journal: Optional[str] = None,
+    resume: bool = False,
+    undo: bool = False,
+    jobs: int = DEFAULT_RENAME_THREADS
+) -> Dict:
+    """
+    디렉토리 내의 파일들의 이름을 일괄 변경
     
-    if recursive:
-        files = list(path.rglob("*"))
-    else:
-        files = list(path.glob("*"))
+    전체 계획을 먼저 계산하여 대상 이름이 겹치는 파일은 제외하고(덮어쓰지 않음),
+    연쇄/순환 변경도 올바른 순서로 적용합니다. 계획과 완료한 작업을 기록(journal)에
+    남기므로 중단되어도 이어서 하거나 되돌릴 수 있습니다.
     
-    files = [f for f in files if f.is_file()]
+    Args:
+        directory: 대상 디렉토리
+        pattern: 찾을 패턴 (정규식 사용 가능)
+        replacement: 바꿀 텍스트
+        recursive: 하위 디렉토리 포함 여부
+        journal: 기록 파일 경로 (None이면 인자로 정한 기본 경로)
+        resume: 중단된 작업을 기록에서 이어서 실행
+        undo: 기록된 작업을 역순으로 되돌림
+        jobs: 동시에 처리할 디렉토리 수
+    
+    Returns:
+        Dict: run_journaled 결과와 "conflicts" (제외된 파일)
+    """
+    regex = re.compile(pattern)
+    return _rename_journaled(
+        'rename', directory, recursive, lambda name: regex.sub(replacement, name),
+        (pattern, replacement), journal, resume, undo, jobs, "Renaming files"
+    )
+
+def add_prefix(
+    directory: str,
+    prefix: str,
+    recursive: bool = False,
+    journal: Optional[str] = None,
+    resume: bool = False,
+    undo: bool = False,
+    jobs: int = DEFAULT_RENAME_THREADS
+) -> Dict:
+    """파일 이름 앞에 접두사 추가 (충돌 처리/기록/재개/되돌리기는 batch_rename 참고)"""
+    return _rename_journaled(
+        'prefix', directory, recursive, lambda name: f"{prefix}{name}",
+        (prefix,), journal, resume, undo, jobs, "Adding prefix"
+    )
+
+def add_suffix(
+    directory: str,
+    suffix: str,
+    recursive: bool = False,
+    journal: Optional[str] = None,
+    resume: bool = False,
+    undo: bool = False,
+    jobs: int = DEFAULT_RENAME_THREADS
+) -> Dict:
+    """파일 확장자 앞에 접미사 추가 (충돌 처리/기록/재개/되돌리기는 batch_rename 참고)"""
+    def new_name(name: str) -> str:
+        path = PurePath(name)
+        return f"{path.stem}{suffix}{path.suffix}"
     
-    for file in tqdm(files, desc="Adding prefix"):
-        new_name = f"{prefix}{file.name}"
-        new_path = file.parent / new_name
-        file.rename(new_path)
+    return _rename_journaled(
+        'suffix', directory, recursive, new_name,
+        (suffix,), journal, resume, undo, jobs, "Adding suffix"
+    )
 
-def add_suffix(directory: str, suffix: str, recursive: bool = False):
-    """파일 확장자 앞에 접미사 추가"""
-    path = Path(directory)
-    
-    if recursive:
-        files = list(path.rglob("*"))
-    else:
-        files = list(path.glob("*"))
-    
-    files = [f for f in files if f.is_file()]
-    
-    for file in tqdm(files, desc="Adding suffix"):
-        name = file.stem
-        ext = file.suffix
-        new_name = f"{name}{suffix}{ext}"
-        new_path = file.parent / new_name
-        file.rename(new_path)
+def _run_cli(func, *args, **kwargs) -> None:
+    """기록 오류를 명령줄 오류로 바꾸고 결과 출력"""
+    try:
+        stats = func(*args, **kwargs)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    echo_journal_stats(stats)
 
 @click.group()
 def cli():
@@ -74,25 +257,31 @@ def cli():
 @click.argument('pattern')
 @click.argument('replacement')
 @click.option('--recursive', '-r', is_flag=True, help='하위 디렉토리 포함')
-def rename(directory, pattern, replacement, recursive):
+@click.option('--jobs', '-j', default=DEFAULT_RENAME_THREADS, help='동시에 처리할 디렉토리 수')
+@journal_options
+def rename(directory, pattern, replacement, recursive, jobs, resume, undo, journal):
     """파일 이름을 패턴에 따라 일괄 변경합니다."""
-    batch_rename(directory, pattern, replacement, recursive)
+    _run_cli(batch_rename, directory, pattern, replacement, recursive, journal, resume, undo, jobs)
 
 @cli.command()
 @click.argument('directory')
 @click.argument('prefix')
 @click.option('--recursive', '-r', is_flag=True, help='하위 디렉토리 포함')
-def prefix(directory, prefix, recursive):
+@click.option('--jobs', '-j', default=DEFAULT_RENAME_THREADS, help='동시에 처리할 디렉토리 수')
+@journal_options
+def prefix(directory, prefix, recursive, jobs, resume, undo, journal):
     """파일 이름 앞에 접두사를 추가합니다."""
-    add_prefix(directory, prefix, recursive)
+    _run_cli(add_prefix, directory, prefix, recursive, journal, resume, undo, jobs)
 
 @cli.command()
 @click.argument('directory')
 @click.argument('suffix')
 @click.option('--recursive', '-r', is_flag=True, help='하위 디렉토리 포함')
-def suffix(directory, suffix, recursive):
+@click.option('--jobs', '-j', default=DEFAULT_RENAME_THREADS, help='동시에 처리할 디렉토리 수')
+@journal_options
+def suffix(directory, suffix, recursive, jobs, resume, undo, journal):
     """파일 확장자 앞에 접미사를 추가합니다."""
-    add_suffix(directory, suffix, recursive)
+    _run_cli(add_suffix, directory, suffix, recursive, journal, resume, undo, jobs)
 
 if __name__ == '__main__':
     cli()
\ No newline at end of file
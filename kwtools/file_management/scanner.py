@@ -0,0 +1,114 @@
+import os
+import re
+import fnmatch
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+from .. import metrics
+
+# 하위 디렉토리를 동시에 탐색하는 기본 스레드 수
+DEFAULT_SCAN_THREADS = 8
+
+Patterns = Union[str, Sequence[str], None]
+
+def compile_patterns(patterns: Patterns) -> Optional[re.Pattern]:
+    """
+    파일 이름 패턴(들)을 하나의 정규식으로 변환
+
+    패턴은 glob과 같이 대소문자를 구분하며 파일 이름에만 적용됩니다.
+    None이거나 "*"가 포함되어 있으면 None(모든 파일)을 반환합니다.
+    """
+    if patterns is None:
+        return None
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    if '*' in patterns:
+        return None
+    return re.compile('|'.join(fnmatch.translate(pattern) for pattern in patterns))
+
+def _scan_directory(
+    directory: str,
+    matcher: Optional[re.Pattern],
+    recursive: bool,
+    stat: bool
+) -> Tuple[List[os.DirEntry], List[str]]:
+    """디렉토리 하나를 읽어 (패턴에 맞는 파일 엔트리, 하위 디렉토리 경로)를 반환"""
+    files = []
+    subdirs = []
+    with metrics.stage('scan'):
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        # 심볼릭 링크 디렉토리는 따라가지 않음 (순환 방지)
+                        if recursive and entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif (matcher is None or matcher.match(entry.name)) and entry.is_file():
+                            if stat:
+                                entry.stat()  # 엔트리에 캐시되므로 호출한 쪽에서 다시 조회하지 않음
+                            files.append(entry)
+                    except OSError:
+                        continue
+        except OSError:
+            # 읽을 수 없는 디렉토리는 glob과 같이 건너뜀
+            pass
+    return files, subdirs
+
+def scan_entries(
+    root: Union[str, Path],
+    patterns: Patterns = None,
+    recursive: bool = False,
+    jobs: int = DEFAULT_SCAN_THREADS,
+    stat: bool = False
+) -> Iterator[os.DirEntry]:
+    """
+    os.scandir로 디렉토리를 탐색하며 패턴에 맞는 파일 엔트리를 차례로 반환
+
+    여러 패턴을 한 번의 탐색으로 찾고, 하위 디렉토리는 스레드 풀에서 동시에 읽습니다.
+    결과는 제너레이터로 반환되므로 탐색이 끝나기 전에 처리를 시작할 수 있습니다.
+    순서는 너비 우선(디렉토리별 scandir 순서)이며 스레드 수와 관계없이 항상 같습니다.
+
+    Args:
+        root: 탐색할 디렉토리
+        patterns: 파일 이름 패턴 또는 패턴 목록 (예: "*.txt", ["*.jpg", "*.png"]), None이면 모든 파일
+        recursive: 하위 디렉토리 포함 여부
+        jobs: 하위 디렉토리를 동시에 읽는 스레드 수
+        stat: True이면 탐색 스레드에서 미리 stat을 조회하여 엔트리에 캐시
+
+    Returns:
+        Iterator[os.DirEntry]: 파일 엔트리 (entry.path, entry.name, entry.stat() 사용 가능)
+    """
+    matcher = compile_patterns(patterns)
+    root = os.fspath(root)
+
+    if not recursive or jobs <= 1:
+        pending = deque([root])
+        while pending:
+            files, subdirs = _scan_directory(pending.popleft(), matcher, recursive, stat)
+            pending.extend(subdirs)
+            yield from files
+        return
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        # 발견한 하위 디렉토리는 바로 제출하고, 결과는 제출 순서대로 꺼내 순서를 고정
+        pending = deque([executor.submit(_scan_directory, root, matcher, True, stat)])
+        try:
+            while pending:
+                files, subdirs = pending.popleft().result()
+                pending.extend(executor.submit(_scan_directory, d, matcher, True, stat) for d in subdirs)
+                yield from files
+        finally:
+            # 호출한 쪽이 중간에 멈추면 아직 시작하지 않은 탐색 취소
+            for future in pending:
+                future.cancel()
+
+def scan_files(
+    root: Union[str, Path],
+    patterns: Patterns = None,
+    recursive: bool = False,
+    jobs: int = DEFAULT_SCAN_THREADS
+) -> Iterator[Path]:
+    """scan_entries와 같지만 파일 경로(Path)를 반환"""
+    for entry in scan_entries(root, patterns, recursive, jobs):
+        yield Path(entry.path)
\ No newline at end of file
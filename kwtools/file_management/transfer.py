@@ -0,0 +1,226 @@
+import os
+import time
+import errno
+import shutil
+import tempfile
+import click
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from tqdm import tqdm
+from .. import metrics
+
+# 동시에 처리할 기본 파일 수
+DEFAULT_TRANSFER_THREADS = 8
+# copy_file_range / sendfile 한 번에 요청할 바이트 수
+_COPY_CHUNK = 64 * 1024 * 1024
+# 커널 내 복사를 지원하지 않을 때 나는 오류 (다음 방식으로 대체)
+_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EPERM, errno.EBADF}
+
+def _copy_data(src_fd: int, dst_fd: int) -> int:
+    """
+    파일 내용을 커널 안에서 복사 (copy_file_range → sendfile → 읽기/쓰기 순으로 시도)
+
+    copy_file_range는 NFS 4.2, XFS, Btrfs 등에서 서버 측 복사나 블록 공유로 처리되어
+    데이터가 사용자 공간을 거치지 않습니다. 처음부터 0을 반환하면 (procfs, 일부 FUSE/NFS)
+    파일 끝인지 알 수 없으므로 다음 방식으로 넘어갑니다 (shutil과 동일).
+
+    Returns:
+        int: 복사한 바이트 수
+    """
+    copied = 0
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while True:
+                n = os.copy_file_range(src_fd, dst_fd, _COPY_CHUNK)
+                if n == 0:
+                    if copied:
+                        return copied
+                    break
+                copied += n
+        except OSError as e:
+            if copied or e.errno not in _UNSUPPORTED:
+                raise
+
+    if hasattr(os, 'sendfile'):
+        try:
+            while True:
+                n = os.sendfile(dst_fd, src_fd, copied, _COPY_CHUNK)
+                if n == 0:
+                    if copied:
+                        return copied
+                    break
+                copied += n
+        except OSError as e:
+            if copied or e.errno not in _UNSUPPORTED:
+                raise
+
+    os.lseek(src_fd, 0, os.SEEK_SET)
+    os.lseek(dst_fd, 0, os.SEEK_SET)
+    while True:
+        block = os.read(src_fd, 1024 * 1024)
+        if not block:
+            return copied
+        copied += os.write(dst_fd, block)
+
+def same_path(a: Path, b: Path) -> bool:
+    """두 경로가 같은 디렉토리 항목을 가리키는지 확인 (하드링크나 심볼릭 링크는 다른 항목)"""
+    a, b = os.path.abspath(a), os.path.abspath(b)
+    return (
+        os.path.basename(a) == os.path.basename(b)
+        and os.path.realpath(os.path.dirname(a)) == os.path.realpath(os.path.dirname(b))
+    )
+
+def copy_file(src: Path, dst: Path) -> int:
+    """
+    파일을 복사하고 메타데이터(권한, 시간, 확장 속성)를 보존 (shutil.copy2와 같은 결과)
+
+    대상과 같은 디렉토리의 임시 파일에 쓴 뒤 교체하므로, 대상이 원본을 가리키는 링크여도
+    원본을 덮어쓰지 않고 중간에 실패해도 기존 대상이 깨지지 않습니다.
+    대상이 원본과 같은 파일이면 shutil.SameFileError를 발생시킵니다.
+
+    Returns:
+        int: 복사한 바이트 수
+    """
+    if os.path.islink(src):
+        # 심볼릭 링크는 링크 자체를 복사
+        if os.path.lexists(dst):
+            if same_path(src, dst):
+                raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+            os.unlink(dst)
+        os.symlink(os.readlink(src), dst)
+        return 0
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+
+    dst_dir, dst_name = os.path.split(os.path.abspath(dst))
+    fd, tmp_file = tempfile.mkstemp(dir=dst_dir, prefix=f".{dst_name}.", suffix='.tmp')
+    try:
+        try:
+            fdst = os.fdopen(fd, 'wb')
+        except BaseException:
+            os.close(fd)
+            raise
+        with fdst, open(src, 'rb') as fsrc:
+            copied = _copy_data(fsrc.fileno(), fdst.fileno())
+        shutil.copystat(src, tmp_file)
+        os.replace(tmp_file, dst)
+    except BaseException:
+        if os.path.lexists(tmp_file):
+            os.unlink(tmp_file)
+        raise
+    return copied
+
+def move_file(src: Path, dst: Path) -> Tuple[str, int]:
+    """
+    파일 이동
+
+    같은 장치이면 rename으로 메타데이터만 바꾸고, 다른 장치(EXDEV)이면
+    copy_file로 복사한 뒤 복사한 크기가 원본 크기와 같을 때만 원본을 삭제합니다.
+
+    Returns:
+        Tuple[str, int]: (사용한 방식 'rename' 또는 'copy', 파일 크기)
+    """
+    size = os.lstat(src).st_size
+    try:
+        os.rename(src, dst)
+        return 'rename', size
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    copied = copy_file(src, dst)
+    if not os.path.islink(src) and copied != os.stat(src).st_size:
+        # 불완전한 복사본은 지우고 원본은 남김
+        os.unlink(dst)
+        raise OSError(errno.EIO, f"복사한 크기({copied})가 원본 크기와 다릅니다", str(src))
+    os.unlink(src)
+    return 'copy', size
+
+def transfer_files(
+    pairs: Iterable[Tuple[Path, Path]],
+    operation: str = 'copy',
+    jobs: int = DEFAULT_TRANSFER_THREADS,
+    skip: Optional[Callable[[Path, Path], bool]] = None,
+    desc: Optional[str] = None,
+    on_done: Optional[Callable[[int], None]] = None
+) -> Dict:
+    """
+    (원본, 대상) 파일 쌍들을 스레드 풀에서 동시에 복사 또는 이동
+
+    pairs는 제너레이터여도 되며, 처리 중인 작업 수를 jobs의 몇 배로 제한하므로
+    파일 탐색과 전송이 함께 진행됩니다. 대상 디렉토리는 필요할 때 만듭니다.
+
+    Args:
+        pairs: (원본, 대상) 파일 경로 쌍
+        operation: 'copy' 또는 'move'
+        jobs: 동시에 처리할 파일 수
+        skip: (원본, 대상)을 받아 True이면 건너뛰는 함수 (작업 스레드에서 호출)
+        desc: 진행바 설명
+        on_done: 작업이 끝난(건너뛴 경우 포함) 쌍의 순번을 받는 함수 (호출한 스레드에서 실행)
+
+    Returns:
+        Dict: {"files", "renamed", "copied", "skipped", "bytes", "elapsed", "error_files"}
+    """
+    if operation not in ('copy', 'move'):
+        raise ValueError(f"지원하지 않는 작업: {operation}")
+
+    created_dirs = set()
+
+    def run(src: Path, dst: Path) -> Tuple[str, int]:
+        if skip is not None:
+            with metrics.stage('read'):
+                if skip(src, dst):
+                    return 'skip', 0
+        with metrics.stage('write'):
+            parent = dst.parent
+            if parent not in created_dirs:
+                parent.mkdir(parents=True, exist_ok=True)
+                created_dirs.add(parent)
+            if operation == 'move':
+                return move_file(src, dst)
+            return 'copy', copy_file(src, dst)
+
+    stats = {"files": 0, "renamed": 0, "copied": 0, "skipped": 0, "bytes": 0, "elapsed": 0.0, "error_files": []}
+    counters = {'rename': "renamed", 'copy': "copied", 'skip': "skipped"}
+    start_time = time.perf_counter()
+    max_pending = max(1, jobs) * 4
+
+    def collect(done) -> None:
+        for future in done:
+            position, src = in_flight.pop(future)
+            stats["files"] += 1
+            try:
+                method, size = future.result()
+            except Exception as e:
+                print(f"Error processing {src}: {e}")
+                stats["error_files"].append(str(src))
+                continue
+            stats[counters[method]] += 1
+            stats["bytes"] += size
+            pbar.update(size)
+            if on_done is not None:
+                on_done(position)
+
+    in_flight = {}
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor, \
+            tqdm(desc=desc or f"{operation.capitalize()} files", unit='B', unit_scale=True, unit_divisor=1024) as pbar:
+        for position, (src, dst) in enumerate(pairs):
+            if len(in_flight) >= max_pending:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            in_flight[executor.submit(run, Path(src), Path(dst))] = (position, src)
+        collect(list(in_flight))
+
+    stats["elapsed"] = time.perf_counter() - start_time
+    metrics.count(files=stats["files"], bytes=stats["bytes"], errors=len(stats["error_files"]))
+    return stats
+
+def echo_transfer_stats(stats: Dict) -> None:
+    """transfer_files 결과 출력"""
+    elapsed = stats["elapsed"]
+    rate = stats["bytes"] / elapsed / (1024 * 1024) if elapsed > 0 else 0
+    click.echo("\n=== 처리 결과 ===")
+    click.echo(f"파일 수: {stats['files']} (rename {stats['renamed']}, 복사 {stats['copied']}, 건너뜀 {stats['skipped']})")
+    click.echo(f"전송량: {stats['bytes'] / (1024 * 1024):.1f}MB, {elapsed:.1f}초 ({rate:.1f}MB/s)")
+    if stats["error_files"]:
+        click.echo(f"처리 중 오류가 발생한 파일 수: {len(stats['error_files'])}")
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""
+명령 실행 지표 (단계별 시간, 카운터, 처리량, 최대 메모리) 수집
+
+kwtools --profile / --metrics-out으로 실행하면 기록이 켜지며, 꺼져 있을 때 stage()와 count()는
+아무 일도 하지 않습니다. 단계 시간은 파일 단위가 아니라 단계(디렉토리, 묶음) 단위로 기록합니다.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 단계 이름
+STAGES = ('scan', 'read', 'parse', 'compute', 'write')
+
+class Metrics:
+    """
+    한 번의 명령 실행 동안의 지표
+
+    단계 시간은 여러 스레드에서 기록하면 합산되므로 전체 실행 시간보다 클 수 있습니다.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    def add_time(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def count(self, **counters: int) -> None:
+        with self._lock:
+            for name, value in counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_dict(self, command: List[str], status: int) -> Dict:
+        """JSON으로 저장할 지표 (처리량은 files / bytes 카운터 기준)"""
+        from . import __version__
+
+        elapsed = time.perf_counter() - self._start
+        files = self.counters.get("files", 0)
+        size = self.counters.get("bytes", 0)
+        memory = {}
+        if resource is not None:
+            # ru_maxrss 단위: Linux는 KB, macOS는 바이트
+            scale = 1 if sys.platform == 'darwin' else 1024
+            memory["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / (1024 * 1024)
+            # 종료된 작업 프로세스 중 가장 큰 값
+            memory["peak_children_rss_mb"] = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale / (1024 * 1024)
+
+        return {
+            "command": command,
+            "status": status,
+            "kwtools_version": __version__,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "pid": os.getpid(),
+            "elapsed": elapsed,
+            "stages": {name: self.stages[name] for name in sorted(self.stages, key=_stage_order)},
+            "counters": dict(self.counters, errors=self.counters.get("errors", 0)),
+            "throughput": {
+                "files_per_sec": files / elapsed if elapsed > 0 else 0,
+                "mb_per_sec": size / (1024 * 1024) / elapsed if elapsed > 0 else 0,
+            },
+            "memory": memory,
+        }
+
+def _stage_order(name: str):
+    return (STAGES.index(name), name) if name in STAGES else (len(STAGES), name)
+
+_active: Optional[Metrics] = None
+
+def start_recording() -> Metrics:
+    """지표 기록 시작"""
+    global _active
+    _active = Metrics()
+    return _active
+
+def stop_recording() -> Optional[Metrics]:
+    """지표 기록 종료 (기록 중이던 Metrics 반환)"""
+    global _active
+    metrics, _active = _active, None
+    return metrics
+
+def is_recording() -> bool:
+    return _active is not None
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """with 블록의 실행 시간을 단계 시간에 더함"""
+    metrics = _active
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_time(name, time.perf_counter() - start)
+
+def count(**counters: int) -> None:
+    """카운터 증가 (예: count(files=10, bytes=1024, errors=1))"""
+    metrics = _active
+    if metrics is not None:
+        metrics.count(**counters)
+
+def write_metrics(metrics: Dict, output_file: Optional[str]) -> None:
+    """지표를 JSON 파일에 쓰거나, 파일이 없으면 표준 오류로 출력"""
+    text = json.dumps(metrics, indent=2, ensure_ascii=False)
+    if output_file is None:
+        print(text, file=sys.stderr)
+        return
+    with open(output_file, 'w') as f:
+        f.write(text + '\n')
\ No newline at end of file
@@ -9,6 +9,7 @@ setup(
         "tqdm>=4.65.0",   # 진행바 표시
         "pandas>=1.5.0",  # 데이터 처리
         "pillow>=9.0.0",  # 이미지 처리
+        "numpy>=1.20.0",  # 배열 연산 (라벨 저장소, 이미지 통계)
     ],
     entry_points={
         'console_scripts': [